@@ -0,0 +1,262 @@
+"""
+Benchmark em processo da API do Planner Edu.
+
+Gera um conjunto de dados sintético em um diretório temporário, sobe a
+aplicação FastAPI sem rede (httpx + ASGI) e mede vazão e latência
+(p50/p95/p99) de cada endpoint com a concorrência escolhida. Os resultados
+são impressos em tabela e gravados em JSON para comparação entre versões.
+
+Uso (a partir de backend/):
+    python benchmark.py --classes 40 --students-per-class 250 --requests 500 --concurrency 16
+    python benchmark.py --endpoints login,grades --output resultados.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from synthetic_data import (
+    DatasetConfig, PROFESSOR_PASSWORD, STUDENT_PASSWORD,
+    class_id, class_students, generate_dataset
+)
+
+@dataclass
+class BenchmarkConfig:
+    """Parâmetros da execução"""
+    requests: int = 200  # Requisições medidas por endpoint
+    warmup: int = 20  # Requisições descartadas antes da medição
+    concurrency: int = 8
+    users: int = 50  # Usuários distintos logados por papel
+    seed: int = 42
+
+@dataclass
+class Scenario:
+    """Requisição de um endpoint; build recebe o contexto e o número da requisição"""
+    name: str
+    role: str  # "aluno" ou "professor"
+    build: Callable[["BenchmarkContext", int], Dict]
+
+class BenchmarkContext:
+    """Usuários, tokens e IDs válidos no conjunto de dados gerado"""
+
+    def __init__(self, dataset: DatasetConfig, config: BenchmarkConfig):
+        self.dataset = dataset
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.tokens: Dict[str, List[str]] = {"aluno": [], "professor": []}
+        # Por professor: turma e alunos que ele pode avaliar
+        self.professor_classes: List[tuple] = []
+
+    def token(self, role: str, number: int) -> str:
+        tokens = self.tokens[role]
+        return tokens[number % len(tokens)]
+
+    def student_username(self, number: int) -> str:
+        return f"aluno{number % self.dataset.total_students + 1}"
+
+def login_request(context: BenchmarkContext, number: int) -> Dict:
+    return {"method": "POST", "url": "/api/auth/login",
+            "json": {"username": context.student_username(number), "password": STUDENT_PASSWORD}}
+
+def update_grade_request(context: BenchmarkContext, number: int) -> Dict:
+    class_index, students = context.professor_classes[number % len(context.professor_classes)]
+    return {"method": "PUT", "url": "/api/grades/update", "professor_index": class_index,
+            "json": {"student_id": context.rng.choice(students),
+                     "grade_type": context.rng.choice(["np1", "np2", "ava", "pim"]),
+                     "value": round(context.rng.uniform(0, 10), 1)}}
+
+def create_event_request(context: BenchmarkContext, number: int) -> Dict:
+    class_index, _ = context.professor_classes[number % len(context.professor_classes)]
+    return {"method": "POST", "url": "/api/calendar/events", "professor_index": class_index,
+            "json": {"type": "prova", "title": f"Benchmark {number}", "description": "Evento de benchmark",
+                     "class_id": class_id(class_index), "date": "2030-06-01T10:00:00",
+                     "location": "Sala 101", "grade_type": "np1"}}
+
+SCENARIOS = [
+    Scenario("login", "aluno", login_request),
+    Scenario("auth_me", "aluno", lambda context, number: {"method": "GET", "url": "/api/auth/me"}),
+    Scenario("grades", "aluno", lambda context, number: {"method": "GET", "url": "/api/grades"}),
+    Scenario("grades_update", "professor", update_grade_request),
+    Scenario("calendar", "aluno", lambda context, number: {"method": "GET", "url": "/api/calendar"}),
+    Scenario("calendar_create", "professor", create_event_request),
+    Scenario("notifications", "aluno", lambda context, number: {"method": "GET", "url": "/api/notifications"}),
+]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil pelo método nearest-rank"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """Vazão e percentis de latência (ms) de um endpoint"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+async def login_users(client, context: BenchmarkContext):
+    """Obtém tokens de alunos e dos professores das turmas usadas"""
+    for number in range(min(context.config.users, context.dataset.total_students)):
+        response = await client.post("/api/auth/login", json={
+            "username": context.student_username(number), "password": STUDENT_PASSWORD
+        })
+        response.raise_for_status()
+        context.tokens["aluno"].append(response.json()["access_token"])
+
+    for class_index in range(min(context.config.users, context.dataset.classes)):
+        # Mesmo professor que synthetic_data atribui à turma
+        professor_number = class_index % context.dataset.professors + 1
+        response = await client.post("/api/auth/login", json={
+            "username": f"professor{professor_number}", "password": PROFESSOR_PASSWORD
+        })
+        response.raise_for_status()
+        context.tokens["professor"].append(response.json()["access_token"])
+        context.professor_classes.append((class_index, class_students(context.dataset, class_index)))
+
+async def run_scenario(client, context: BenchmarkContext, scenario: Scenario) -> Dict:
+    """Executa aquecimento e medição de um endpoint com a concorrência configurada"""
+    config = context.config
+    latencies: List[float] = []
+    errors = 0
+    # Janela da medição (sem o aquecimento), usada no cálculo da vazão
+    window = [float("inf"), 0.0]
+    counter = iter(range(config.warmup + config.requests))
+
+    async def worker():
+        nonlocal errors
+        for number in counter:
+            request = scenario.build(context, number)
+            # Requisições do professor usam o token do dono da turma
+            token_number = request.pop("professor_index", number)
+            headers = {}
+            if scenario.name != "login":
+                headers["Authorization"] = f"Bearer {context.token(scenario.role, token_number)}"
+
+            started = time.perf_counter()
+            response = await client.request(headers=headers, **request)
+            latency = time.perf_counter() - started
+
+            if number < config.warmup:
+                continue
+            window[0] = min(window[0], started)
+            window[1] = max(window[1], started + latency)
+            latencies.append(latency)
+            if response.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+    return summarize(latencies, errors, max(0.0, window[1] - window[0]))
+
+async def run_benchmark(dataset: DatasetConfig, config: BenchmarkConfig,
+                        scenario_names: Optional[List[str]] = None) -> Dict:
+    """Sobe a aplicação em processo e mede os cenários selecionados"""
+    import httpx
+    import main
+
+    context = BenchmarkContext(dataset, config)
+    selected = [scenario for scenario in SCENARIOS
+                if not scenario_names or scenario.name in scenario_names]
+
+    await main.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            await login_users(client, context)
+
+            results = {}
+            for scenario in selected:
+                results[scenario.name] = await run_scenario(client, context, scenario)
+                print(f"⏱️ {scenario.name}: {results[scenario.name]['throughput_rps']} req/s, "
+                      f"p95 {results[scenario.name]['p95_ms']} ms")
+            return results
+    finally:
+        await main.app.router.shutdown()
+
+def print_table(results: Dict):
+    header = f"{'endpoint':<18}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'erros':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        print(f"{name:<18}{result['throughput_rps']:>10}{result['p50_ms']:>10}"
+              f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['errors']:>8}")
+
+def parse_args() -> argparse.Namespace:
+    dataset_defaults = DatasetConfig()
+    defaults = BenchmarkConfig()
+    parser = argparse.ArgumentParser(description="Benchmark em processo da API do Planner Edu")
+    parser.add_argument("--professors", type=int, default=dataset_defaults.professors)
+    parser.add_argument("--classes", type=int, default=dataset_defaults.classes)
+    parser.add_argument("--students-per-class", type=int, default=dataset_defaults.students_per_class)
+    parser.add_argument("--notifications-per-student", type=int,
+                        default=dataset_defaults.notifications_per_student)
+    parser.add_argument("--requests", type=int, default=defaults.requests)
+    parser.add_argument("--warmup", type=int, default=defaults.warmup)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--endpoints", default="",
+                        help="Cenários separados por vírgula: " + ",".join(s.name for s in SCENARIOS))
+    parser.add_argument("--output", default="benchmark-results.json")
+    return parser.parse_args()
+
+def main_cli():
+    args = parse_args()
+    dataset = DatasetConfig(
+        professors=args.professors,
+        classes=args.classes,
+        students_per_class=args.students_per_class,
+        notifications_per_student=args.notifications_per_student,
+        seed=args.seed,
+    )
+    config = BenchmarkConfig(
+        requests=args.requests,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        users=args.users,
+        seed=args.seed,
+    )
+    scenario_names = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+
+    with tempfile.TemporaryDirectory(prefix="planner-benchmark-") as data_dir:
+        # Configurar antes de importar main: a API usa o diretório temporário
+        os.environ["DATA_DIR"] = data_dir
+        os.environ["RESET_DATA_ON_STARTUP"] = "false"
+
+        print(f"🏗️ Gerando dados ({dataset.total_students} alunos, {dataset.classes} turmas)...")
+        generate_dataset(dataset, data_dir)
+        results = asyncio.run(run_benchmark(dataset, config, scenario_names))
+
+    print_table(results)
+    output = {
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "dataset": asdict(dataset),
+        "config": asdict(config),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    print(f"📄 Resultados gravados em {args.output}")
+
+if __name__ == "__main__":
+    main_cli()
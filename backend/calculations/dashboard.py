@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from calculations.grade_calculator import grade_calculator
+
+UPCOMING_EVENTS_DAYS = 7  # Janela de "próximos eventos", a partir do início de hoje
+DASHBOARD_LIST_SIZE = 5  # Itens em cada lista do dashboard
+
+@dataclass
+class DashboardSnapshot:
+    """Dados lidos uma única vez para montar o dashboard de um usuário"""
+    classes: List[Dict]
+    grades: List[Dict]
+    events: List[Dict]
+    notifications: List[Dict]  # Notificações mais recentes do usuário
+    unread_count: int
+    now: datetime  # Horário local com fuso
+
+def parse_event_date(value: Optional[str]) -> Optional[datetime]:
+    """Converte a data do evento em datetime com fuso (sem fuso = horário local)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+def get_upcoming_events(events: List[Dict], now: datetime) -> List[Dict]:
+    """Eventos de hoje até UPCOMING_EVENTS_DAYS dias, em ordem cronológica"""
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    end = now + timedelta(days=UPCOMING_EVENTS_DAYS)
+
+    upcoming = []
+    for event in events:
+        event_date = parse_event_date(event.get("date"))
+        if event_date is not None and start <= event_date <= end:
+            upcoming.append((event_date, event))
+
+    upcoming.sort(key=lambda item: item[0])
+    return [event for _, event in upcoming]
+
+def get_approval_rate(grades: List[Dict]) -> int:
+    """Percentual de aprovados entre as notas com média final"""
+    completed = [grade for grade in grades if grade.get("final_grade") is not None]
+    if not completed:
+        return 0
+    approved = sum(1 for grade in completed if grade.get("status") == "aprovado")
+    return round(approved / len(completed) * 100)
+
+def get_latest_grades(grades: List[Dict]) -> List[Dict]:
+    """Notas atualizadas mais recentemente"""
+    ordered = sorted(grades, key=lambda grade: grade.get("updated_at") or "", reverse=True)
+    return ordered[:DASHBOARD_LIST_SIZE]
+
+def get_class_stats(cls: Dict, class_grades: List[Dict]) -> Dict:
+    """Resumo de uma turma do professor a partir das notas já agrupadas"""
+    final_grades = [grade["final_grade"] for grade in class_grades if grade.get("final_grade") is not None]
+    statistics = grade_calculator.calculate_class_statistics(final_grades)
+
+    return {
+        "class_id": cls["id"],
+        "name": cls.get("name"),
+        "subject": cls.get("subject"),
+        "students": len(cls.get("students", [])),
+        "graded": len(final_grades),
+        "pending": len(class_grades) - len(final_grades),
+        "average": round(statistics.get("average", 0.0), 2),
+        "highest": statistics.get("highest", 0.0),
+        "lowest": statistics.get("lowest", 0.0),
+        "approval_rate": round(statistics.get("approval_rate", 0.0)),
+    }
+
+def build_dashboard(user: Dict, snapshot: DashboardSnapshot) -> Dict:
+    """
+    Monta o resumo do dashboard conforme o papel do usuário
+
+    Aluno: turmas em que está matriculado, eventos dessas turmas e as
+    próprias notas. Professor: turmas que leciona, eventos que criou, notas
+    dessas turmas e estatísticas por turma.
+    """
+    user_id = user["id"]
+    is_professor = user["role"] == "professor"
+
+    if is_professor:
+        classes = [cls for cls in snapshot.classes if cls.get("professor_id") == user_id]
+        class_ids = {cls["id"] for cls in classes}
+        events = [event for event in snapshot.events if event.get("professor_id") == user_id]
+        grades = [grade for grade in snapshot.grades if grade.get("class_id") in class_ids]
+    else:
+        classes = [cls for cls in snapshot.classes if user_id in cls.get("students", [])]
+        class_ids = {cls["id"] for cls in classes}
+        events = [event for event in snapshot.events if event.get("class_id") in class_ids]
+        grades = [grade for grade in snapshot.grades if grade.get("student_id") == user_id]
+
+    upcoming_events = get_upcoming_events(events, snapshot.now)
+    pending_grades = [grade for grade in grades if grade.get("final_grade") is None]
+
+    dashboard = {
+        "role": user["role"],
+        "stats": {
+            "total_classes": len(classes),
+            "upcoming_events": len(upcoming_events),
+            "pending_grades": len(pending_grades),
+            "approval_rate": get_approval_rate(grades),
+        },
+        "classes": [
+            {"id": cls["id"], "name": cls.get("name"), "subject": cls.get("subject")}
+            for cls in classes
+        ],
+        "upcoming_events": upcoming_events[:DASHBOARD_LIST_SIZE],
+        "latest_grades": get_latest_grades(grades),
+        "notifications": snapshot.notifications[:DASHBOARD_LIST_SIZE],
+        "unread_count": snapshot.unread_count,
+        "generated_at": snapshot.now.isoformat(),
+    }
+
+    if is_professor:
+        grades_by_class: Dict[str, List[Dict]] = {class_id: [] for class_id in class_ids}
+        for grade in grades:
+            grades_by_class[grade["class_id"]].append(grade)
+        dashboard["class_stats"] = [get_class_stats(cls, grades_by_class[cls["id"]]) for cls in classes]
+
+    return dashboard
@@ -1,7 +1,10 @@
 import ctypes
+import logging
 import os
 from typing import Optional, Dict, List, Tuple
 
+logger = logging.getLogger(__name__)
+
 class GradeCalculator:
     """Wrapper Python para o módulo de cálculo de notas em C"""
     
@@ -21,14 +24,14 @@ class GradeCalculator:
             # Se não existir, usar implementação Python pura
             if not os.path.exists(lib_path):
                 self.lib = None
-                print("Biblioteca C não encontrada, usando implementação Python")
+                logger.warning("Biblioteca C não encontrada, usando implementação Python")
                 return
             
             self.lib = ctypes.CDLL(lib_path)
             self._setup_function_signatures()
             
         except Exception as e:
-            print(f"Erro ao carregar biblioteca C: {e}")
+            logger.warning("Erro ao carregar biblioteca C: %s", e)
             self.lib = None
     
     def _setup_function_signatures(self):
@@ -88,7 +91,7 @@ class GradeCalculator:
             return result if result >= 0 else None
             
         except Exception as e:
-            print(f"Erro no cálculo C: {e}")
+            logger.error("Erro no cálculo C: %s", e)
             return self._calculate_with_python(np1, np2, ava, pim)
     
     def _calculate_with_python(self, np1, np2, ava, pim) -> Optional[float]:
@@ -113,7 +116,7 @@ class GradeCalculator:
             return min(final_grade, 10.0)
             
         except Exception as e:
-            print(f"Erro no cálculo Python: {e}")
+            logger.error("Erro no cálculo Python: %s", e)
             return None
     
     def validate_grade_python(self, grade: float) -> bool:
@@ -179,7 +182,7 @@ class GradeCalculator:
             }
             
         except Exception as e:
-            print(f"Erro no cálculo de estatísticas: {e}")
+            logger.error("Erro no cálculo de estatísticas: %s", e)
             return {}
     
     def batch_calculate_grades(self, students_grades: List[Dict]) -> List[Dict]:
@@ -217,7 +220,7 @@ class GradeCalculator:
                 results.append(result)
                 
             except Exception as e:
-                print(f"Erro ao calcular nota do aluno {student_data.get('student_id')}: {e}")
+                logger.error("Erro ao calcular nota do aluno %s: %s", student_data.get('student_id'), e)
                 results.append({
                     "student_id": student_data.get("student_id"),
                     "error": str(e)
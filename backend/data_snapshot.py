@@ -0,0 +1,81 @@
+"""
+Snapshots binários (.pimsnap) dos dados do Planner Edu.
+
+Um snapshot guarda todos os arquivos JSON do diretório de dados em um único
+arquivo (cabeçalho versionado + uma seção por arquivo, ver utils/snapshot.py).
+Restaurar é uma leitura e uma gravação por arquivo, sem json.load/json.dump,
+o que torna resets e fixtures grandes bem mais rápidos que regerar os dados.
+
+Uso (a partir de backend/):
+    python data_snapshot.py save fixtures/escala.pimsnap
+    python data_snapshot.py restore fixtures/escala.pimsnap --data-dir /tmp/dados
+    python data_snapshot.py info fixtures/escala.pimsnap
+
+Para a API restaurar um snapshot em vez de initial_data.py ao iniciar, use
+RESET_SNAPSHOT=caminho/do/arquivo.pimsnap.
+"""
+
+import argparse
+import os
+import time
+
+from utils.snapshot import restore_data_dir, snapshot_data_dir, unpack_snapshot
+
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data"))
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def save_command(args: argparse.Namespace):
+    started = time.perf_counter()
+    sizes = snapshot_data_dir(args.data_dir, args.file, args.files or None, compress=args.compress)
+    elapsed = time.perf_counter() - started
+
+    for filename, size in sizes.items():
+        print(f"✅ {filename}: {format_size(size)}")
+    print(f"💾 Snapshot gravado em {args.file} ({format_size(os.path.getsize(args.file))}, {elapsed:.3f}s)")
+
+def restore_command(args: argparse.Namespace):
+    started = time.perf_counter()
+    sizes = restore_data_dir(args.file, args.data_dir)
+    elapsed = time.perf_counter() - started
+
+    for filename, size in sizes.items():
+        print(f"✅ {filename}: {format_size(size)}")
+    print(f"🎯 {len(sizes)} arquivos restaurados em {args.data_dir} ({elapsed:.3f}s)")
+
+def info_command(args: argparse.Namespace):
+    with open(args.file, "rb") as f:
+        sections = unpack_snapshot(f.read())
+    for filename, payload in sections.items():
+        print(f"📄 {filename}: {format_size(len(payload))}")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Snapshots binários dos dados do Planner Edu")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    save = commands.add_parser("save", help="Grava os arquivos de dados em um snapshot")
+    save.add_argument("file")
+    save.add_argument("--data-dir", default=DATA_DIR)
+    save.add_argument("--files", nargs="*", help="Arquivos incluídos (padrão: todos os .json)")
+    save.add_argument("--compress", action="store_true", help="Comprime as seções com zlib")
+    save.set_defaults(handler=save_command)
+
+    restore = commands.add_parser("restore", help="Substitui os arquivos de dados pelo snapshot")
+    restore.add_argument("file")
+    restore.add_argument("--data-dir", default=DATA_DIR)
+    restore.set_defaults(handler=restore_command)
+
+    info = commands.add_parser("info", help="Lista as seções do snapshot")
+    info.add_argument("file")
+    info.set_defaults(handler=info_command)
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    args.handler(args)
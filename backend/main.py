@@ -1,30 +1,150 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Literal, Optional, List
+import asyncio
 import json
+import logging
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-import uuid
 from initial_data import (
     INITIAL_USERS, INITIAL_CLASSES, INITIAL_GRADES, 
     INITIAL_CALENDAR, INITIAL_NOTIFICATIONS
 )
+from monitoring.logging_config import configure_logging
+
+# Configurar logs antes de importar módulos que registram mensagens ao carregar
+configure_logging()
+logger = logging.getLogger(__name__)
+
+from utils.id_generator import new_id
+from utils.timestamps import utc_now_iso
+from utils.etag import CollectionVersions, etag_matches
+from utils.compression import SelectiveGZipMiddleware
+from utils.field_selection import parse_fields, select_fields_list
+from utils.idempotency import IdempotencyMiddleware
+from utils.student_views import StudentViews
+from utils.snapshot import restore_data_dir
+from utils.user_index import UserIndex
+from utils.csv_stream import iter_csv_rows
+from monitoring.metrics import metrics
+from monitoring.metrics_middleware import MetricsMiddleware
+from monitoring.profiling_middleware import ProfilingMiddleware
+from calculations.grade_calculator import grade_calculator
+from calculations.dashboard import DashboardSnapshot, DASHBOARD_LIST_SIZE, build_dashboard
+from utils.ttl_cache import TTLCache
+from notifications.notification_index import NotificationIndex, is_released
+from notifications.notification_pubsub import NotificationPubSub, RESYNC
+from notifications.notification_archive import (
+    compact_notifications_data, get_archived_notifications, list_archive_months
+)
+from notifications.notification_service import notification_service
+from notifications.notification_templates import (
+    render_event_notification, render_grade_notification
+)
 
 # Configurações
 SECRET_KEY = "sistema-academico-pim-secret-key-2024"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480  # 8 horas
+NOTIFICATION_STREAM_QUEUE_SIZE = 100  # Mensagens pendentes por conexão
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = 15
+# Token do stream SSE (vai na URL): curto e válido só para abrir a conexão
+NOTIFICATION_STREAM_TOKEN_SECONDS = int(os.getenv("NOTIFICATION_STREAM_TOKEN_SECONDS", "60"))
+NOTIFICATION_STREAM_SCOPE = "notifications:stream"
+NOTIFICATIONS_PAGE_SIZE = 50  # Tamanho padrão da página de notificações
+NOTIFICATIONS_MAX_PAGE_SIZE = 200
+# Notificações lidas mais antigas que isso vão para os arquivos mensais compactados
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+NOTIFICATION_RETENTION_INTERVAL_HOURS = int(os.getenv("NOTIFICATION_RETENTION_INTERVAL_HOURS", "24"))
+# Diretório dos arquivos JSON (outro diretório isola benchmarks dos dados reais)
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data"))
+# Desligue para manter dados gerados por synthetic_data.py entre reinícios
+RESET_DATA_ON_STARTUP = os.getenv("RESET_DATA_ON_STARTUP", "true").lower() == "true"
+# Snapshot (.pimsnap, ver data_snapshot.py) restaurado no reset no lugar de initial_data.py
+RESET_SNAPSHOT = os.getenv("RESET_SNAPSHOT")
+# Limites da importação de matrículas por CSV
+ROSTER_IMPORT_MAX_ROWS = int(os.getenv("ROSTER_IMPORT_MAX_ROWS", "50000"))
+ROSTER_IMPORT_MAX_ERRORS = 100  # Linhas inválidas listadas na resposta
+ROSTER_CSV_COLUMNS = ("student_id", "username")  # Colunas aceitas para identificar o aluno
+# Cache do dashboard por usuário (também invalidado quando os arquivos mudam)
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "15"))
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "1000"))
+# Respostas maiores que isso são comprimidas com gzip (se o cliente aceitar)
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+# Chaves Idempotency-Key guardadas (respostas repetidas sem refazer a escrita)
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+IDEMPOTENCY_MAX_BODY_SIZE = int(os.getenv("IDEMPOTENCY_MAX_BODY_SIZE", str(1024 * 1024)))
+# Profiling sob demanda (cabeçalho X-Profile, apenas professores); desligado não tem custo
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_DIR = os.getenv("PROFILING_DIR", os.path.join(DATA_DIR, "profiles"))
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "50"))
+PROFILING_TOP_N = int(os.getenv("PROFILING_TOP_N", "30"))
 
 app = FastAPI(title="Planner Edu API", version="1.0.0")
 
 # Evento de inicialização - resetar dados para estado limpo
 @app.on_event("startup")
 async def startup_event():
-    reset_to_initial_data()
+    global event_notification_queue, event_notification_worker, notification_retention_task
+    if RESET_DATA_ON_STARTUP:
+        reset_to_initial_data()
+    
+    # Iniciar fila de notificações em segundo plano
+    event_notification_queue = asyncio.Queue()
+    event_notification_worker = asyncio.create_task(process_event_notification_queue())
+    
+    # Arquivar periodicamente o histórico antigo de notificações
+    notification_retention_task = asyncio.create_task(run_notification_retention())
+    
+    # Agendador de emails, lembretes e notificações agendadas
+    await notification_service.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    global event_notification_queue, event_notification_worker, notification_retention_task
+    
+    # Concluir notificações pendentes antes de encerrar
+    if event_notification_queue is not None:
+        try:
+            await asyncio.wait_for(event_notification_queue.join(), timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Notificações de eventos pendentes não foram gravadas")
+    
+    if event_notification_worker is not None:
+        event_notification_worker.cancel()
+    
+    if notification_retention_task is not None:
+        notification_retention_task.cancel()
+    
+    await notification_service.stop()
+    
+    # Encerrar conexões de notificações em tempo real
+    notification_pubsub.close_all()
+    
+    event_notification_queue = None
+    event_notification_worker = None
+    notification_retention_task = None
+
+# Repetições de POST/PUT com o mesmo Idempotency-Key recebem a resposta original.
+# Registrado antes do CORS para ficar dentro dele (os erros 400/413/422 também
+# levam os cabeçalhos CORS); a importação de CSV é lida em streaming e fica de fora
+app.add_middleware(
+    IdempotencyMiddleware,
+    identify=lambda token: get_user_from_token(token)["id"],
+    ttl_seconds=IDEMPOTENCY_TTL_SECONDS,
+    max_entries=IDEMPOTENCY_MAX_KEYS,
+    max_body_size=IDEMPOTENCY_MAX_BODY_SIZE,
+    excluded_path_patterns=[r"/api/classes/[^/]+/students/import"],
+)
 
 # CORS
 app.add_middleware(
@@ -35,11 +155,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressão das respostas (o stream SSE não pode ficar retido no compressor)
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=GZIP_MINIMUM_SIZE,
+    compresslevel=GZIP_COMPRESS_LEVEL,
+    excluded_paths=["/api/notifications/stream"],
+)
+
+# Métricas (Prometheus) - mais externo, para medir a requisição inteira
+metrics.describe("http_requests_total", "counter", "Requisições HTTP por rota, método e status")
+metrics.describe("http_request_duration_seconds", "histogram", "Latência até o início da resposta por rota")
+metrics.describe("storage_operations_total", "counter", "Leituras e gravações de arquivos de dados")
+metrics.describe("storage_operation_duration_seconds", "histogram", "Duração das leituras e gravações de arquivos de dados")
+metrics.describe("storage_bytes_total", "counter", "Bytes lidos e gravados em arquivos de dados")
+metrics.describe("grade_calculator_c_library_loaded", "gauge", "1 se a biblioteca C de cálculo foi carregada")
+metrics.describe("notification_email_sent_total", "counter", "Emails enviados")
+metrics.describe("notification_email_failed_total", "counter", "Emails que esgotaram as tentativas")
+metrics.describe("notification_email_retried_total", "counter", "Emails reagendados após falha")
+metrics.describe("notification_email_queue_depth", "gauge", "Emails pendentes na fila")
+metrics.describe("notification_email_oldest_pending_seconds", "gauge", "Idade do email pendente mais antigo")
+metrics.describe("notification_email_last_batch_throughput", "gauge", "Emails por segundo no último lote")
+metrics.describe("notification_stream_connections", "gauge", "Conexões SSE de notificações abertas")
+metrics.describe("event_notification_queue_depth", "gauge", "Eventos aguardando criação de notificações")
+metrics.describe("dashboard_cache_requests_total", "counter", "Consultas ao cache do dashboard (hit/miss)")
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
 # Segurança
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 # Modelos Pydantic
+# Campos aceitos no parâmetro `fields` das listagens
+GRADE_FIELDS = {
+    "id", "student_id", "class_id", "semester", "np1", "np2", "ava", "pim",
+    "final_grade", "status", "created_at", "updated_at"
+}
+EVENT_FIELDS = {
+    "id", "type", "title", "description", "class_id", "professor_id", "date",
+    "duration", "location", "grade_type", "due_date", "created_at"
+}
+NOTIFICATION_FIELDS = {
+    "id", "user_id", "title", "message", "type", "read", "created_at", "scheduled_for", "sent"
+}
+FIELDS_QUERY = Query(None, description="Campos separados por vírgula (ex.: id,title,date); padrão: todos")
+
+def get_selected_fields(fields: Optional[str], allowed: set) -> Optional[tuple]:
+    """Valida o parâmetro `fields` de uma listagem"""
+    try:
+        return parse_fields(fields, allowed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -72,13 +239,69 @@ class UpdateGradeRequest(BaseModel):
     grade_type: str  # np1, np2, ava, pim
     value: Optional[float] = None  # Pode ser None para remover nota
 
+class MarkNotificationsReadRequest(BaseModel):
+    ids: Optional[List[str]] = None  # IDs específicos
+    all: bool = False  # Todas as não lidas do usuário
+    before: Optional[str] = None  # Com all, apenas as anteriores a este cursor
+    until: Optional[str] = None  # Com all, apenas até esta notificação (inclusive)
+
+class NotificationPreferencesRequest(BaseModel):
+    email_digest: bool  # Receber emails agrupados no resumo diário
+
+class RosterUpdateRequest(BaseModel):
+    student_ids: List[str]  # IDs ou usernames dos alunos
+
 # Utilitários para carregar dados JSON
+def get_data_path(filename: str) -> str:
+    """Caminho do arquivo de dados"""
+    return os.path.join(DATA_DIR, filename)
+
+def get_data_file_signature(filename: str):
+    """Assinatura (mtime, tamanho) do arquivo de dados, usada para detectar alterações"""
+    try:
+        stat = os.stat(get_data_path(filename))
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+# Versão de cada arquivo de dados, usada nas ETags das rotas de leitura
+collection_versions = CollectionVersions()
+
+def get_collection_version(filename: str) -> int:
+    """Versão atual do arquivo de dados (sobe a cada gravação)"""
+    return collection_versions.current(filename, get_data_file_signature(filename))
+
+def check_not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Define ETag e Cache-Control da resposta
+
+    Returns:
+        Resposta 304 se o cliente já tem essa versão (If-None-Match), senão None
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+def record_storage_operation(filename: str, operation: str, started: float, size: int):
+    """Registra duração e bytes de uma leitura/gravação de arquivo de dados"""
+    labels = {"file": filename, "operation": operation}
+    metrics.inc("storage_operations_total", labels)
+    metrics.observe("storage_operation_duration_seconds", time.perf_counter() - started, labels)
+    metrics.inc("storage_bytes_total", labels, size)
+
 def load_json_data(filename: str):
     """Carrega dados do arquivo JSON"""
+    started = time.perf_counter()
     try:
-        data_path = os.path.join(os.path.dirname(__file__), "..", "data", filename)
+        data_path = get_data_path(filename)
         with open(data_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
+            size = os.fstat(file.fileno()).st_size
+            data = json.load(file)
+        record_storage_operation(filename, "load", started, size)
+        return data
     except FileNotFoundError:
         return {}
     except json.JSONDecodeError:
@@ -87,17 +310,224 @@ def load_json_data(filename: str):
 def save_json_data(filename: str, data: dict):
     """Salva dados no arquivo JSON"""
     try:
-        data_path = os.path.join(os.path.dirname(__file__), "..", "data", filename)
+        data_path = get_data_path(filename)
+        started = time.perf_counter()
         with open(data_path, 'w', encoding='utf-8') as file:
             json.dump(data, file, indent=2, ensure_ascii=False)
+            size = file.tell()
+        record_storage_operation(filename, "save", started, size)
+        collection_versions.bump(filename, get_data_file_signature(filename))
         return True
     except Exception as e:
-        print(f"Erro ao salvar {filename}: {e}")
+        logger.error("Erro ao salvar %s: %s", filename, e)
         return False
 
+# Índice em memória das notificações (contadores de não lidas por usuário)
+notification_index = NotificationIndex()
+# Leitura-alteração-gravação de notifications.json (mesma trava do serviço de notificações)
+notifications_lock = notification_service.data_lock
+
+# Protege as estruturas do índice. Alterações exigem as duas travas;
+# para ler basta uma delas, então leituras não esperam a gravação do arquivo
+notification_index_lock = threading.Lock()
+
+def get_notification_index() -> NotificationIndex:
+    """
+    Obtém o índice de notificações, reconstruindo-o se o arquivo mudou externamente
+
+    Deve ser chamado com notifications_lock (ver read_notification_index).
+    """
+    signature = get_data_file_signature("notifications.json")
+    if signature is None or signature != notification_index.signature:
+        notifications_data = load_json_data("notifications.json")
+        with notification_index_lock:
+            notification_index.rebuild(notifications_data, signature)
+    return notification_index
+
+def refresh_notification_index():
+    """
+    Recarrega o índice se o arquivo mudou fora da API (ex.: pelo serviço de notificações)
+
+    Se outra thread está gravando notifications.json, ela mesma atualiza o
+    índice ao terminar, então não há o que esperar.
+    """
+    if notifications_lock.acquire(blocking=False):
+        try:
+            get_notification_index()
+        finally:
+            notifications_lock.release()
+
+def read_notification_index(read):
+    """Executa `read(índice)` com o índice atualizado (fora do event loop)"""
+    refresh_notification_index()
+    with notification_index_lock:
+        return read(notification_index)
+
+async def read_notification_index_async(read):
+    """
+    Executa `read(índice)` com o índice atualizado, no event loop
+
+    notification_index_lock nunca fica presa durante I/O; só a recarga do
+    arquivo vai para uma thread.
+    """
+    stale = notification_index.signature != get_data_file_signature("notifications.json")
+    # Com uma gravação em andamento o escritor atualiza o índice; não há o que recarregar
+    if stale and notifications_lock.acquire(blocking=False):
+        notifications_lock.release()
+        await asyncio.to_thread(refresh_notification_index)
+    with notification_index_lock:
+        return read(notification_index)
+
+def get_unread_counts(index: NotificationIndex, notifications: List[dict]) -> dict:
+    """Não lidas de cada destinatário, enviadas junto com as notificações no SSE"""
+    return {notif["user_id"]: index.unread_count(notif["user_id"]) for notif in notifications}
+
+def save_notifications_data(notifications_data: dict, update_index=None) -> bool:
+    """
+    Salva notifications.json mantendo o índice em memória sincronizado
+
+    update_index recebe o índice e aplica apenas as alterações feitas; se o
+    índice já estava desatualizado, ele é reconstruído a partir dos dados salvos.
+    A leitura e as alterações que antecedem a gravação devem acontecer dentro
+    de notifications_lock, para não sobrescrever gravações de outra thread.
+    """
+    with notifications_lock:
+        in_sync = notification_index.signature == get_data_file_signature("notifications.json")
+        
+        if not save_json_data("notifications.json", notifications_data):
+            return False
+        
+        signature = get_data_file_signature("notifications.json")
+        with notification_index_lock:
+            if in_sync and update_index is not None:
+                update_index(notification_index)
+                notification_index.signature = signature
+            else:
+                notification_index.rebuild(notifications_data, signature)
+        return True
+
+# Visões materializadas por aluno (notas e eventos das turmas)
+student_views = StudentViews()
+STUDENT_VIEW_FILES = ("grades.json", "calendar.json", "classes.json")
+
+def get_student_view_signatures() -> tuple:
+    """Assinaturas dos arquivos refletidos nas visões por aluno"""
+    return tuple(get_data_file_signature(filename) for filename in STUDENT_VIEW_FILES)
+
+def get_student_views() -> StudentViews:
+    """Obtém as visões por aluno, reconstruindo-as se algum arquivo mudou externamente"""
+    signatures = get_student_view_signatures()
+    if signatures != student_views.signatures:
+        student_views.rebuild(
+            load_json_data("grades.json"),
+            load_json_data("calendar.json"),
+            load_json_data("classes.json"),
+            signatures
+        )
+    return student_views
+
+def update_student_views(in_sync: bool, update):
+    """
+    Aplica às visões uma escrita feita pela API
+
+    in_sync indica se as visões refletiam os arquivos antes da gravação; se
+    não refletiam, em vez de aplicar a alteração elas são reconstruídas na
+    próxima leitura.
+    """
+    if in_sync:
+        update(student_views)
+        student_views.signatures = get_student_view_signatures()
+    else:
+        student_views.signatures = None
+
+def append_notifications(notifications: List[dict]) -> Optional[dict]:
+    """
+    Acrescenta notificações ao arquivo e ao índice em uma gravação
+
+    Bloqueia enquanto outra thread grava; as rotas a chamam com asyncio.to_thread.
+
+    Returns:
+        Não lidas de cada destinatário (para publish_notifications), ou None se a gravação falhou
+    """
+    def update_index(index: NotificationIndex):
+        for notification in notifications:
+            index.add(notification)
+    
+    with notifications_lock:
+        notifications_data = load_json_data("notifications.json")
+        notifications_data.setdefault("notifications", []).extend(notifications)
+        if not save_notifications_data(notifications_data, update_index):
+            return None
+        return get_unread_counts(notification_index, notifications)
+
+# Canal de notificações em tempo real (SSE)
+notification_pubsub = NotificationPubSub(max_queue_size=NOTIFICATION_STREAM_QUEUE_SIZE)
+
+def publish_notifications(notifications: List[dict], unread_counts: dict):
+    """
+    Envia notificações recém-criadas para os usuários conectados
+
+    Chamada no event loop; unread_counts vem de quem gravou (sob a trava),
+    para não ler o índice enquanto outra thread o altera.
+    """
+    for notification in notifications:
+        user_id = notification.get("user_id")
+        if not notification_pubsub.has_subscribers(user_id):
+            continue
+        
+        notification_pubsub.publish(user_id, {
+            "notification": notification,
+            "unread_count": unread_counts.get(user_id, 0)
+        })
+
+async def publish_released_notifications(notifications: List[dict]):
+    """Notificações agendadas liberadas pelo serviço: entram no índice e vão para o SSE"""
+    # O serviço regravou o arquivo, então o índice é reconstruído já com elas
+    unread_counts = await read_notification_index_async(lambda index: get_unread_counts(index, notifications))
+    publish_notifications(notifications, unread_counts)
+
+notification_service.add_release_listener(publish_released_notifications)
+
+def compact_notifications() -> dict:
+    """Move notificações lidas antigas e emails finalizados para os arquivos mensais"""
+    with notifications_lock:
+        notifications_data = load_json_data("notifications.json")
+        retention_days = notifications_data.get("settings", {}).get(
+            "retention_days", NOTIFICATION_RETENTION_DAYS
+        )
+    
+        archived_notifications, archived_emails = compact_notifications_data(
+            notifications_data, retention_days
+        )
+    
+        if archived_notifications or archived_emails:
+            if not save_notifications_data(notifications_data):
+                raise RuntimeError("Failed to save notifications")
+            logger.info("🗄️ %d notificações e %d emails arquivados", archived_notifications, archived_emails)
+    
+    return {
+        "archived_notifications": archived_notifications,
+        "archived_emails": archived_emails
+    }
+
+async def run_notification_retention():
+    """Executa a compactação do histórico de notificações periodicamente"""
+    while True:
+        await asyncio.sleep(NOTIFICATION_RETENTION_INTERVAL_HOURS * 3600)
+        try:
+            # Lê e regrava o histórico inteiro; fora do event loop
+            await asyncio.to_thread(compact_notifications)
+        except Exception as e:
+            logger.error("❌ Erro ao arquivar notificações: %s", e)
+
 def reset_to_initial_data():
     """Reseta todos os dados para o estado inicial limpo"""
-    print("🔄 Resetando dados para estado inicial limpo...")
+    logger.info("🔄 Resetando dados para estado inicial limpo...")
+    
+    if RESET_SNAPSHOT:
+        restored = restore_data_dir(RESET_SNAPSHOT, DATA_DIR)
+        logger.info("🎯 Dados restaurados do snapshot %s (%d arquivos)", RESET_SNAPSHOT, len(restored))
+        return
     
     # Resetar cada arquivo de dados
     data_files = {
@@ -110,124 +540,148 @@ def reset_to_initial_data():
     
     for filename, initial_data in data_files.items():
         if save_json_data(filename, initial_data):
-            print(f"✅ {filename} resetado com sucesso")
+            logger.debug("✅ %s resetado com sucesso", filename)
         else:
-            print(f"❌ Erro ao resetar {filename}")
+            logger.error("❌ Erro ao resetar %s", filename)
     
-    print("🎯 Sistema iniciado com dados limpos!")
+    logger.info("🎯 Sistema iniciado com dados limpos!")
 
 async def create_grade_notification(student_id: str, grade_type: str, grade_value: float):
     """Cria notificação automática quando uma nota é lançada"""
     try:
-        notifications_data = load_json_data("notifications.json")
-        
-        # Mapear tipos de nota para nomes amigáveis
-        grade_names = {
-            "np1": "NP1 (Primeira Prova)",
-            "np2": "NP2 (Segunda Prova)", 
-            "ava": "AVA (Atividades Virtuais)",
-            "pim": "PIM (Projeto Integrado)"
-        }
-        
-        grade_name = grade_names.get(grade_type, grade_type.upper())
+        title, message = render_grade_notification(grade_type, grade_value)
         
         # Criar notificação
         new_notification = {
-            "id": f"notif_{uuid.uuid4().hex[:8]}",
+            "id": new_id("notif"),
             "user_id": student_id,
-            "title": f"Nova nota lançada: {grade_name}",
-            "message": f"Sua nota em {grade_name} foi lançada: {grade_value:.1f}. Acesse a página de notas para ver mais detalhes.",
+            "title": title,
+            "message": message,
             "type": "grade",
             "read": False,
-            "created_at": datetime.utcnow().isoformat() + "Z",
+            "created_at": utc_now_iso(),
             "scheduled_for": None,
             "sent": True
         }
         
-        # Adicionar à lista
-        if "notifications" not in notifications_data:
-            notifications_data["notifications"] = []
-        
-        notifications_data["notifications"].append(new_notification)
-        
-        # Salvar dados
-        save_json_data("notifications.json", notifications_data)
-        print(f"📧 Notificação criada para aluno {student_id}: {grade_name} = {grade_value}")
+        # Gravação fora do event loop (pode esperar um lote de eventos em andamento)
+        unread_counts = await asyncio.to_thread(append_notifications, [new_notification])
+        if unread_counts is not None:
+            publish_notifications([new_notification], unread_counts)
+        logger.debug("📧 Notificação de nota criada para aluno %s: %s = %s", student_id, grade_type, grade_value,
+                     extra={"user_id": student_id, "grade_type": grade_type})
         
     except Exception as e:
-        print(f"❌ Erro ao criar notificação: {e}")
+        logger.error("❌ Erro ao criar notificação: %s", e)
 
-async def create_event_notifications(class_id: str, event: dict):
-    """Cria notificações automáticas para alunos quando um evento é criado"""
-    try:
-        # Carregar dados das turmas e notificações
-        classes_data = load_json_data("classes.json")
-        notifications_data = load_json_data("notifications.json")
-        
-        # Encontrar a turma
-        target_class = None
-        for cls in classes_data.get("classes", []):
-            if cls["id"] == class_id:
-                target_class = cls
-                break
-        
+# Quantidade máxima de eventos processados por gravação em lote
+EVENT_NOTIFICATION_BATCH_SIZE = 50
+
+# Fila de notificações de eventos processada em segundo plano
+event_notification_queue: Optional[asyncio.Queue] = None
+event_notification_worker: Optional[asyncio.Task] = None
+notification_retention_task: Optional[asyncio.Task] = None
+
+def create_event_notifications_batch(jobs: List[tuple]) -> tuple:
+    """
+    Cria notificações para vários eventos com uma única leitura e gravação
+
+    Roda fora do event loop (ver process_event_notification_queue); por isso
+    não publica no canal SSE e retorna as notificações criadas e as não lidas
+    de cada aluno para quem chamou publicar.
+    """
+    classes_data = load_json_data("classes.json")
+    classes_by_id = {cls["id"]: cls for cls in classes_data.get("classes", [])}
+    created_notifications = []
+    
+    for class_id, event in jobs:
+        target_class = classes_by_id.get(class_id)
         if not target_class:
-            print(f"❌ Turma {class_id} não encontrada")
-            return
-        
-        # Mapear tipos de evento para nomes amigáveis
-        event_types = {
-            "aula": "Aula",
-            "prova": "Prova",
-            "trabalho": "Trabalho",
-            "projeto": "Projeto"
-        }
+            logger.warning("❌ Turma %s não encontrada", class_id)
+            continue
         
-        event_type_name = event_types.get(event["type"], event["type"].title())
+        try:
+            # Conteúdo renderizado uma vez por evento, compartilhado pelos alunos
+            title, message = render_event_notification(event)
+        except Exception as e:
+            logger.error("❌ Erro ao montar notificação do evento %s: %s", event.get("id"), e)
+            continue
         
-        # Formatar data do evento
-        event_date = datetime.fromisoformat(event["date"].replace("Z", "+00:00"))
-        formatted_date = event_date.strftime("%d/%m/%Y às %H:%M")
+        created_at = utc_now_iso()
         
         # Criar notificação para cada aluno da turma
-        for student_id in target_class.get("students", []):
-            new_notification = {
-                "id": f"notif_{uuid.uuid4().hex[:8]}",
+        students = target_class.get("students", [])
+        for student_id in students:
+            created_notifications.append({
+                "id": new_id("notif"),
                 "user_id": student_id,
-                "title": f"Novo evento: {event_type_name}",
-                "message": f"Foi criado um novo evento '{event['title']}' para {formatted_date} em {event['location']}. Verifique seu calendário para mais detalhes.",
+                "title": title,
+                "message": message,
                 "type": "event",
                 "read": False,
-                "created_at": datetime.utcnow().isoformat() + "Z",
+                "created_at": created_at,
                 "scheduled_for": None,
                 "sent": True
-            }
-            
-            # Adicionar à lista
-            if "notifications" not in notifications_data:
-                notifications_data["notifications"] = []
-            
-            notifications_data["notifications"].append(new_notification)
-            print(f"📅 Notificação de evento criada para aluno {student_id}: {event['title']}")
+            })
         
-        # Salvar dados
-        save_json_data("notifications.json", notifications_data)
+        logger.info("📅 Notificações do evento '%s' criadas para %d alunos", event["title"], len(students),
+                    extra={"event_id": event.get("id"), "class_id": class_id, "recipients": len(students)})
+    
+    if not created_notifications:
+        return [], {}
+    
+    unread_counts = append_notifications(created_notifications)
+    if unread_counts is None:
+        return [], {}
+    return created_notifications, unread_counts
+
+def enqueue_event_notifications(class_id: str, event: dict):
+    """Agenda a criação das notificações do evento sem bloquear a requisição"""
+    if event_notification_queue is None:
+        # Fila ainda não iniciada (ex.: chamada fora do ciclo de vida da aplicação)
+        publish_notifications(*create_event_notifications_batch([(class_id, event)]))
+        return
+    
+    event_notification_queue.put_nowait((class_id, event))
+
+async def process_event_notification_queue():
+    """Consome a fila de eventos e grava as notificações em lote"""
+    while True:
+        jobs = [await event_notification_queue.get()]
         
-    except Exception as e:
-        print(f"❌ Erro ao criar notificações de evento: {e}")
+        # Agrupar eventos que chegaram enquanto o anterior era processado
+        while len(jobs) < EVENT_NOTIFICATION_BATCH_SIZE and not event_notification_queue.empty():
+            jobs.append(event_notification_queue.get_nowait())
+        
+        try:
+            # Distribuição e regravação do arquivo fora do event loop, para
+            # turmas grandes não travarem as demais requisições
+            created_notifications, unread_counts = await asyncio.to_thread(create_event_notifications_batch, jobs)
+            publish_notifications(created_notifications, unread_counts)
+        except Exception as e:
+            logger.error("❌ Erro ao criar notificações de evento: %s", e)
+        finally:
+            for _ in jobs:
+                event_notification_queue.task_done()
 
 # Funções de autenticação
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica senha (por simplicidade, comparação direta)"""
     return plain_password == hashed_password
 
+# Índice em memória dos usuários (autenticação e validação de matrículas)
+user_index = UserIndex()
+
+def get_user_index() -> UserIndex:
+    """Obtém o índice de usuários, reconstruindo-o se users.json mudou"""
+    signature = get_data_file_signature("users.json")
+    if signature is None or signature != user_index.signature:
+        user_index.rebuild(load_json_data("users.json"), signature)
+    return user_index
+
 def get_user(username: str):
-    """Busca usuário no arquivo JSON"""
-    users_data = load_json_data("users.json")
-    for user in users_data.get("users", []):
-        if user["username"] == username:
-            return user
-    return None
+    """Busca usuário pelo username"""
+    return get_user_index().by_username.get(username)
 
 def authenticate_user(username: str, password: str):
     """Autentica usuário"""
@@ -247,17 +701,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Obtém usuário atual do token"""
+def get_user_from_token(token: str, scope: Optional[str] = None):
+    """
+    Valida o token JWT e retorna o usuário correspondente
+
+    Tokens de uso restrito (claim `scope`, ex.: o do stream SSE) só valem
+    quando o mesmo `scope` é pedido; o token de login não tem `scope`.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        if username is None or payload.get("scope") != scope:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
@@ -267,6 +726,26 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise credentials_exception
     return user
 
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Obtém usuário atual do token"""
+    return get_user_from_token(credentials.credentials)
+
+def can_profile(token: str) -> bool:
+    """Apenas professores podem solicitar profiling"""
+    return get_user_from_token(token)["role"] == "professor"
+
+# Profiling sob demanda: registrado apenas quando habilitado
+if PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        authorize=can_profile,
+        output_dir=PROFILING_DIR,
+        max_files=PROFILING_MAX_FILES,
+        top_n=PROFILING_TOP_N,
+        excluded_paths=["/api/notifications/stream"],
+    )
+    logger.info("🔬 Profiling sob demanda habilitado (perfis em %s)", PROFILING_DIR)
+
 # Rotas de autenticação
 @app.post("/api/auth/login", response_model=Token)
 async def login(login_data: LoginRequest):
@@ -300,35 +779,248 @@ async def read_users_me(current_user: dict = Depends(get_current_user)):
 
 # Rotas de dados
 @app.get("/api/users")
-async def get_users(current_user: dict = Depends(get_current_user)):
+async def get_users(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
     """Lista usuários (apenas professores)"""
     if current_user["role"] != "professor":
         raise HTTPException(status_code=403, detail="Access forbidden")
     
+    etag = collection_versions.build_etag("users", get_collection_version("users.json"))
+    not_modified = check_not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    
     users_data = load_json_data("users.json")
     users = [{k: v for k, v in user.items() if k != "password"} 
              for user in users_data.get("users", [])]
     return {"users": users}
 
 @app.get("/api/classes")
-async def get_classes(current_user: dict = Depends(get_current_user)):
+async def get_classes(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
     """Lista turmas"""
+    etag = collection_versions.build_etag("classes", get_collection_version("classes.json"))
+    not_modified = check_not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    
     classes_data = load_json_data("classes.json")
     return classes_data
 
+# Rotas de matrículas (turmas do professor)
+def get_professor_class(classes_data: dict, class_id: str, current_user: dict) -> dict:
+    """Turma do professor atual (403 para alunos ou turma de outro professor, 404 se não existir)"""
+    if current_user["role"] != "professor":
+        raise HTTPException(status_code=403, detail="Access forbidden")
+    
+    for cls in classes_data.get("classes", []):
+        if cls["id"] == class_id:
+            if cls["professor_id"] != current_user["id"]:
+                raise HTTPException(status_code=403, detail="Not your class")
+            return cls
+    raise HTTPException(status_code=404, detail="Class not found")
+
+def save_class_roster(classes_data: dict, target_class: dict, students: List[str]):
+    """Grava a nova lista de alunos da turma e atualiza as visões por aluno"""
+    target_class["students"] = students
+    views_in_sync = student_views.signatures == get_student_view_signatures()
+    if not save_json_data("classes.json", classes_data):
+        raise HTTPException(status_code=500, detail="Failed to save class roster")
+    update_student_views(views_in_sync, lambda views: views.set_class_students(target_class["id"], students))
+
+def format_roster_student(user: dict) -> dict:
+    return {
+        "id": user["id"],
+        "username": user["username"],
+        "name": user.get("name"),
+        "email": user.get("email"),
+        "registration": user.get("registration"),
+    }
+
+@app.get("/api/classes/{class_id}/students")
+async def get_class_roster(class_id: str, current_user: dict = Depends(get_current_user)):
+    """Lista os alunos matriculados na turma (apenas o professor da turma)"""
+    target_class = get_professor_class(load_json_data("classes.json"), class_id, current_user)
+    users = get_user_index().by_id
+    students = [
+        format_roster_student(users[student_id])
+        for student_id in target_class.get("students", []) if student_id in users
+    ]
+    return {"class_id": class_id, "students": students}
+
+@app.post("/api/classes/{class_id}/students")
+async def add_class_students(class_id: str, request_data: RosterUpdateRequest, current_user: dict = Depends(get_current_user)):
+    """Matricula alunos (por ID ou username) na turma"""
+    classes_data = load_json_data("classes.json")
+    target_class = get_professor_class(classes_data, class_id, current_user)
+    
+    index = get_user_index()
+    unknown = [identifier for identifier in request_data.student_ids if index.get_student(identifier) is None]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Students not found: {', '.join(unknown[:ROSTER_IMPORT_MAX_ERRORS])}")
+    
+    students = list(target_class.get("students", []))
+    enrolled = set(students)
+    added = 0
+    for identifier in request_data.student_ids:
+        student_id = index.get_student(identifier)["id"]
+        if student_id not in enrolled:
+            enrolled.add(student_id)
+            students.append(student_id)
+            added += 1
+    
+    if added:
+        save_class_roster(classes_data, target_class, students)
+    return {"class_id": class_id, "added": added, "students": len(students)}
+
+@app.delete("/api/classes/{class_id}/students/{student_id}")
+async def remove_class_student(class_id: str, student_id: str, current_user: dict = Depends(get_current_user)):
+    """Remove a matrícula de um aluno da turma"""
+    classes_data = load_json_data("classes.json")
+    target_class = get_professor_class(classes_data, class_id, current_user)
+    
+    students = target_class.get("students", [])
+    if student_id not in set(students):
+        raise HTTPException(status_code=404, detail="Student not enrolled in this class")
+    
+    remaining = [enrolled_id for enrolled_id in students if enrolled_id != student_id]
+    save_class_roster(classes_data, target_class, remaining)
+    return {"class_id": class_id, "removed": 1, "students": len(remaining)}
+
+def apply_roster_import(class_id: str, current_user: dict, imported: List[str], mode: str) -> tuple:
+    """
+    Aplica os alunos validados do CSV sobre a versão atual da turma
+
+    Recarrega classes.json e grava sem await entre a leitura e a gravação,
+    para não sobrescrever alterações feitas enquanto o CSV era recebido.
+
+    Returns:
+        (adicionados, removidos, nova lista de alunos)
+    """
+    classes_data = load_json_data("classes.json")
+    target_class = get_professor_class(classes_data, class_id, current_user)
+    
+    current_students = target_class.get("students", [])
+    enrolled = set(current_students)
+    added = [student_id for student_id in imported if student_id not in enrolled]
+    if mode == "replace":
+        students = imported
+        kept = set(imported)
+        removed = [student_id for student_id in current_students if student_id not in kept]
+    else:
+        students = current_students + added
+        removed = []
+    
+    if added or removed:
+        save_class_roster(classes_data, target_class, students)
+    return added, removed, students
+
+@app.post("/api/classes/{class_id}/students/import")
+async def import_class_roster(
+    class_id: str,
+    request: Request,
+    mode: Literal["add", "replace"] = "add",
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Importa matrículas de um CSV enviado no corpo da requisição (text/csv)
+
+    O CSV é lido em streaming, linha a linha. A primeira linha pode ser um
+    cabeçalho com a coluna `student_id` ou `username`; sem cabeçalho, a
+    primeira coluna é usada. Cada linha é validada no índice de usuários e,
+    se todas forem válidas, a turma é gravada uma única vez ("add" soma aos
+    alunos atuais, "replace" substitui a lista). Com qualquer linha inválida,
+    ou sem nenhuma linha de aluno, nada é gravado e a resposta é 400.
+    """
+    # Permissão verificada antes de ler o corpo; a turma é relida ao aplicar
+    get_professor_class(load_json_data("classes.json"), class_id, current_user)
+    index = get_user_index()
+    
+    imported: List[str] = []
+    seen = set()
+    errors = []
+    invalid_rows = 0
+    duplicates = 0
+    rows = 0
+    column = None
+    
+    try:
+        async for line_number, row in iter_csv_rows(request.stream()):
+            if column is None:
+                header = [value.strip().lower() for value in row]
+                column = next((header.index(name) for name in ROSTER_CSV_COLUMNS if name in header), None)
+                if column is not None:
+                    continue
+                column = 0  # Sem cabeçalho: primeira coluna
+            
+            rows += 1
+            if rows > ROSTER_IMPORT_MAX_ROWS:
+                raise HTTPException(status_code=413, detail=f"CSV exceeds {ROSTER_IMPORT_MAX_ROWS} rows")
+            
+            value = row[column].strip() if column < len(row) else ""
+            student = index.get_student(value) if value else None
+            if student is None:
+                invalid_rows += 1
+                if len(errors) < ROSTER_IMPORT_MAX_ERRORS:
+                    errors.append({"line": line_number, "value": value, "error": "Student not found"})
+                continue
+            
+            if student["id"] in seen:
+                duplicates += 1
+                continue
+            seen.add(student["id"])
+            imported.append(student["id"])
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    
+    if invalid_rows:
+        raise HTTPException(status_code=400, detail={
+            "message": "Invalid rows in CSV", "invalid_rows": invalid_rows, "errors": errors
+        })
+    
+    # CSV vazio ou só com cabeçalho: no modo "replace" esvaziaria a turma
+    if not imported:
+        raise HTTPException(status_code=400, detail="CSV has no student rows")
+    
+    added, removed, students = apply_roster_import(class_id, current_user, imported, mode)
+    
+    return {
+        "class_id": class_id,
+        "mode": mode,
+        "rows": rows,
+        "added": len(added),
+        "removed": len(removed),
+        "already_enrolled": len(imported) - len(added),
+        "duplicates": duplicates,
+        "students": len(students),
+    }
+
 @app.get("/api/grades")
-async def get_grades(current_user: dict = Depends(get_current_user)):
+async def get_grades(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = FIELDS_QUERY,
+    current_user: dict = Depends(get_current_user)
+):
     """Lista notas"""
-    grades_data = load_json_data("grades.json")
+    selected_fields = get_selected_fields(fields, GRADE_FIELDS)
     
-    # Filtrar por usuário se for aluno
+    # Alunos recebem apenas as próprias notas: ETag por usuário
+    etag_parts = ["grades", get_collection_version("grades.json")]
     if current_user["role"] == "aluno":
-        filtered_grades = [
-            grade for grade in grades_data.get("grades", [])
-            if grade["student_id"] == current_user["id"]
-        ]
-        return {"grades": filtered_grades}
+        etag_parts.append(current_user["id"])
+    if selected_fields:
+        etag_parts.append(".".join(selected_fields))
+    not_modified = check_not_modified(request, response, collection_versions.build_etag(*etag_parts))
+    if not_modified:
+        return not_modified
     
+    # Alunos: consulta direta na visão materializada
+    if current_user["role"] == "aluno":
+        student_grades = get_student_views().get_grades(current_user["id"])
+        return {"grades": select_fields_list(student_grades, selected_fields)}
+    
+    grades_data = load_json_data("grades.json")
+    if selected_fields:
+        return {"grades": select_fields_list(grades_data.get("grades", []), selected_fields)}
     return grades_data
 
 @app.put("/api/grades/update")
@@ -354,23 +1046,17 @@ async def update_grade(grade_data: UpdateGradeRequest, current_user: dict = Depe
         # Se não existe, criar novo registro
         if not grade_record:
             # Verificar se o aluno existe e está em uma turma do professor
-            users_data = load_json_data("users.json")
-            classes_data = load_json_data("classes.json")
-            
-            student = None
-            for user in users_data.get("users", []):
-                if user["id"] == grade_data.student_id and user["role"] == "aluno":
-                    student = user
-                    break
-            
-            if not student:
+            student = get_user_index().by_id.get(grade_data.student_id)
+            if not student or student["role"] != "aluno":
                 raise HTTPException(status_code=404, detail="Student not found")
             
             # Encontrar turma do aluno que seja do professor
+            classes_data = load_json_data("classes.json")
+            views = get_student_views()
             student_class = None
             for cls in classes_data.get("classes", []):
                 if (cls["professor_id"] == current_user["id"] and 
-                    grade_data.student_id in cls.get("students", [])):
+                    views.is_enrolled(grade_data.student_id, cls["id"])):
                     student_class = cls
                     break
             
@@ -379,7 +1065,7 @@ async def update_grade(grade_data: UpdateGradeRequest, current_user: dict = Depe
             
             # Criar novo registro de nota
             grade_record = {
-                "id": f"grade_{uuid.uuid4().hex[:8]}",
+                "id": new_id("grade"),
                 "student_id": grade_data.student_id,
                 "class_id": student_class["id"],
                 "semester": "2024.1",  # Pode ser parametrizado
@@ -389,15 +1075,15 @@ async def update_grade(grade_data: UpdateGradeRequest, current_user: dict = Depe
                 "pim": None,
                 "final_grade": None,
                 "status": "em_andamento",
-                "created_at": datetime.utcnow().isoformat() + "Z",
-                "updated_at": datetime.utcnow().isoformat() + "Z"
+                "created_at": utc_now_iso(),
+                "updated_at": utc_now_iso()
             }
             grades_data.setdefault("grades", []).append(grade_record)
         
         # Atualizar a nota específica
         if grade_data.grade_type in ["np1", "np2", "ava", "pim"]:
             grade_record[grade_data.grade_type] = grade_data.value
-            grade_record["updated_at"] = datetime.utcnow().isoformat() + "Z"
+            grade_record["updated_at"] = utc_now_iso()
             
             # Recalcular nota final usando a fórmula (NP1 + NP2 + AVA + PIM) / 4
             grades = [grade_record.get("np1"), grade_record.get("np2"), 
@@ -422,7 +1108,9 @@ async def update_grade(grade_data: UpdateGradeRequest, current_user: dict = Depe
             raise HTTPException(status_code=400, detail="Invalid grade type")
         
         # Salvar dados
+        views_in_sync = student_views.signatures == get_student_view_signatures()
         if save_json_data("grades.json", grades_data):
+            update_student_views(views_in_sync, lambda views: views.apply_grade(grade_record))
             # Criar notificação automática para o aluno
             await create_grade_notification(grade_data.student_id, grade_data.grade_type, grade_data.value)
             return grade_record
@@ -435,25 +1123,33 @@ async def update_grade(grade_data: UpdateGradeRequest, current_user: dict = Depe
         raise HTTPException(status_code=500, detail=f"Error updating grade: {str(e)}")
 
 @app.get("/api/calendar")
-async def get_calendar(current_user: dict = Depends(get_current_user)):
+async def get_calendar(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = FIELDS_QUERY,
+    current_user: dict = Depends(get_current_user)
+):
     """Lista eventos do calendário"""
-    calendar_data = load_json_data("calendar.json")
+    selected_fields = get_selected_fields(fields, EVENT_FIELDS)
+    
+    # Para alunos o filtro depende também das turmas: ETag por usuário
+    etag_parts = ["calendar", get_collection_version("calendar.json")]
+    if current_user["role"] == "aluno":
+        etag_parts += [get_collection_version("classes.json"), current_user["id"]]
+    if selected_fields:
+        etag_parts.append(".".join(selected_fields))
+    not_modified = check_not_modified(request, response, collection_versions.build_etag(*etag_parts))
+    if not_modified:
+        return not_modified
     
-    # Filtrar eventos por usuário
+    # Alunos: eventos das suas turmas vêm da visão materializada
     if current_user["role"] == "aluno":
-        # Buscar turmas do aluno
-        classes_data = load_json_data("classes.json")
-        user_classes = [
-            cls["id"] for cls in classes_data.get("classes", [])
-            if current_user["id"] in cls.get("students", [])
-        ]
-        
-        filtered_events = [
-            event for event in calendar_data.get("events", [])
-            if event.get("class_id") in user_classes
-        ]
-        return {"events": filtered_events}
+        student_events = get_student_views().get_events(current_user["id"])
+        return {"events": select_fields_list(student_events, selected_fields)}
     
+    calendar_data = load_json_data("calendar.json")
+    if selected_fields:
+        return {"events": select_fields_list(calendar_data.get("events", []), selected_fields)}
     return calendar_data
 
 @app.post("/api/calendar/events")
@@ -468,7 +1164,7 @@ async def create_event(event_data: CreateEventRequest, current_user: dict = Depe
         
         # Criar novo evento
         new_event = {
-            "id": f"event_{uuid.uuid4().hex[:8]}",
+            "id": new_id("event"),
             "type": event_data.type,
             "title": event_data.title,
             "description": event_data.description,
@@ -479,7 +1175,7 @@ async def create_event(event_data: CreateEventRequest, current_user: dict = Depe
             "location": event_data.location,
             "grade_type": event_data.grade_type,
             "due_date": event_data.due_date,
-            "created_at": datetime.utcnow().isoformat() + "Z"
+            "created_at": utc_now_iso()
         }
         
         # Adicionar evento à lista
@@ -489,9 +1185,11 @@ async def create_event(event_data: CreateEventRequest, current_user: dict = Depe
         calendar_data["events"].append(new_event)
         
         # Salvar dados
+        views_in_sync = student_views.signatures == get_student_view_signatures()
         if save_json_data("calendar.json", calendar_data):
-            # Criar notificações automáticas para alunos da turma
-            await create_event_notifications(event_data.class_id, new_event)
+            update_student_views(views_in_sync, lambda views: views.add_event(new_event))
+            # Notificações dos alunos são criadas em segundo plano
+            enqueue_event_notifications(event_data.class_id, new_event)
             return new_event
         else:
             raise HTTPException(status_code=500, detail="Failed to save event")
@@ -499,53 +1197,290 @@ async def create_event(event_data: CreateEventRequest, current_user: dict = Depe
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating event: {str(e)}")
 
+# Rotas do dashboard
+dashboard_cache = TTLCache(DASHBOARD_CACHE_TTL_SECONDS, max_entries=DASHBOARD_CACHE_MAX_ENTRIES)
+
+def get_dashboard_snapshot_version() -> tuple:
+    """Assinaturas dos arquivos usados no dashboard; muda a cada gravação"""
+    return (
+        get_data_file_signature("classes.json"),
+        get_data_file_signature("grades.json"),
+        get_data_file_signature("calendar.json"),
+        get_data_file_signature("notifications.json"),
+    )
+
+def load_dashboard_snapshot(user_id: str) -> DashboardSnapshot:
+    """Lê cada arquivo uma única vez para montar o dashboard (rodar via asyncio.to_thread)"""
+    notifications, unread_count = read_notification_index(
+        lambda index: (index.get_page(user_id, DASHBOARD_LIST_SIZE)[0], index.unread_count(user_id))
+    )
+    return DashboardSnapshot(
+        classes=load_json_data("classes.json").get("classes", []),
+        grades=load_json_data("grades.json").get("grades", []),
+        events=load_json_data("calendar.json").get("events", []),
+        notifications=notifications,
+        unread_count=unread_count,
+        now=datetime.now().astimezone(),
+    )
+
+@app.get("/api/dashboard")
+async def get_dashboard(current_user: dict = Depends(get_current_user)):
+    """Resumo do dashboard (eventos próximos, notas, não lidas e turmas) em uma requisição"""
+    user_id = current_user["id"]
+    version = get_dashboard_snapshot_version()
+    
+    dashboard = dashboard_cache.get(user_id, version)
+    if dashboard is not None:
+        metrics.inc("dashboard_cache_requests_total", {"result": "hit"})
+        return dashboard
+    
+    metrics.inc("dashboard_cache_requests_total", {"result": "miss"})
+    try:
+        snapshot = await asyncio.to_thread(load_dashboard_snapshot, user_id)
+        dashboard = build_dashboard(current_user, snapshot)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building dashboard: {str(e)}")
+    
+    dashboard_cache.set(user_id, dashboard, version)
+    return dashboard
+
 # Rotas de notificações
 @app.get("/api/notifications")
-async def get_notifications(unread_only: bool = False, current_user: dict = Depends(get_current_user)):
-    """Lista notificações do usuário"""
+async def get_notifications(
+    unread_only: bool = False,
+    limit: int = Query(NOTIFICATIONS_PAGE_SIZE, ge=1, le=NOTIFICATIONS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    current_user: dict = Depends(get_current_user)
+):
+    """Lista notificações do usuário (mais recentes primeiro), paginadas por cursor"""
+    selected_fields = get_selected_fields(fields, NOTIFICATION_FIELDS)
+    try:
+        notifications, next_cursor = await read_notification_index_async(
+            lambda index: index.get_page(current_user["id"], limit, cursor=cursor, unread_only=unread_only)
+        )
+        return {"notifications": select_fields_list(notifications, selected_fields), "next_cursor": next_cursor}
+        
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching notifications: {str(e)}")
+
+@app.get("/api/notifications/unread-count")
+async def get_unread_notifications_count(current_user: dict = Depends(get_current_user)):
+    """Retorna a quantidade de notificações não lidas do usuário"""
+    unread_count = await read_notification_index_async(lambda index: index.unread_count(current_user["id"]))
+    return {"unread_count": unread_count}
+
+def format_sse(event: str, data: dict) -> str:
+    """Formata uma mensagem no padrão Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/api/notifications/stream-token")
+async def create_notification_stream_token(current_user: dict = Depends(get_current_user)):
+    """Emite o token curto usado para abrir o stream SSE de notificações"""
+    token = create_access_token(
+        data={"sub": current_user["username"], "scope": NOTIFICATION_STREAM_SCOPE},
+        expires_delta=timedelta(seconds=NOTIFICATION_STREAM_TOKEN_SECONDS)
+    )
+    return {"token": token, "expires_in": NOTIFICATION_STREAM_TOKEN_SECONDS}
+
+@app.get("/api/notifications/stream")
+async def stream_notifications(request: Request, token: str):
+    """
+    Canal SSE com as notificações do usuário em tempo real
+
+    O token vai na query string porque EventSource não permite headers; por
+    isso ele vem de /api/notifications/stream-token (expira em segundos e só
+    abre o stream) e o token de login nunca aparece nos logs de acesso.
+    """
+    current_user = get_user_from_token(token, scope=NOTIFICATION_STREAM_SCOPE)
+    user_id = current_user["id"]
+    subscription = notification_pubsub.subscribe(user_id)
+    
+    def read_unread_count():
+        return read_notification_index_async(lambda index: index.unread_count(user_id))
+    
+    async def event_stream():
+        try:
+            yield format_sse("ready", {"unread_count": await read_unread_count()})
+            
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                if message is None:
+                    break
+                
+                # Mensagens foram descartadas: o cliente deve recarregar a lista
+                if message is RESYNC:
+                    yield format_sse("resync", {"unread_count": await read_unread_count()})
+                    continue
+                
+                yield format_sse("notification", message)
+        finally:
+            notification_pubsub.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/notifications/archive")
+async def get_notification_archive_months(current_user: dict = Depends(get_current_user)):
+    """Lista os meses com histórico de notificações arquivado"""
+    return {"months": list_archive_months()}
+
+@app.get("/api/notifications/archive/{month}")
+async def get_notification_archive(month: str, current_user: dict = Depends(get_current_user)):
+    """Retorna as notificações arquivadas do usuário em um mês (YYYY-MM)"""
     try:
+        notifications = get_archived_notifications(current_user["id"], month)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Month must be in YYYY-MM format")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading archive: {str(e)}")
+    
+    return {"month": month, "notifications": notifications}
+
+@app.post("/api/notifications/compact")
+async def compact_notifications_history(current_user: dict = Depends(get_current_user)):
+    """Executa a compactação do histórico imediatamente (apenas professores)"""
+    if current_user["role"] != "professor":
+        raise HTTPException(status_code=403, detail="Access forbidden")
+    
+    try:
+        return await asyncio.to_thread(compact_notifications)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error compacting notifications: {str(e)}")
+
+@app.get("/api/notifications/preferences")
+async def get_notification_preferences(current_user: dict = Depends(get_current_user)):
+    """Retorna as preferências de notificação do usuário"""
+    notifications_data = load_json_data("notifications.json")
+    preferences = notifications_data.get("preferences", {}).get(current_user["id"], {})
+    return {"email_digest": preferences.get("email_digest", False)}
+
+def save_notification_preferences(user_id: str, email_digest: bool) -> bool:
+    """Grava a preferência de resumo diário do usuário (rodar via asyncio.to_thread)"""
+    with notifications_lock:
         notifications_data = load_json_data("notifications.json")
+        preferences = notifications_data.setdefault("preferences", {}).setdefault(user_id, {})
+        preferences["email_digest"] = email_digest
         
-        # Filtrar notificações do usuário
-        user_notifications = [
-            notif for notif in notifications_data.get("notifications", [])
-            if notif.get("user_id") == current_user["id"]
-        ]
+        # Preferências não alteram o índice de notificações
+        return save_notifications_data(notifications_data, lambda index: None)
+
+@app.put("/api/notifications/preferences")
+async def update_notification_preferences(request_data: NotificationPreferencesRequest, current_user: dict = Depends(get_current_user)):
+    """Atualiza as preferências de notificação do usuário"""
+    try:
+        if await asyncio.to_thread(save_notification_preferences, current_user["id"], request_data.email_digest):
+            return {"email_digest": request_data.email_digest}
+        else:
+            raise HTTPException(status_code=500, detail="Failed to update preferences")
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating preferences: {str(e)}")
+
+def mark_user_notifications_read(user_id: str, request_data: MarkNotificationsReadRequest) -> dict:
+    """
+    Marca como lidas as notificações pedidas em uma única gravação
+
+    Escolha dos ids, gravação e contagem ficam sob a mesma trava; rodar via
+    asyncio.to_thread.
+    """
+    with notifications_lock:
+        index = get_notification_index()
+        try:
+            if request_data.all:
+                target_ids = set(index.unread_ids(user_id, cursor=request_data.before, until_id=request_data.until))
+            elif request_data.ids is not None:
+                target_ids = set(request_data.ids)
+            else:
+                raise HTTPException(status_code=400, detail="Provide ids or all")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Filtrar apenas não lidas se solicitado
-        if unread_only:
-            user_notifications = [
-                notif for notif in user_notifications
-                if not notif.get("read", False)
-            ]
+        if not target_ids:
+            return {"updated": 0, "unread_count": index.unread_count(user_id)}
         
-        # Ordenar por data de criação (mais recentes primeiro)
-        user_notifications.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        notifications_data = load_json_data("notifications.json")
         
-        return {"notifications": user_notifications}
+        # Atualizar em uma única passada
+        updated_ids = []
+        for notif in notifications_data.get("notifications", []):
+            if (notif.get("user_id") == user_id and notif.get("id") in target_ids
+                    and not notif.get("read", False) and is_released(notif)):
+                notif["read"] = True
+                updated_ids.append(notif["id"])
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching notifications: {str(e)}")
+        if not updated_ids:
+            return {"updated": 0, "unread_count": index.unread_count(user_id)}
+        
+        def update_index(index: NotificationIndex):
+            for notification_id in updated_ids:
+                index.mark_read(user_id, notification_id)
+        
+        # Salvar dados
+        if not save_notifications_data(notifications_data, update_index):
+            raise HTTPException(status_code=500, detail="Failed to update notifications")
+        return {"updated": len(updated_ids), "unread_count": notification_index.unread_count(user_id)}
 
-@app.put("/api/notifications/{notification_id}/read")
-async def mark_notification_as_read(notification_id: str, current_user: dict = Depends(get_current_user)):
-    """Marca notificação como lida"""
+@app.put("/api/notifications/read")
+async def mark_notifications_as_read(request_data: MarkNotificationsReadRequest, current_user: dict = Depends(get_current_user)):
+    """Marca várias notificações como lidas com uma única gravação"""
     try:
+        return await asyncio.to_thread(mark_user_notifications_read, current_user["id"], request_data)
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating notifications: {str(e)}")
+
+def mark_user_notification_read(user_id: str, notification_id: str) -> Optional[bool]:
+    """
+    Marca uma notificação do usuário como lida (rodar via asyncio.to_thread)
+
+    Returns:
+        None se a notificação não existe; senão, se a gravação deu certo
+    """
+    with notifications_lock:
         notifications_data = load_json_data("notifications.json")
         
         # Encontrar e atualizar a notificação
         updated = False
         for notif in notifications_data.get("notifications", []):
-            if notif.get("id") == notification_id and notif.get("user_id") == current_user["id"]:
+            if (notif.get("id") == notification_id and notif.get("user_id") == user_id
+                    and is_released(notif)):
                 notif["read"] = True
                 updated = True
                 break
         
         if not updated:
-            raise HTTPException(status_code=404, detail="Notification not found")
+            return None
         
         # Salvar dados
-        if save_json_data("notifications.json", notifications_data):
+        return save_notifications_data(notifications_data, lambda index: index.mark_read(user_id, notification_id))
+
+@app.put("/api/notifications/{notification_id}/read")
+async def mark_notification_as_read(notification_id: str, current_user: dict = Depends(get_current_user)):
+    """Marca notificação como lida"""
+    try:
+        saved = await asyncio.to_thread(mark_user_notification_read, current_user["id"], notification_id)
+        if saved is None:
+            raise HTTPException(status_code=404, detail="Notification not found")
+        if saved:
             return {"message": "Notification marked as read"}
         else:
             raise HTTPException(status_code=500, detail="Failed to update notification")
@@ -568,29 +1503,23 @@ async def create_notification(
         raise HTTPException(status_code=403, detail="Access forbidden")
     
     try:
-        notifications_data = load_json_data("notifications.json")
-        
         # Criar nova notificação
         new_notification = {
-            "id": f"notif_{uuid.uuid4().hex[:8]}",
+            "id": new_id("notif"),
             "user_id": user_id,
             "title": title,
             "message": message,
             "type": notification_type,
             "read": False,
-            "created_at": datetime.utcnow().isoformat() + "Z",
+            "created_at": utc_now_iso(),
             "scheduled_for": None,
             "sent": True
         }
         
-        # Adicionar à lista
-        if "notifications" not in notifications_data:
-            notifications_data["notifications"] = []
-        
-        notifications_data["notifications"].append(new_notification)
-        
-        # Salvar dados
-        if save_json_data("notifications.json", notifications_data):
+        # Salvar dados (fora do event loop)
+        unread_counts = await asyncio.to_thread(append_notifications, [new_notification])
+        if unread_counts is not None:
+            publish_notifications([new_notification], unread_counts)
             return new_notification
         else:
             raise HTTPException(status_code=500, detail="Failed to save notification")
@@ -604,6 +1533,26 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Métricas no formato de texto do Prometheus"""
+    # Valores lidos no momento da coleta
+    metrics.set("grade_calculator_c_library_loaded", 1 if grade_calculator.lib else 0)
+    
+    email_metrics = notification_service.get_email_metrics()
+    metrics.set("notification_email_sent_total", email_metrics["sent_total"])
+    metrics.set("notification_email_failed_total", email_metrics["failed_total"])
+    metrics.set("notification_email_retried_total", email_metrics["retried_total"])
+    metrics.set("notification_email_queue_depth", email_metrics["queue_depth"])
+    metrics.set("notification_email_oldest_pending_seconds", email_metrics["oldest_pending_seconds"])
+    metrics.set("notification_email_last_batch_throughput", email_metrics["last_batch_throughput"])
+    
+    metrics.set("notification_stream_connections", notification_pubsub.connection_count())
+    metrics.set("event_notification_queue_depth",
+                event_notification_queue.qsize() if event_notification_queue is not None else 0)
+    
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,93 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# Atributos padrão do LogRecord (o resto veio de `extra=` e vai para o JSON)
+STANDARD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, incluindo os campos passados em `extra=`"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def parse_logger_levels(value: str) -> Dict[str, str]:
+    """Converte "notifications=DEBUG,uvicorn=WARNING" em {"notifications": "DEBUG", ...}"""
+    levels = {}
+    for entry in value.split(","):
+        if "=" in entry:
+            name, level = entry.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None,
+                      logger_levels: Optional[str] = None) -> QueueListener:
+    """
+    Configura o logging da aplicação com escrita em segundo plano
+
+    Os handlers da aplicação só colocam o registro em uma fila (sem bloquear);
+    uma thread do QueueListener formata e escreve no stdout. Assim, muitas
+    mensagens em uma requisição não esperam pelo terminal ou pipe.
+
+    Args:
+        level: Nível raiz (padrão: LOG_LEVEL ou INFO)
+        log_format: "text" ou "json" (padrão: LOG_FORMAT ou text)
+        logger_levels: Níveis por logger (padrão: LOG_LEVELS, ex.: "notifications=DEBUG")
+
+    Returns:
+        Listener em execução (encerrado automaticamente na saída do processo)
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    log_format = (log_format or os.getenv("LOG_FORMAT", "text")).lower()
+    logger_levels = logger_levels if logger_levels is not None else os.getenv("LOG_LEVELS", "")
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    for name, logger_level in parse_logger_levels(logger_levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+def stop_logging():
+    """Escreve as mensagens pendentes e encerra a thread de escrita"""
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    _listener = None
@@ -0,0 +1,113 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Limites (segundos) dos histogramas de latência
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+def make_labels(labels: Optional[Dict[str, str]]) -> LabelSet:
+    """Converte rótulos em tupla ordenada (chave do dicionário de séries)"""
+    return tuple(sorted((labels or {}).items()))
+
+def escape_label_value(value: str) -> str:
+    """Escapa valor de rótulo no formato de texto do Prometheus"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(labels: LabelSet, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Formata rótulos como {a="1",b="2"}"""
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label_value(value)}"' for key, value in pairs) + "}"
+
+def format_value(value: float) -> str:
+    """Formata número sem casas decimais desnecessárias"""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Histogram:
+    """Histograma com limites fixos (contagens por faixa, soma e total)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class MetricsRegistry:
+    """
+    Registro de métricas em memória exportado no formato de texto do Prometheus
+
+    Métricas são declaradas com describe() e atualizadas por série de
+    rótulos. As operações são protegidas por lock, pois parte do trabalho
+    (envio de emails, por exemplo) roda em threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # nome -> (tipo, descrição, limites do histograma)
+        self._meta: Dict[str, Tuple[str, str, Optional[Tuple[float, ...]]]] = {}
+        self._values: Dict[str, Dict[LabelSet, object]] = {}
+
+    def describe(self, name: str, metric_type: str, help_text: str,
+                 buckets: Optional[Tuple[float, ...]] = None):
+        """Declara uma métrica (counter, gauge ou histogram)"""
+        with self._lock:
+            self._meta[name] = (metric_type, help_text, buckets or LATENCY_BUCKETS)
+            self._values.setdefault(name, {})
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1):
+        """Incrementa um contador"""
+        key = make_labels(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Define o valor de um gauge"""
+        with self._lock:
+            self._values[name][make_labels(labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Registra uma observação em um histograma"""
+        key = make_labels(labels)
+        with self._lock:
+            series = self._values[name]
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._meta[name][2])
+            histogram.observe(value)
+
+    def render(self) -> str:
+        """Exporta todas as métricas no formato de texto do Prometheus"""
+        lines: List[str] = []
+        with self._lock:
+            for name, (metric_type, help_text, _) in self._meta.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+                for labels, value in sorted(self._values[name].items()):
+                    if metric_type != "histogram":
+                        lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+                        continue
+
+                    cumulative = 0
+                    for bound, count in zip(value.buckets + (float("inf"),), value.counts):
+                        cumulative += count
+                        le = ("le", format_value(bound))
+                        lines.append(f"{name}_bucket{format_labels(labels, le)} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {format_value(value.sum)}")
+                    lines.append(f"{name}_count{format_labels(labels)} {value.count}")
+
+        return "\n".join(lines) + "\n"
+
+# Instância global de métricas
+metrics = MetricsRegistry()
@@ -0,0 +1,49 @@
+import time
+
+from monitoring.metrics import MetricsRegistry
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que registra latência, contagem e status por rota
+
+    A rota é o caminho declarado (ex.: /api/notifications/{notification_id}/read),
+    não a URL recebida, para não criar uma série por ID. A latência vai até o
+    início da resposta, então conexões longas (SSE) não distorcem o histograma.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        recorded = False
+
+        def record(status_code: int):
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+
+            route = scope.get("route")
+            labels = {
+                "method": scope["method"],
+                "route": getattr(route, "path", "unmatched"),
+            }
+            self.registry.observe("http_request_duration_seconds", time.perf_counter() - started, labels)
+            self.registry.inc("http_requests_total", {**labels, "status": str(status_code)})
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        except Exception:
+            record(500)
+            raise
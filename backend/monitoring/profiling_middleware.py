@@ -0,0 +1,155 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+def parse_bearer_token(headers: Iterable) -> Optional[str]:
+    """Extrai o token Bearer dos cabeçalhos ASGI"""
+    for name, value in headers:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token.strip()
+    return None
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que executa a requisição sob cProfile quando solicitado
+
+    Só deve ser registrado com o modo de profiling ligado na configuração;
+    desligado, o middleware nem entra na pilha. Uma requisição é perfilada
+    quando traz o cabeçalho X-Profile e um token aceito por `authorize`:
+
+    - X-Profile: file    grava o .prof no diretório (os mais antigos são apagados)
+    - X-Profile: summary devolve as top-N funções no lugar da resposta
+
+    O cProfile mede a thread do event loop inteira enquanto a requisição
+    roda, então requisições simultâneas aparecem no mesmo perfil.
+    """
+
+    def __init__(self, app, authorize: Callable[[str], bool], output_dir: str,
+                 max_files: int = 50, top_n: int = 30,
+                 excluded_paths: Iterable[str] = ()):
+        """
+        Args:
+            app: Aplicação ASGI
+            authorize: Recebe o token e diz se o usuário pode perfilar
+            output_dir: Diretório dos arquivos .prof
+            max_files: Arquivos mantidos no diretório
+            top_n: Funções listadas no resumo
+            excluded_paths: Caminhos nunca perfilados (ex.: streams sem fim)
+        """
+        self.app = app
+        self.authorize = authorize
+        self.output_dir = output_dir
+        self.max_files = max_files
+        self.top_n = top_n
+        self.excluded_paths = set(excluded_paths)
+        # Só um perfil por vez: o cProfile é um hook global do interpretador
+        self._active = False
+
+    def _get_mode(self, scope) -> Optional[str]:
+        """Modo solicitado, se a requisição puder ser perfilada"""
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            return None
+
+        headers = scope.get("headers", [])
+        mode = next((value.decode("latin-1").strip().lower() for name, value in headers
+                     if name == PROFILE_HEADER), None)
+        if mode not in ("file", "summary"):
+            return None
+
+        token = parse_bearer_token(headers)
+        try:
+            return mode if token and self.authorize(token) else None
+        except Exception:
+            return None
+
+    async def __call__(self, scope, receive, send):
+        mode = self._get_mode(scope)
+        if mode is None or self._active:
+            await self.app(scope, receive, send)
+            return
+
+        if mode == "file":
+            await self._profile_to_file(scope, receive, send)
+        else:
+            await self._profile_to_summary(scope, receive, send)
+
+    async def _run_profiled(self, profiler: cProfile.Profile, scope, receive, send):
+        self._active = True
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            self._active = False
+
+    async def _profile_to_file(self, scope, receive, send):
+        profiler = cProfile.Profile()
+        filename = self._build_filename(scope)
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-file", filename.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self._run_profiled(profiler, scope, receive, send_with_header)
+        finally:
+            self._save_profile(profiler, filename)
+
+    async def _profile_to_summary(self, scope, receive, send):
+        profiler = cProfile.Profile()
+        original_status = 500
+
+        async def discard_response(message):
+            nonlocal original_status
+            if message["type"] == "http.response.start":
+                original_status = message["status"]
+
+        await self._run_profiled(profiler, scope, receive, discard_response)
+
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        body = output.getvalue().encode("utf-8")
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"x-profiled-status", str(original_status).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def _build_filename(self, scope) -> str:
+        """Nome do arquivo: horário, método e caminho da requisição"""
+        path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        timestamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        return f"{timestamp}_{scope['method']}_{path}.prof"
+
+    def _save_profile(self, profiler: cProfile.Profile, filename: str):
+        """Grava o perfil e apaga os mais antigos além de max_files"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.output_dir, filename))
+
+            profiles = sorted(name for name in os.listdir(self.output_dir) if name.endswith(".prof"))
+            for old_name in profiles[:-self.max_files]:
+                os.remove(os.path.join(self.output_dir, old_name))
+        except Exception as e:
+            logger.error("Erro ao salvar perfil %s: %s", filename, e)
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+# Tentativas de envio antes de um email ser marcado como falho (também usado
+# pela retenção, para saber quando um item antigo sem status já terminou)
+MAX_EMAIL_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+
+def parse_rate_limits(value: str) -> Dict[str, float]:
+    """
+    Converte "default=10,gmail.com=5" em {"default": 10.0, "gmail.com": 5.0}
+
+    Valores em mensagens por segundo, por provedor (domínio do destinatário).
+    """
+    limits = {}
+    for entry in value.split(","):
+        if "=" not in entry:
+            continue
+        provider, rate = entry.split("=", 1)
+        try:
+            limits[provider.strip().lower()] = float(rate)
+        except ValueError:
+            continue
+    return limits
+
+def parse_local_timestamp(value: str) -> datetime:
+    """Converte timestamp ISO em datetime com fuso; sem fuso é tratado como horário local"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+class TokenBucket:
+    """Limitador de taxa assíncrono (token bucket)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Aguarda até haver um token disponível"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class EmailDispatcher:
+    """
+    Despachante assíncrono da fila de emails
+
+    Envia itens vencidos em paralelo (limitado por `concurrency`), respeitando
+    o limite de taxa de cada provedor. Falhas são reagendadas com backoff
+    exponencial com jitter em `next_attempt_at`.
+    """
+
+    def __init__(self, send_func: Callable[[str, str, str], bool],
+                 concurrency: int = 4,
+                 rate_limits: Optional[Dict[str, float]] = None,
+                 max_attempts: int = MAX_EMAIL_ATTEMPTS,
+                 retry_base_seconds: float = 60,
+                 retry_max_seconds: float = 3600):
+        """
+        Args:
+            send_func: Função bloqueante (email, assunto, corpo) -> sucesso
+            concurrency: Envios simultâneos no máximo
+            rate_limits: Mensagens por segundo por provedor ("default" para os demais)
+            max_attempts: Tentativas antes de marcar o email como falho
+            retry_base_seconds: Atraso da primeira nova tentativa
+            retry_max_seconds: Atraso máximo entre tentativas
+        """
+        self.send_func = send_func
+        self.concurrency = concurrency
+        self.rate_limits = rate_limits or {}
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+        self.metrics = {
+            "sent_total": 0,
+            "failed_total": 0,
+            "retried_total": 0,
+            "last_batch_size": 0,
+            "last_batch_seconds": 0.0,
+            "last_batch_throughput": 0.0,
+            "queue_depth": 0,
+            "oldest_pending_seconds": 0.0,
+        }
+        # Criação do email pendente mais antigo; a idade é calculada na coleta
+        self._oldest_pending_at: Optional[datetime] = None
+
+    def is_pending(self, email_item: Dict) -> bool:
+        """Email ainda não enviado e com tentativas disponíveis"""
+        return (
+            not email_item.get("sent", False)
+            and email_item.get("status") != "failed"
+            and email_item.get("attempts", 0) < self.max_attempts
+        )
+
+    def is_due(self, email_item: Dict, now: datetime) -> bool:
+        """Email pendente cujo horário agendado e de nova tentativa já passaram"""
+        if not self.is_pending(email_item):
+            return False
+
+        for field in ("scheduled_for", "next_attempt_at"):
+            if email_item.get(field) and parse_local_timestamp(email_item[field]) > now:
+                return False
+        return True
+
+    def get_retry_delay(self, attempts: int) -> float:
+        """Backoff exponencial com jitter (metade fixa, metade aleatória)"""
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** (attempts - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def update_queue_metrics(self, email_queue: List[Dict]):
+        """Mede a fila gravada: profundidade e criação do item pendente mais antigo"""
+        pending = [item for item in email_queue if self.is_pending(item)]
+        self.metrics["queue_depth"] = len(pending)
+
+        oldest = min((item.get("created_at") or "" for item in pending), default="")
+        self._oldest_pending_at = parse_local_timestamp(oldest) if oldest else None
+
+    def get_metrics(self, now: Optional[datetime] = None) -> Dict:
+        """Métricas acumuladas, com a idade do pendente mais antigo calculada agora"""
+        now = now or datetime.now().astimezone()
+        metrics = dict(self.metrics)
+        if self._oldest_pending_at is not None:
+            metrics["oldest_pending_seconds"] = max(0.0, (now - self._oldest_pending_at).total_seconds())
+        return metrics
+
+    def _get_bucket(self, buckets: Dict[str, TokenBucket], to_email: str) -> Optional[TokenBucket]:
+        """Limitador do provedor do destinatário"""
+        provider = to_email.rsplit("@", 1)[-1].lower()
+        key = provider if provider in self.rate_limits else "default"
+        rate = self.rate_limits.get(key)
+        if not rate:
+            return None
+
+        if key not in buckets:
+            buckets[key] = TokenBucket(rate)
+        return buckets[key]
+
+    async def dispatch(self, email_queue: List[Dict],
+                       resolve_email: Callable[[str], Optional[str]]) -> List[Dict]:
+        """
+        Envia os emails vencidos da fila, atualizando os itens no próprio objeto
+
+        Args:
+            email_queue: Itens da fila (email_queue de notifications.json)
+            resolve_email: Obtém o email do destinatário pelo user_id
+
+        Returns:
+            Itens que foram processados (enviados ou reagendados)
+        """
+        now = datetime.now().astimezone()
+        due_items = [item for item in email_queue if self.is_due(item, now)]
+        started = time.monotonic()
+
+        # Limitadores criados por execução: primitivas asyncio pertencem a um event loop
+        semaphore = asyncio.Semaphore(self.concurrency)
+        buckets: Dict[str, TokenBucket] = {}
+        loop = asyncio.get_running_loop()
+        # Executor próprio: o padrão do asyncio pode ter menos threads que a concorrência desejada
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="email")
+
+        async def send_item(email_item: Dict):
+            to_email = resolve_email(email_item["user_id"])
+            success = False
+
+            if to_email:
+                bucket = self._get_bucket(buckets, to_email)
+                if bucket:
+                    await bucket.acquire()
+                async with semaphore:
+                    success = await loop.run_in_executor(
+                        executor, self.send_func, to_email, email_item["title"], email_item["message"]
+                    )
+
+            email_item["attempts"] = email_item.get("attempts", 0) + 1
+            if success:
+                email_item["sent"] = True
+                email_item["status"] = "sent"
+                email_item["next_attempt_at"] = None
+                email_item["last_error"] = None
+                self.metrics["sent_total"] += 1
+                return
+
+            email_item["last_error"] = "send failed" if to_email else "recipient email not found"
+            if email_item["attempts"] >= self.max_attempts:
+                email_item["status"] = "failed"
+                email_item["next_attempt_at"] = None
+                self.metrics["failed_total"] += 1
+            else:
+                delay = self.get_retry_delay(email_item["attempts"])
+                email_item["next_attempt_at"] = (datetime.now().astimezone() + timedelta(seconds=delay)).isoformat()
+                self.metrics["retried_total"] += 1
+
+        try:
+            await asyncio.gather(*(send_item(item) for item in due_items))
+        finally:
+            executor.shutdown(wait=False)
+
+        elapsed = time.monotonic() - started
+        self.metrics["last_batch_size"] = len(due_items)
+        self.metrics["last_batch_seconds"] = elapsed
+        self.metrics["last_batch_throughput"] = len(due_items) / elapsed if due_items and elapsed > 0 else 0.0
+
+        return due_items
@@ -0,0 +1,141 @@
+import gzip
+import json
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from notifications.email_dispatcher import MAX_EMAIL_ATTEMPTS
+
+DEFAULT_RETENTION_DAYS = 90
+
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "..", "data"))
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+ARCHIVE_FILE_PATTERN = re.compile(r"^notifications-(\d{4}-\d{2})\.json\.gz$")
+MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Converte timestamp ISO (com ou sem 'Z') para datetime em UTC"""
+    if not value:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def is_email_finished(email_item: Dict) -> bool:
+    """Email já enviado ou que esgotou as tentativas"""
+    if email_item.get("sent", False):
+        return True
+    if "status" in email_item:
+        return email_item["status"] == "failed"
+    # Itens antigos, sem status: o despachante tenta até MAX_EMAIL_ATTEMPTS vezes
+    return email_item.get("attempts", 0) >= MAX_EMAIL_ATTEMPTS
+
+def get_archive_path(month: str, archive_dir: str = ARCHIVE_DIR) -> str:
+    """Caminho do arquivo compactado de um mês (YYYY-MM)"""
+    return os.path.join(archive_dir, f"notifications-{month}.json.gz")
+
+def load_archive(month: str, archive_dir: str = ARCHIVE_DIR) -> Dict:
+    """Carrega o arquivo compactado de um mês"""
+    if not MONTH_PATTERN.match(month):
+        raise ValueError("Invalid month")
+
+    try:
+        with gzip.open(get_archive_path(month, archive_dir), "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"notifications": [], "email_queue": []}
+
+def save_archive(month: str, data: Dict, archive_dir: str = ARCHIVE_DIR):
+    """Salva o arquivo compactado de um mês de forma atômica"""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = get_archive_path(month, archive_dir)
+    temp_path = path + ".tmp"
+
+    with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+def list_archive_months(archive_dir: str = ARCHIVE_DIR) -> List[str]:
+    """Meses com histórico arquivado, mais recentes primeiro"""
+    try:
+        filenames = os.listdir(archive_dir)
+    except FileNotFoundError:
+        return []
+
+    months = [match.group(1) for match in map(ARCHIVE_FILE_PATTERN.match, filenames) if match]
+    return sorted(months, reverse=True)
+
+def get_archived_notifications(user_id: str, month: str, archive_dir: str = ARCHIVE_DIR) -> List[Dict]:
+    """Notificações arquivadas do usuário em um mês, mais recentes primeiro"""
+    archive = load_archive(month, archive_dir)
+    notifications = [n for n in archive.get("notifications", []) if n.get("user_id") == user_id]
+    notifications.sort(key=lambda n: (n.get("created_at") or "", n.get("id") or ""), reverse=True)
+    return notifications
+
+def compact_notifications_data(data: Dict, retention_days: int = DEFAULT_RETENTION_DAYS,
+                               now: Optional[datetime] = None,
+                               archive_dir: str = ARCHIVE_DIR) -> Tuple[int, int]:
+    """
+    Move notificações lidas antigas e emails finalizados para os arquivos mensais
+
+    Os arquivos mensais são gravados antes de `data` ser alterado; o chamador
+    deve salvar `data` em seguida. Itens já arquivados (mesmo ID) não são
+    duplicados, então uma execução interrompida pode ser repetida.
+
+    Args:
+        data: Conteúdo de notifications.json (alterado no próprio objeto)
+        retention_days: Dias que notificações lidas permanecem no arquivo principal
+        now: Data de referência (padrão: agora)
+        archive_dir: Diretório dos arquivos compactados
+
+    Returns:
+        Quantidade de notificações e de emails arquivados
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+    batches: Dict[str, Dict[str, List[Dict]]] = {}
+
+    kept_notifications = []
+    for notif in data.get("notifications", []):
+        created_at = parse_timestamp(notif.get("created_at"))
+        if notif.get("read", False) and created_at and created_at < cutoff:
+            month = created_at.strftime("%Y-%m")
+            batches.setdefault(month, {"notifications": [], "email_queue": []})["notifications"].append(notif)
+        else:
+            kept_notifications.append(notif)
+
+    kept_emails = []
+    for email_item in data.get("email_queue", []):
+        created_at = parse_timestamp(email_item.get("created_at"))
+        if is_email_finished(email_item) and created_at:
+            month = created_at.strftime("%Y-%m")
+            batches.setdefault(month, {"notifications": [], "email_queue": []})["email_queue"].append(email_item)
+        else:
+            kept_emails.append(email_item)
+
+    archived_notifications = 0
+    archived_emails = 0
+    for month, batch in batches.items():
+        archive = load_archive(month, archive_dir)
+
+        for section in ("notifications", "email_queue"):
+            items = archive.setdefault(section, [])
+            existing_ids = {item.get("id") for item in items}
+            items.extend(item for item in batch[section] if item.get("id") not in existing_ids)
+
+        save_archive(month, archive, archive_dir)
+        archived_notifications += len(batch["notifications"])
+        archived_emails += len(batch["email_queue"])
+
+    if batches:
+        data["notifications"] = kept_notifications
+        if "email_queue" in data:
+            data["email_queue"] = kept_emails
+
+    return archived_notifications, archived_emails
@@ -0,0 +1,189 @@
+import base64
+import binascii
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+def notification_sort_key(notification: Dict) -> Tuple[str, str]:
+    """Chave de ordenação cronológica (created_at, id)"""
+    return (notification.get("created_at") or "", notification.get("id") or "")
+
+def is_released(notification: Dict) -> bool:
+    """Notificação visível ao usuário (agendadas só depois de liberadas no horário)"""
+    return not notification.get("scheduled_for") or notification.get("sent", False)
+
+def encode_cursor(notification: Dict) -> str:
+    """Gera cursor opaco a partir da última notificação da página"""
+    created_at, notification_id = notification_sort_key(notification)
+    raw = f"{created_at}|{notification_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decodifica cursor gerado por encode_cursor
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, notification_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    return (created_at, notification_id)
+
+class NotificationIndex:
+    """
+    Índice em memória das notificações por usuário
+
+    Notificações agendadas ainda não liberadas ficam de fora (listagens,
+    contadores e cursores); entram quando o arquivo é regravado na liberação.
+    """
+
+    def __init__(self):
+        # Notificações de cada usuário em ordem cronológica (mais recente no fim)
+        self.by_user: Dict[str, List[Dict]] = {}
+        # Notificações por ID
+        self.by_id: Dict[str, Dict] = {}
+        # Contadores de notificações não lidas por usuário
+        self.unread_counts: Dict[str, int] = {}
+        # Assinatura (mtime, tamanho) do arquivo refletido pelo índice
+        self.signature: Optional[Tuple[int, int]] = None
+
+    def rebuild(self, notifications_data: Dict, signature: Optional[Tuple[int, int]]):
+        """
+        Reconstrói o índice a partir dos dados completos
+
+        Args:
+            notifications_data: Conteúdo de notifications.json
+            signature: Assinatura do arquivo que originou os dados
+        """
+        by_user: Dict[str, List[Dict]] = {}
+        by_id: Dict[str, Dict] = {}
+        unread_counts: Dict[str, int] = {}
+
+        for notif in notifications_data.get("notifications", []):
+            if not is_released(notif):
+                continue
+            user_id = notif.get("user_id")
+            by_user.setdefault(user_id, []).append(notif)
+            by_id[notif.get("id")] = notif
+
+            if not notif.get("read", False):
+                unread_counts[user_id] = unread_counts.get(user_id, 0) + 1
+
+        for notifications in by_user.values():
+            notifications.sort(key=notification_sort_key)
+
+        self.by_user = by_user
+        self.by_id = by_id
+        self.unread_counts = unread_counts
+        self.signature = signature
+
+    def add(self, notification: Dict):
+        """Registra uma notificação recém-criada (agendadas entram só quando liberadas)"""
+        if not is_released(notification):
+            return
+        user_id = notification.get("user_id")
+        notifications = self.by_user.setdefault(user_id, [])
+
+        # Notificações novas normalmente são as mais recentes
+        if not notifications or notification_sort_key(notifications[-1]) <= notification_sort_key(notification):
+            notifications.append(notification)
+        else:
+            insort(notifications, notification, key=notification_sort_key)
+
+        self.by_id[notification.get("id")] = notification
+
+        if not notification.get("read", False):
+            self.unread_counts[user_id] = self.unread_counts.get(user_id, 0) + 1
+
+    def mark_read(self, user_id: str, notification_id: str) -> bool:
+        """
+        Marca notificação do usuário como lida no índice
+
+        Returns:
+            True se a notificação estava não lida
+        """
+        notification = self.by_id.get(notification_id)
+        if not notification or notification.get("user_id") != user_id or notification.get("read", False):
+            return False
+
+        notification["read"] = True
+        remaining = self.unread_counts.get(user_id, 0) - 1
+        if remaining > 0:
+            self.unread_counts[user_id] = remaining
+        else:
+            self.unread_counts.pop(user_id, None)
+        return True
+
+    def unread_ids(self, user_id: str, cursor: Optional[str] = None,
+                   until_id: Optional[str] = None) -> List[str]:
+        """
+        IDs das notificações não lidas do usuário
+
+        Args:
+            cursor: Apenas as anteriores a este cursor
+            until_id: Apenas até esta notificação (inclusive), ex.: a mais recente exibida
+
+        Raises:
+            ValueError: Se o cursor for inválido ou a notificação não for do usuário
+        """
+        until = None
+        if until_id:
+            until = self.by_id.get(until_id)
+            if not until or until.get("user_id") != user_id:
+                raise ValueError("Unknown notification")
+
+        if not self.unread_counts.get(user_id):
+            return []
+
+        notifications = self.by_user.get(user_id, [])
+        end = len(notifications)
+        if cursor:
+            end = bisect_left(notifications, decode_cursor(cursor), key=notification_sort_key)
+        if until:
+            end = min(end, bisect_right(notifications, notification_sort_key(until), key=notification_sort_key))
+
+        return [
+            notif.get("id") for notif in notifications[:end]
+            if not notif.get("read", False)
+        ]
+
+    def unread_count(self, user_id: str) -> int:
+        """Obtém a quantidade de notificações não lidas do usuário"""
+        return self.unread_counts.get(user_id, 0)
+
+    def get_page(self, user_id: str, limit: int, cursor: Optional[str] = None,
+                 unread_only: bool = False) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Obtém uma página de notificações do usuário, mais recentes primeiro
+
+        Args:
+            user_id: ID do usuário
+            limit: Quantidade máxima de notificações
+            cursor: Cursor retornado pela página anterior
+            unread_only: Se deve retornar apenas não lidas
+
+        Returns:
+            Notificações da página e cursor da próxima página (None se acabou)
+        """
+        notifications = self.by_user.get(user_id, [])
+
+        # Posição logo antes do cursor (itens mais antigos que ele)
+        position = len(notifications)
+        if cursor:
+            position = bisect_left(notifications, decode_cursor(cursor), key=notification_sort_key)
+
+        # Buscar um item a mais para saber se existe próxima página
+        page = []
+        while position > 0 and len(page) <= limit:
+            position -= 1
+            notif = notifications[position]
+            if unread_only and notif.get("read", False):
+                continue
+            page.append(notif)
+
+        if len(page) > limit:
+            page = page[:limit]
+            return page, encode_cursor(page[-1])
+        return page, None
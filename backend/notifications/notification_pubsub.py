@@ -0,0 +1,97 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+# Marcador enviado quando mensagens foram descartadas e o cliente precisa recarregar
+RESYNC = {"resync": True}
+
+class NotificationSubscription:
+    """Conexão inscrita para receber notificações de um usuário"""
+
+    def __init__(self, user_id: str, max_queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, message: Optional[Dict]):
+        """Entrega mensagem sem bloquear quem publica"""
+        if self.closed:
+            return
+
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Cliente lento: descartar a fila e pedir ressincronização
+            while not self.queue.empty():
+                if self.queue.get_nowait() is not RESYNC:
+                    self.dropped += 1
+            self.dropped += 1
+            self.queue.put_nowait(RESYNC)
+
+    def close(self):
+        """Encerra a inscrição, liberando quem aguarda na fila"""
+        if self.closed:
+            return
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+        self.closed = True
+
+class NotificationPubSub:
+    """
+    Pub/sub em memória de notificações, indexado por user_id
+
+    Deve ser usado a partir do event loop da aplicação; cada conexão tem uma
+    fila limitada para que clientes lentos não acumulem memória.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[NotificationSubscription]] = {}
+
+    def subscribe(self, user_id: str) -> NotificationSubscription:
+        """Registra uma nova conexão para o usuário"""
+        subscription = NotificationSubscription(user_id, self.max_queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: NotificationSubscription):
+        """Remove uma conexão"""
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if not subscriptions:
+            return
+
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: str, message: Dict) -> int:
+        """
+        Publica mensagem para todas as conexões do usuário
+
+        Returns:
+            Quantidade de conexões que receberam a mensagem
+        """
+        subscriptions = self._subscribers.get(user_id)
+        if not subscriptions:
+            return 0
+
+        for subscription in subscriptions:
+            subscription.push(message)
+        return len(subscriptions)
+
+    def has_subscribers(self, user_id: str) -> bool:
+        """Verifica se o usuário tem alguma conexão aberta"""
+        return user_id in self._subscribers
+
+    def connection_count(self) -> int:
+        """Quantidade total de conexões abertas"""
+        return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def close_all(self):
+        """Encerra todas as conexões (usado no desligamento)"""
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+        self._subscribers.clear()
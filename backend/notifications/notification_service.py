@@ -1,13 +1,24 @@
-import smtplib
+import asyncio
 import json
+import logging
 import os
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import schedule
-import time
-import threading
+from functools import partial
+from typing import Awaitable, Callable, List, Dict, Optional
+from notifications.notification_archive import DEFAULT_RETENTION_DAYS
+from notifications.smtp_pool import SMTPConnectionPool
+from notifications.email_dispatcher import (
+    MAX_EMAIL_ATTEMPTS, EmailDispatcher, parse_rate_limits, parse_local_timestamp
+)
+from notifications.timer_scheduler import TimerScheduler
+from notifications.notification_templates import bind_reminder_template, render_digest, render_email_html
+from utils.id_generator import new_id
+from utils.timestamps import utc_now_iso
+
+logger = logging.getLogger(__name__)
 
 class NotificationService:
     """Serviço de notificações por email e in-app"""
@@ -17,11 +28,44 @@ class NotificationService:
         self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
         self.email_user = os.getenv("EMAIL_USER", "sistema@escola.edu.br")
         self.email_password = os.getenv("EMAIL_PASSWORD", "")
-        self.notifications_file = os.path.join(
-            os.path.dirname(__file__), "..", "..", "data", "notifications.json"
+        # Desativar TLS/autenticação permite usar um servidor SMTP local de testes
+        self.smtp_use_tls = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+        self.smtp_use_auth = os.getenv("SMTP_USE_AUTH", "true").lower() == "true"
+        self.smtp_pool = SMTPConnectionPool(
+            self.smtp_server,
+            self.smtp_port,
+            self.email_user,
+            self.email_password,
+            use_tls=self.smtp_use_tls,
+            use_auth=self.smtp_use_auth,
+            max_connections=int(os.getenv("SMTP_POOL_SIZE", "4")),
+            max_messages_per_connection=int(os.getenv("SMTP_MESSAGES_PER_CONNECTION", "100"))
+        )
+        self.email_dispatcher = EmailDispatcher(
+            self.send_email,
+            concurrency=int(os.getenv("EMAIL_CONCURRENCY", os.getenv("SMTP_POOL_SIZE", "4"))),
+            rate_limits=parse_rate_limits(os.getenv("EMAIL_RATE_LIMITS", "default=10")),
+            max_attempts=MAX_EMAIL_ATTEMPTS,
+            retry_base_seconds=float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "60")),
+            retry_max_seconds=float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "3600"))
         )
+        # Diretório de dados (DATA_DIR permite usar outra cópia, ex.: benchmarks)
+        self.data_dir = os.getenv(
+            "DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "..", "data")
+        )
+        self.notifications_file = os.path.join(self.data_dir, "notifications.json")
+        # Serializa leitura-alteração-gravação de notifications.json; compartilhado
+        # com a API, que grava notificações de eventos fora do event loop
+        self.data_lock = threading.RLock()
         self._ensure_notifications_file()
-        self._start_scheduler()
+        self.scheduler = TimerScheduler()
+        # Horários com liberação de notificações agendadas já programada
+        self._release_times = set()
+        # Chamados com as notificações liberadas (ex.: a API atualiza o índice e o SSE)
+        self._release_listeners: List[Callable[[List[Dict]], Awaitable[None]]] = []
+        self._next_email_run = None
+        # Timers rodam em paralelo; envios da fila não podem se sobrepor (mesmo email duas vezes)
+        self._email_queue_lock = asyncio.Lock()
     
     def _ensure_notifications_file(self):
         """Garante que o arquivo de notificações existe"""
@@ -32,7 +76,8 @@ class NotificationService:
                 "settings": {
                     "email_enabled": True,
                     "reminder_hours": [24, 2],  # Lembrar 24h e 2h antes
-                    "daily_digest_time": "08:00"
+                    "daily_digest_time": "08:00",
+                    "retention_days": DEFAULT_RETENTION_DAYS  # Dias até arquivar lidas
                 }
             }
             with open(self.notifications_file, 'w', encoding='utf-8') as f:
@@ -44,21 +89,25 @@ class NotificationService:
             with open(self.notifications_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"Erro ao carregar notificações: {e}")
+            logger.error("Erro ao carregar notificações: %s", e)
             return {"notifications": [], "email_queue": [], "settings": {}}
     
     def _save_notifications(self, data: Dict):
-        """Salva notificações no arquivo"""
+        """Salva notificações no arquivo e atualiza as métricas da fila de emails"""
         try:
             with open(self.notifications_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
+            # Toda alteração da fila passa por aqui (a retenção da API só
+            # arquiva emails finalizados), então as métricas não releem o arquivo
+            self.email_dispatcher.update_queue_metrics(data.get("email_queue", []))
         except Exception as e:
-            print(f"Erro ao salvar notificações: {e}")
+            logger.error("Erro ao salvar notificações: %s", e)
     
     def create_notification(self, user_id: str, title: str, message: str, 
                           notification_type: str = "info", 
                           send_email: bool = False,
-                          schedule_for: Optional[datetime] = None) -> str:
+                          schedule_for: Optional[datetime] = None,
+                          urgent: bool = False) -> str:
         """
         Cria uma nova notificação
         
@@ -69,61 +118,71 @@ class NotificationService:
             notification_type: Tipo (info, warning, success, error)
             send_email: Se deve enviar por email também
             schedule_for: Agendar para data/hora específica
+            urgent: Email enviado na hora mesmo para quem usa o resumo diário
             
         Returns:
             ID da notificação criada
         """
         try:
-            data = self._load_notifications()
-            
-            notification_id = f"notif_{int(datetime.now().timestamp())}"
-            notification = {
-                "id": notification_id,
-                "user_id": user_id,
-                "title": title,
-                "message": message,
-                "type": notification_type,
-                "read": False,
-                "created_at": datetime.now().isoformat(),
-                "scheduled_for": schedule_for.isoformat() if schedule_for else None,
-                "sent": False
-            }
-            
-            data["notifications"].append(notification)
-            
-            # Adicionar à fila de email se solicitado
-            if send_email:
-                self._queue_email(user_id, title, message, schedule_for)
-            
-            self._save_notifications(data)
-            return notification_id
+            with self.data_lock:
+                data = self._load_notifications()
+                
+                notification = self._build_notification(
+                    user_id, title, message, notification_type, schedule_for
+                )
+                data.setdefault("notifications", []).append(notification)
+                
+                # Adicionar à fila de email se solicitado (na mesma gravação)
+                if send_email:
+                    data.setdefault("email_queue", []).append(
+                        self._build_email_item(user_id, title, message, schedule_for, urgent)
+                    )
+                
+                self._save_notifications(data)
+
+            if schedule_for:
+                self._schedule_release(schedule_for)
+            return notification["id"]
             
         except Exception as e:
-            print(f"Erro ao criar notificação: {e}")
+            logger.error("Erro ao criar notificação: %s", e)
             return ""
     
-    def _queue_email(self, user_id: str, title: str, message: str, 
-                    schedule_for: Optional[datetime] = None):
-        """Adiciona email à fila de envio"""
-        try:
-            data = self._load_notifications()
-            
-            email_item = {
-                "id": f"email_{int(datetime.now().timestamp())}",
-                "user_id": user_id,
-                "title": title,
-                "message": message,
-                "scheduled_for": schedule_for.isoformat() if schedule_for else None,
-                "attempts": 0,
-                "sent": False,
-                "created_at": datetime.now().isoformat()
-            }
-            
-            data["email_queue"].append(email_item)
-            self._save_notifications(data)
-            
-        except Exception as e:
-            print(f"Erro ao adicionar email à fila: {e}")
+    def _build_notification(self, user_id: str, title: str, message: str,
+                            notification_type: str = "info",
+                            schedule_for: Optional[datetime] = None) -> Dict:
+        """Monta o registro de uma notificação"""
+        return {
+            "id": new_id("notif"),
+            "user_id": user_id,
+            "title": title,
+            "message": message,
+            "type": notification_type,
+            "read": False,
+            "created_at": utc_now_iso(),
+            "scheduled_for": schedule_for.isoformat() if schedule_for else None,
+            # Notificações agendadas são liberadas pelo agendador no horário
+            "sent": schedule_for is None
+        }
+    
+    def _build_email_item(self, user_id: str, title: str, message: str,
+                          schedule_for: Optional[datetime] = None, urgent: bool = False) -> Dict:
+        """Monta o item da fila de emails"""
+        return {
+            "id": new_id("email"),
+            "user_id": user_id,
+            "title": title,
+            "message": message,
+            "scheduled_for": schedule_for.isoformat() if schedule_for else None,
+            # Urgentes não esperam o resumo diário
+            "urgent": urgent,
+            "attempts": 0,
+            "sent": False,
+            "status": "pending",
+            "next_attempt_at": None,
+            "last_error": None,
+            "created_at": utc_now_iso()
+        }
     
     def send_email(self, to_email: str, subject: str, body: str) -> bool:
         """
@@ -139,8 +198,8 @@ class NotificationService:
         """
         try:
             # Verificar se credenciais estão configuradas
-            if not self.email_password:
-                print("Credenciais de email não configuradas")
+            if self.smtp_use_auth and not self.email_password:
+                logger.warning("Credenciais de email não configuradas")
                 return False
             
             # Criar mensagem
@@ -149,87 +208,158 @@ class NotificationService:
             msg['To'] = to_email
             msg['Subject'] = subject
             
-            # Corpo do email em HTML
-            html_body = f"""
-            <html>
-                <body style="font-family: Arial, sans-serif;">
-                    <div style="max-width: 600px; margin: 0 auto;">
-                        <h2 style="color: #333;">Sistema Acadêmico PIM</h2>
-                        <div style="background-color: #f9f9f9; padding: 20px; border-radius: 5px;">
-                            {body.replace('\n', '<br>')}
-                        </div>
-                        <p style="color: #666; font-size: 12px; margin-top: 20px;">
-                            Esta é uma mensagem automática do Sistema Acadêmico PIM.
-                        </p>
-                    </div>
-                </body>
-            </html>
-            """
-            
-            msg.attach(MIMEText(html_body, 'html'))
-            
-            # Conectar e enviar
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email_user, self.email_password)
-            server.send_message(msg)
-            server.quit()
-            
-            print(f"Email enviado para {to_email}")
+            # Corpo do email em HTML (em cache: lotes repetem a mesma mensagem)
+            msg.attach(MIMEText(render_email_html(body), 'html'))
+            
+            # Enviar reutilizando uma conexão autenticada do pool
+            self.smtp_pool.send_message(msg)
+            
+            logger.debug("Email enviado para %s", to_email)
             return True
             
         except Exception as e:
-            print(f"Erro ao enviar email para {to_email}: {e}")
+            logger.error("Erro ao enviar email para %s: %s", to_email, e)
             return False
     
-    def process_email_queue(self):
-        """Processa fila de emails pendentes"""
+    async def process_email_queue_async(self):
+        """Envia os emails vencidos em paralelo, com limite de taxa e backoff"""
+        async with self._email_queue_lock:
+            await self._process_email_queue()
+    
+    async def _process_email_queue(self):
         try:
-            data = self._load_notifications()
-            users_data = self._load_users_data()
+            data = await asyncio.to_thread(self._load_notifications)
+            users_data = await asyncio.to_thread(self._load_users_data)
+            emails_by_user = {
+                user["id"]: user.get("email") for user in users_data.get("users", [])
+            }
             
-            for email_item in data["email_queue"]:
-                if email_item["sent"] or email_item["attempts"] >= 3:
-                    continue
-                
-                # Verificar se é hora de enviar
-                if email_item["scheduled_for"]:
-                    scheduled_time = datetime.fromisoformat(email_item["scheduled_for"])
-                    if datetime.now() < scheduled_time:
-                        continue
-                
-                # Buscar email do usuário
-                user_email = self._get_user_email(email_item["user_id"], users_data)
-                if not user_email:
-                    email_item["attempts"] += 1
-                    continue
+            # Emails de quem optou pelo resumo diário aguardam o resumo
+            digest_users = self._get_digest_users(data)
+            email_queue = data.get("email_queue", [])
+            sendable = [item for item in email_queue if not self._is_held_for_digest(item, digest_users)]
+            
+            processed = await self.email_dispatcher.dispatch(sendable, emails_by_user.get)
+            if processed:
+                await asyncio.to_thread(self._apply_email_updates, processed)
+            
+            self._schedule_next_email_run(sendable)
+            
+        except Exception as e:
+            logger.error("Erro ao processar fila de emails: %s", e)
+        finally:
+            # Não manter sessões abertas até o próximo lote
+            self.smtp_pool.close()
+    
+    def _apply_email_updates(self, processed: List[Dict]):
+        """
+        Grava o resultado dos envios sobre a versão atual do arquivo
+
+        O arquivo é recarregado porque outras notificações podem ter sido
+        criadas enquanto os emails eram enviados.
+        """
+        def email_key(item: Dict):
+            return (item.get("id"), item.get("user_id"), item.get("created_at"))
+        
+        updates = {email_key(item): item for item in processed}
+        with self.data_lock:
+            data = self._load_notifications()
+
+            for index, email_item in enumerate(data.get("email_queue", [])):
+                updated = updates.get(email_key(email_item))
+                if updated is not None:
+                    data["email_queue"][index] = updated
+
+            self._save_notifications(data)
+    
+    def _get_digest_users(self, data: Dict) -> set:
+        """Usuários que optaram por receber emails no resumo diário"""
+        return {
+            user_id for user_id, preferences in data.get("preferences", {}).items()
+            if preferences.get("email_digest", False)
+        }
+    
+    def _is_held_for_digest(self, email_item: Dict, digest_users: set) -> bool:
+        """
+        Email que deve ir no próximo resumo em vez de ser enviado sozinho
+
+        Apenas emails marcados como urgentes são enviados sozinhos para quem
+        usa o resumo; lembretes de eventos entram no resumo depois do horário.
+        """
+        return (
+            email_item.get("user_id") in digest_users
+            and not email_item.get("digest", False)
+            and not email_item.get("urgent", False)
+        )
+    
+    def build_daily_digests(self, now: Optional[datetime] = None) -> int:
+        """
+        Agrupa os emails vencidos de cada usuário do resumo em um único email
+
+        Os emails agrupados são marcados como enviados (status "digested") e o
+        resumo entra na fila como um item comum, com as mesmas novas tentativas.
+        Emails agendados para depois de `now` ficam para o próximo resumo.
+
+        Returns:
+            Quantidade de resumos criados
+        """
+        now = now or datetime.now().astimezone()
+        try:
+            with self.data_lock:
+                data = self._load_notifications()
+                digest_users = self._get_digest_users(data)
+                if not digest_users:
+                    return 0
+            
+                # Uma passada pela fila agrupando por usuário
+                pending_by_user: Dict[str, List[Dict]] = {}
+                for email_item in data.get("email_queue", []):
+                    if self.email_dispatcher.is_due(email_item, now) and self._is_held_for_digest(email_item, digest_users):
+                        pending_by_user.setdefault(email_item["user_id"], []).append(email_item)
+            
+                if not pending_by_user:
+                    return 0
+            
+                digests = []
+                for user_id, items in pending_by_user.items():
+                    items.sort(key=lambda item: item.get("created_at") or "")
+                    subject, body = render_digest(items)
                 
-                # Tentar enviar
-                success = self.send_email(
-                    user_email,
-                    email_item["title"],
-                    email_item["message"]
-                )
+                    digest = self._build_email_item(user_id, subject, body)
+                    digest["digest"] = True
+                    digest["digest_size"] = len(items)
+                    digests.append(digest)
                 
-                email_item["attempts"] += 1
-                if success:
-                    email_item["sent"] = True
+                    for email_item in items:
+                        email_item["sent"] = True
+                        email_item["status"] = "digested"
+                        email_item["next_attempt_at"] = None
             
-            self._save_notifications(data)
+                data["email_queue"].extend(digests)
+                self._save_notifications(data)
+                return len(digests)
             
         except Exception as e:
-            print(f"Erro ao processar fila de emails: {e}")
+            logger.error("Erro ao montar resumos diários: %s", e)
+            return 0
+    
+    async def send_daily_digests(self):
+        """Monta os resumos do dia e os envia imediatamente"""
+        if await asyncio.to_thread(self.build_daily_digests):
+            await self.process_email_queue_async()
+    
+    def get_email_metrics(self) -> Dict:
+        """Métricas do envio de emails (vazão, falhas e profundidade da fila), sem ler o arquivo"""
+        return self.email_dispatcher.get_metrics()
     
     def _load_users_data(self) -> Dict:
         """Carrega dados dos usuários"""
         try:
-            users_path = os.path.join(
-                os.path.dirname(__file__), "..", "..", "data", "users.json"
-            )
+            users_path = os.path.join(self.data_dir, "users.json")
             with open(users_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"Erro ao carregar usuários: {e}")
+            logger.error("Erro ao carregar usuários: %s", e)
             return {"users": []}
     
     def _get_user_email(self, user_id: str, users_data: Dict) -> Optional[str]:
@@ -259,11 +389,9 @@ class NotificationService:
                     if unread_only and notif["read"]:
                         continue
                     
-                    # Verificar se é hora de mostrar notificação agendada
-                    if notif["scheduled_for"]:
-                        scheduled_time = datetime.fromisoformat(notif["scheduled_for"])
-                        if datetime.now() < scheduled_time:
-                            continue
+                    # Notificações agendadas aparecem após liberadas pelo agendador
+                    if notif.get("scheduled_for") and not notif.get("sent", False):
+                        continue
                     
                     notifications.append(notif)
             
@@ -272,107 +400,243 @@ class NotificationService:
             return notifications
             
         except Exception as e:
-            print(f"Erro ao buscar notificações: {e}")
+            logger.error("Erro ao buscar notificações: %s", e)
             return []
     
     def mark_as_read(self, notification_id: str) -> bool:
         """Marca notificação como lida"""
         try:
-            data = self._load_notifications()
+            with self.data_lock:
+                data = self._load_notifications()
             
-            for notif in data["notifications"]:
-                if notif["id"] == notification_id:
-                    notif["read"] = True
-                    break
+                for notif in data["notifications"]:
+                    if notif["id"] == notification_id:
+                        notif["read"] = True
+                        break
             
-            self._save_notifications(data)
-            return True
+                self._save_notifications(data)
+                return True
             
         except Exception as e:
-            print(f"Erro ao marcar notificação como lida: {e}")
+            logger.error("Erro ao marcar notificação como lida: %s", e)
             return False
     
-    def create_event_reminders(self):
-        """Cria lembretes automáticos para eventos próximos"""
+    def create_event_reminders(self) -> int:
+        """
+        Cria lembretes automáticos para eventos próximos
+
+        Todos os lembretes pendentes são calculados em uma passada e gravados
+        de uma vez. Cada lembrete tem a chave (evento, aluno, antecedência),
+        então executar novamente não gera duplicados.
+
+        Returns:
+            Quantidade de lembretes criados
+        """
         try:
             # Carregar eventos do calendário
-            calendar_path = os.path.join(
-                os.path.dirname(__file__), "..", "..", "data", "calendar.json"
-            )
+            calendar_path = os.path.join(self.data_dir, "calendar.json")
             
             with open(calendar_path, 'r', encoding='utf-8') as f:
                 calendar_data = json.load(f)
             
             # Carregar turmas para obter alunos
-            classes_path = os.path.join(
-                os.path.dirname(__file__), "..", "..", "data", "classes.json"
-            )
+            classes_path = os.path.join(self.data_dir, "classes.json")
             
             with open(classes_path, 'r', encoding='utf-8') as f:
                 classes_data = json.load(f)
             
-            data = self._load_notifications()
-            reminder_hours = data.get("settings", {}).get("reminder_hours", [24, 2])
+            # Índice de alunos por turma
+            students_by_class = {
+                cls["id"]: cls.get("students", []) for cls in classes_data.get("classes", [])
+            }
+            
+            with self.data_lock:
+                data = self._load_notifications()
+                reminder_hours = data.get("settings", {}).get("reminder_hours", [24, 2])
+            
+                # Lembretes já existentes
+                existing_keys = {
+                    notif["reminder_key"] for notif in data.get("notifications", [])
+                    if notif.get("reminder_key")
+                }
             
-            for event in calendar_data.get("events", []):
-                event_time = datetime.fromisoformat(event["date"].replace('Z', '+00:00'))
+                now = datetime.now().astimezone()
+                new_notifications = []
+                new_emails = []
+            
+                for event in calendar_data.get("events", []):
+                    students = students_by_class.get(event.get("class_id"), [])
+                    if not students:
+                        continue
                 
-                # Encontrar alunos da turma
-                students = []
-                for cls in classes_data.get("classes", []):
-                    if cls["id"] == event.get("class_id"):
-                        students = cls.get("students", [])
-                        break
+                    event_time = parse_local_timestamp(event["date"])
+                
+                    # Campos do evento substituídos uma vez; resta só a antecedência
+                    template = bind_reminder_template(event, event_time)
                 
-                # Criar lembretes para cada intervalo configurado
-                for hours_before in reminder_hours:
-                    reminder_time = event_time - timedelta(hours=hours_before)
+                    # Criar lembretes para cada intervalo configurado
+                    for hours_before in reminder_hours:
+                        reminder_time = event_time - timedelta(hours=hours_before)
                     
-                    # Verificar se já passou da hora do lembrete
-                    if reminder_time <= datetime.now():
-                        continue
+                        # Verificar se já passou da hora do lembrete
+                        if reminder_time <= now:
+                            continue
                     
-                    # Criar notificação para cada aluno
-                    for student_id in students:
-                        title = f"Lembrete: {event['title']}"
-                        message = f"""
-                        Você tem um evento agendado em {hours_before} horas:
-                        
-                        📅 {event['title']}
-                        📍 {event.get('location', 'Local não informado')}
-                        🕐 {event_time.strftime('%d/%m/%Y às %H:%M')}
+                        # Conteúdo montado uma vez por evento e antecedência
+                        title, message = template.render(hours_before=hours_before)
+                    
+                        for student_id in students:
+                            reminder_key = f"{event['id']}:{student_id}:{hours_before}"
+                            if reminder_key in existing_keys:
+                                continue
+                            existing_keys.add(reminder_key)
                         
-                        {event.get('description', '')}
-                        """
+                            notification = self._build_notification(
+                                student_id, title, message, "info", reminder_time
+                            )
+                            notification["reminder_key"] = reminder_key
+                            new_notifications.append(notification)
                         
-                        self.create_notification(
-                            student_id,
-                            title,
-                            message,
-                            "info",
-                            send_email=True,
-                            schedule_for=reminder_time
-                        )
+                            email_item = self._build_email_item(student_id, title, message, reminder_time)
+                            email_item["reminder_key"] = reminder_key
+                            new_emails.append(email_item)
+            
+                if new_notifications:
+                    data.setdefault("notifications", []).extend(new_notifications)
+                    data.setdefault("email_queue", []).extend(new_emails)
+                    self._save_notifications(data)
+                
+                    for notification in new_notifications:
+                        self._schedule_release(parse_local_timestamp(notification["scheduled_for"]))
+            
+                return len(new_notifications)
             
         except Exception as e:
-            print(f"Erro ao criar lembretes de eventos: {e}")
+            logger.error("Erro ao criar lembretes de eventos: %s", e)
+            return 0
+    
+    def add_release_listener(self, listener: Callable[[List[Dict]], Awaitable[None]]):
+        """Registra corrotina chamada no event loop com as notificações agendadas liberadas"""
+        self._release_listeners.append(listener)
     
-    def _start_scheduler(self):
-        """Inicia o agendador de tarefas"""
-        def run_scheduler():
-            # Processar fila de emails a cada 5 minutos
-            schedule.every(5).minutes.do(self.process_email_queue)
-            
-            # Criar lembretes de eventos diariamente às 6h
-            schedule.every().day.at("06:00").do(self.create_event_reminders)
-            
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Verificar a cada minuto
+    def release_scheduled_notifications(self) -> List[Dict]:
+        """
+        Libera notificações agendadas cujo horário chegou
+
+        Síncrono (roda em thread); quem chama repassa o resultado aos
+        listeners com _notify_release no event loop.
+
+        Returns:
+            Notificações liberadas
+        """
+        try:
+            with self.data_lock:
+                data = self._load_notifications()
+                now = datetime.now().astimezone()
+                released = []
+            
+                for notif in data.get("notifications", []):
+                    if (notif.get("scheduled_for") and not notif.get("sent", False)
+                            and parse_local_timestamp(notif["scheduled_for"]) <= now):
+                        notif["sent"] = True
+                        released.append(notif)
+            
+                if released:
+                    self._save_notifications(data)
+            
+        except Exception as e:
+            logger.error("Erro ao liberar notificações agendadas: %s", e)
+            return []
+        
+        return released
+    
+    async def _notify_release(self, released: List[Dict]):
+        """Repassa as notificações liberadas aos listeners"""
+        for listener in self._release_listeners:
+            try:
+                await listener(released)
+            except Exception as e:
+                logger.error("Erro ao repassar notificações liberadas: %s", e)
+    
+    async def _release_due(self, when: float):
+        """Libera notificações do horário e envia os emails que venceram junto"""
+        self._release_times.discard(when)
+        released = await asyncio.to_thread(self.release_scheduled_notifications)
+        if released:
+            await self._notify_release(released)
+            await self.process_email_queue_async()
+    
+    def _schedule_release(self, when: datetime):
+        """Programa a liberação das notificações agendadas para um horário"""
+        timestamp = when.timestamp()
+        if timestamp in self._release_times:
+            return
         
-        # Executar em thread separada
-        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
+        self._release_times.add(timestamp)
+        self.scheduler.schedule_at(
+            when, partial(self._release_due, timestamp), name="release-notifications"
+        )
+    
+    def _schedule_next_email_run(self, email_queue: List[Dict]):
+        """Antecipa o envio para o próximo email agendado ou nova tentativa"""
+        now = datetime.now().astimezone()
+        upcoming = [
+            parse_local_timestamp(item[field])
+            for item in email_queue if self.email_dispatcher.is_pending(item)
+            for field in ("scheduled_for", "next_attempt_at") if item.get(field)
+        ]
+        upcoming = [when for when in upcoming if when > now]
+        if not upcoming:
+            return
+        
+        next_run = min(upcoming)
+        if self._next_email_run is not None and not self._next_email_run.cancelled:
+            if self._next_email_run.when <= next_run.timestamp():
+                return
+            self.scheduler.cancel(self._next_email_run)
+        
+        self._next_email_run = self.scheduler.schedule_at(
+            next_run, self.process_email_queue_async, name="email-retry"
+        )
+    
+    async def start(self):
+        """
+        Inicia o agendador no event loop da aplicação
+
+        Sem o agendador, notificações agendadas não são liberadas. A retenção
+        do histórico fica com a API, que mantém o índice de notificações.
+        """
+        # Processar fila de emails a cada 5 minutos
+        self.scheduler.schedule_every(5 * 60, self.process_email_queue_async, name="email-queue")
+        
+        # Criar lembretes de eventos diariamente às 6h
+        self.scheduler.schedule_daily("06:00", self.create_event_reminders, name="event-reminders")
+        
+        # Enviar resumo diário no horário configurado
+        data = self._load_notifications()
+        digest_time = data.get("settings", {}).get("daily_digest_time", "08:00")
+        
+        # Medir a fila atual; depois as métricas acompanham cada gravação
+        self.email_dispatcher.update_queue_metrics(data.get("email_queue", []))
+        self.scheduler.schedule_daily(digest_time, self.send_daily_digests, name="daily-digest")
+        
+        # Liberar atrasadas e programar as notificações agendadas já existentes
+        released = await asyncio.to_thread(self.release_scheduled_notifications)
+        if released:
+            await self._notify_release(released)
+        now = datetime.now().astimezone()
+        for notif in self._load_notifications().get("notifications", []):
+            if notif.get("scheduled_for") and not notif.get("sent", False):
+                scheduled_time = parse_local_timestamp(notif["scheduled_for"])
+                if scheduled_time > now:
+                    self._schedule_release(scheduled_time)
+        
+        self.scheduler.start()
+    
+    async def stop(self):
+        """Interrompe o agendador e encerra conexões SMTP ociosas"""
+        await self.scheduler.stop()
+        self.smtp_pool.close()
 
 # Instância global do serviço
 notification_service = NotificationService()
@@ -0,0 +1,166 @@
+from datetime import datetime
+from functools import lru_cache
+from string import Template
+from typing import Dict, Optional, Tuple
+
+DEFAULT_LOCALE = "pt-BR"
+
+# Textos de cada tipo de notificação por idioma ($campo é substituído na renderização)
+TEMPLATE_CATALOG = {
+    "pt-BR": {
+        "grade": {
+            "title": "Nova nota lançada: $grade_name",
+            "message": "Sua nota em $grade_name foi lançada: $grade_value. Acesse a página de notas para ver mais detalhes.",
+        },
+        "event": {
+            "title": "Novo evento: $event_type_name",
+            "message": "Foi criado um novo evento '$event_title' para $event_date em $event_location. Verifique seu calendário para mais detalhes.",
+        },
+        "reminder": {
+            "title": "Lembrete: $event_title",
+            "message": (
+                "Você tem um evento agendado em $hours_before horas:\n"
+                "\n"
+                "📅 $event_title\n"
+                "📍 $event_location\n"
+                "🕐 $event_date\n"
+                "\n"
+                "$event_description"
+            ),
+        },
+        "digest": {
+            "title": "Resumo diário: $count $noun",
+            "message": "$items",
+        },
+    },
+}
+
+# Nomes e formatos dependentes do idioma
+LOCALE_DATA = {
+    "pt-BR": {
+        "date_format": "%d/%m/%Y às %H:%M",
+        "grade_names": {
+            "np1": "NP1 (Primeira Prova)",
+            "np2": "NP2 (Segunda Prova)",
+            "ava": "AVA (Atividades Virtuais)",
+            "pim": "PIM (Projeto Integrado)",
+        },
+        "event_type_names": {
+            "aula": "Aula",
+            "prova": "Prova",
+            "trabalho": "Trabalho",
+            "projeto": "Projeto",
+        },
+        "location_missing": "Local não informado",
+        "notification_noun": ("notificação", "notificações"),
+    },
+}
+
+# Corpo HTML dos emails, compilado uma única vez
+EMAIL_HTML_TEMPLATE = Template("""
+            <html>
+                <body style="font-family: Arial, sans-serif;">
+                    <div style="max-width: 600px; margin: 0 auto;">
+                        <h2 style="color: #333;">Sistema Acadêmico PIM</h2>
+                        <div style="background-color: #f9f9f9; padding: 20px; border-radius: 5px;">
+                            $body
+                        </div>
+                        <p style="color: #666; font-size: 12px; margin-top: 20px;">
+                            Esta é uma mensagem automática do Sistema Acadêmico PIM.
+                        </p>
+                    </div>
+                </body>
+            </html>
+            """)
+
+def resolve_locale(locale: Optional[str]) -> str:
+    """Idioma suportado mais próximo (padrão: pt-BR)"""
+    return locale if locale in TEMPLATE_CATALOG else DEFAULT_LOCALE
+
+def get_locale_data(locale: Optional[str] = None) -> Dict:
+    """Nomes e formatos do idioma"""
+    return LOCALE_DATA[resolve_locale(locale)]
+
+def format_datetime(value: datetime, locale: Optional[str] = None) -> str:
+    """Formata data/hora no padrão do idioma"""
+    return value.strftime(get_locale_data(locale)["date_format"])
+
+class NotificationTemplate:
+    """Título e mensagem pré-compilados de um tipo de notificação"""
+
+    def __init__(self, title: Template, message: Template):
+        self.title = title
+        self.message = message
+
+    def bind(self, **fields) -> "NotificationTemplate":
+        """
+        Substitui parte dos campos e devolve um template com os restantes
+
+        Usado para renderizar os campos do evento uma vez e deixar só os
+        campos de cada destinatário para o laço de envio.
+        """
+        # "$" nos valores não pode virar placeholder do novo template
+        escaped = {key: str(value).replace("$", "$$") for key, value in fields.items()}
+        return NotificationTemplate(
+            Template(self.title.safe_substitute(escaped)),
+            Template(self.message.safe_substitute(escaped)),
+        )
+
+    def render(self, **fields) -> Tuple[str, str]:
+        """Renderiza título e mensagem"""
+        return self.title.substitute(fields), self.message.substitute(fields)
+
+@lru_cache(maxsize=None)
+def get_template(name: str, locale: Optional[str] = None) -> NotificationTemplate:
+    """
+    Template compilado de um tipo de notificação, em cache por idioma
+
+    Raises:
+        KeyError: Se o tipo não existir no catálogo
+    """
+    texts = TEMPLATE_CATALOG[resolve_locale(locale)][name]
+    return NotificationTemplate(Template(texts["title"]), Template(texts["message"]))
+
+@lru_cache(maxsize=1024)
+def render_email_html(body: str) -> str:
+    """Corpo HTML do email, em cache por mensagem (lotes repetem o mesmo texto)"""
+    return EMAIL_HTML_TEMPLATE.substitute(body=body.replace('\n', '<br>'))
+
+def render_grade_notification(grade_type: str, grade_value: float,
+                              locale: Optional[str] = None) -> Tuple[str, str]:
+    """Título e mensagem da notificação de nota lançada"""
+    grade_name = get_locale_data(locale)["grade_names"].get(grade_type, grade_type.upper())
+    return get_template("grade", locale).render(grade_name=grade_name, grade_value=f"{grade_value:.1f}")
+
+def render_event_notification(event: Dict, locale: Optional[str] = None) -> Tuple[str, str]:
+    """Título e mensagem da notificação de novo evento"""
+    locale_data = get_locale_data(locale)
+    event_date = datetime.fromisoformat(event["date"].replace("Z", "+00:00"))
+
+    return get_template("event", locale).render(
+        event_type_name=locale_data["event_type_names"].get(event["type"], event["type"].title()),
+        event_title=event["title"],
+        event_date=format_datetime(event_date, locale),
+        event_location=event["location"],
+    )
+
+def bind_reminder_template(event: Dict, event_time: datetime,
+                           locale: Optional[str] = None) -> NotificationTemplate:
+    """Template de lembrete com os campos do evento já substituídos"""
+    return get_template("reminder", locale).bind(
+        event_title=event["title"],
+        event_location=event.get("location") or get_locale_data(locale)["location_missing"],
+        event_date=format_datetime(event_time, locale),
+        event_description=event.get("description", ""),
+    )
+
+def render_digest(items, locale: Optional[str] = None) -> Tuple[str, str]:
+    """Assunto e corpo do resumo diário a partir dos emails agrupados"""
+    singular, plural = get_locale_data(locale)["notification_noun"]
+    count = len(items)
+
+    return get_template("digest", locale).render(
+        count=count,
+        noun=singular if count == 1 else plural,
+        items="\n\n".join(f"• {item['title']}\n{item['message']}" for item in items),
+    )
@@ -0,0 +1,183 @@
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from typing import List
+
+def is_connection_error(error: Exception) -> bool:
+    """Erro de conexão perdida: a mensagem pode ser reenviada em outra conexão"""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    # SMTPException herda de OSError; demais erros SMTP são respostas do servidor
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+class PooledSMTPConnection:
+    """Conexão SMTP autenticada mantida pelo pool"""
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """Encerra a conexão ignorando erros de rede"""
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+
+class SMTPConnectionPool:
+    """
+    Pool de conexões SMTP reutilizáveis
+
+    Cada conexão faz STARTTLS e login uma única vez e envia várias mensagens;
+    conexões com erro são descartadas e recriadas automaticamente.
+    """
+
+    def __init__(self, host: str, port: int, username: str = "", password: str = "",
+                 use_tls: bool = True, use_auth: bool = True,
+                 max_connections: int = 4,
+                 max_messages_per_connection: int = 100,
+                 idle_timeout: float = 60.0,
+                 timeout: float = 30.0,
+                 smtp_class=smtplib.SMTP):
+        """
+        Args:
+            host: Servidor SMTP
+            port: Porta do servidor
+            username: Usuário para login
+            password: Senha para login
+            use_tls: Se deve executar STARTTLS
+            use_auth: Se deve autenticar (False para servidores locais de teste)
+            max_connections: Conexões simultâneas no máximo
+            max_messages_per_connection: Mensagens enviadas antes de reconectar
+            idle_timeout: Segundos ociosos antes de verificar a conexão com NOOP
+            timeout: Timeout de rede de cada conexão
+            smtp_class: Classe de cliente SMTP (substituível em testes)
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_auth = use_auth
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.smtp_class = smtp_class
+
+        self._idle: List[PooledSMTPConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+        # Estatísticas
+        self.connections_opened = 0
+        self.messages_sent = 0
+
+    def _connect(self) -> PooledSMTPConnection:
+        """Abre e autentica uma nova conexão"""
+        server = self.smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.use_auth:
+                server.login(self.username, self.password)
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+            raise
+
+        self.connections_opened += 1
+        return PooledSMTPConnection(server)
+
+    def _is_alive(self, connection: PooledSMTPConnection) -> bool:
+        """Verifica conexões ociosas há muito tempo"""
+        if time.monotonic() - connection.last_used < self.idle_timeout:
+            return True
+
+        try:
+            return connection.server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _acquire(self) -> PooledSMTPConnection:
+        """Obtém conexão ociosa válida ou abre uma nova"""
+        while True:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+
+            if connection is None:
+                return self._connect()
+            if self._is_alive(connection):
+                return connection
+            connection.close()
+
+    def _release(self, connection: PooledSMTPConnection):
+        """Devolve conexão ao pool, reciclando as que atingiram o limite de mensagens"""
+        connection.last_used = time.monotonic()
+
+        if connection.messages_sent >= self.max_messages_per_connection:
+            connection.close()
+            return
+
+        with self._lock:
+            self._idle.append(connection)
+
+    @contextmanager
+    def connection(self):
+        """Empresta uma conexão autenticada; ela é descartada se a conexão falhar"""
+        self._slots.acquire()
+        try:
+            connection = self._acquire()
+            try:
+                yield connection
+            except Exception as e:
+                if is_connection_error(e):
+                    connection.close()
+                else:
+                    # Recusa do servidor (ex.: destinatário inválido): a sessão continua válida
+                    try:
+                        connection.server.rset()
+                        self._release(connection)
+                    except Exception:
+                        connection.close()
+                raise
+            self._release(connection)
+        finally:
+            self._slots.release()
+
+    def send_message(self, message: Message, retries: int = 1):
+        """
+        Envia mensagem usando uma conexão do pool
+
+        Em caso de conexão perdida, reconecta e tenta novamente até `retries` vezes.
+
+        Raises:
+            smtplib.SMTPException: Se o envio falhar
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.connection() as connection:
+                    connection.server.send_message(message)
+                    connection.messages_sent += 1
+                    self.messages_sent += 1
+                return
+            except Exception as e:
+                attempt += 1
+                if not is_connection_error(e) or attempt > retries:
+                    raise
+
+    def close(self):
+        """Encerra todas as conexões ociosas"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for connection in idle:
+            connection.close()
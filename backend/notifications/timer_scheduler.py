@@ -0,0 +1,171 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+class TimerEntry:
+    """Tarefa agendada no TimerScheduler"""
+
+    def __init__(self, when: float, name: str, callback: Callable,
+                 interval: Optional[float] = None, daily_at: Optional[str] = None):
+        self.when = when
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.daily_at = daily_at
+        self.cancelled = False
+
+def next_daily_timestamp(daily_at: str, after: Optional[datetime] = None) -> float:
+    """Próximo horário HH:MM (hora local) após `after`, como timestamp"""
+    after = after or datetime.now()
+    hour, minute = (int(part) for part in daily_at.split(":"))
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    return candidate.timestamp()
+
+class TimerScheduler:
+    """
+    Agendador baseado em heap, executado no event loop da aplicação
+
+    Em vez de acordar a cada minuto, dorme até o próximo item vencido e
+    acorda antes se um item mais próximo for agendado. Cada item vencido roda
+    em uma task própria, então um envio demorado não atrasa os demais timers.
+    Corrotinas rodam no event loop; callbacks síncronos rodam em uma thread
+    (asyncio.to_thread) e devem proteger os arquivos que gravam com trava
+    própria, como o data_lock do NotificationService. Uma tarefa recorrente só
+    é reagendada ao terminar, então nunca roda em paralelo consigo mesma.
+    """
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # Execuções em andamento (referência mantida até terminarem)
+        self._running: Set[asyncio.Task] = set()
+
+    def _push(self, entry: TimerEntry) -> TimerEntry:
+        with self._lock:
+            heapq.heappush(self._heap, (entry.when, next(self._counter), entry))
+        self._wake()
+        return entry
+
+    def _wake(self):
+        """Acorda o laço para recalcular o próximo horário (seguro entre threads)"""
+        if self._loop is None or self._wakeup is None:
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            self._wakeup.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def schedule_at(self, when: datetime, callback: Callable, name: str = "") -> TimerEntry:
+        """Agenda execução única em uma data/hora"""
+        return self._push(TimerEntry(when.timestamp(), name, callback))
+
+    def schedule_every(self, seconds: float, callback: Callable, name: str = "") -> TimerEntry:
+        """Agenda execução periódica, a primeira após `seconds`"""
+        return self._push(TimerEntry(time.time() + seconds, name, callback, interval=seconds))
+
+    def schedule_daily(self, daily_at: str, callback: Callable, name: str = "") -> TimerEntry:
+        """Agenda execução diária em um horário HH:MM (hora local)"""
+        return self._push(TimerEntry(next_daily_timestamp(daily_at), name, callback, daily_at=daily_at))
+
+    def cancel(self, entry: TimerEntry):
+        """Cancela uma tarefa (removida do heap quando chegar sua vez)"""
+        entry.cancelled = True
+
+    def next_run(self) -> Optional[float]:
+        """Timestamp da próxima tarefa ativa"""
+        with self._lock:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def _pop_due(self, now: float) -> List[TimerEntry]:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)[2]
+                if not entry.cancelled:
+                    due.append(entry)
+        return due
+
+    async def _run_entry(self, entry: TimerEntry):
+        try:
+            if asyncio.iscoroutinefunction(entry.callback):
+                await entry.callback()
+            else:
+                await asyncio.to_thread(entry.callback)
+        except Exception:
+            logger.exception("Erro na tarefa agendada %s", entry.name)
+
+        # Reagendar tarefas recorrentes
+        if entry.cancelled:
+            return
+        if entry.interval is not None:
+            entry.when = time.time() + entry.interval
+            self._push(entry)
+        elif entry.daily_at is not None:
+            entry.when = next_daily_timestamp(entry.daily_at)
+            self._push(entry)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            next_run = self.next_run()
+
+            if next_run is None:
+                await self._wakeup.wait()
+                continue
+
+            delay = next_run - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for entry in self._pop_due(time.time()):
+                task = asyncio.create_task(self._run_entry(entry))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    def start(self):
+        """Inicia o agendador no event loop atual"""
+        if self._task is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Interrompe o agendador (tarefas pendentes continuam no heap)"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        for task in self._running:
+            task.cancel()
+        await asyncio.gather(self._task, *self._running, return_exceptions=True)
+
+        self._task = None
+        self._loop = None
+        self._wakeup = None
@@ -0,0 +1,330 @@
+"""
+Gerador de dados sintéticos em escala para o Planner Edu.
+
+Produz professores, turmas, alunos, notas de vários semestres, eventos e
+histórico de notificações no mesmo formato de initial_data.py. Os arquivos
+são gravados item a item, sem montar o conjunto em memória, e a saída é
+determinística para a mesma semente e os mesmos parâmetros.
+
+Uso (a partir de backend/):
+    python synthetic_data.py --classes 400 --students-per-class 250 --seed 42
+
+Para manter os dados gerados ao iniciar a API, use RESET_DATA_ON_STARTUP=false.
+"""
+
+import argparse
+import json
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List
+
+from initial_data import INITIAL_CLASSES, INITIAL_USERS
+from utils.snapshot import snapshot_data_dir
+from utils.timestamps import format_utc_timestamp
+
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data"))
+
+# Senhas iguais às dos usuários de initial_data.py (professor1, aluno1, ...)
+PROFESSOR_PASSWORD = INITIAL_USERS["users"][0]["password"]
+STUDENT_PASSWORD = INITIAL_USERS["users"][2]["password"]
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique",
+               "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael",
+               "Sofia", "Thiago", "Vitória", "William"]
+LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Costa", "Ferreira", "Pereira", "Almeida",
+              "Ribeiro", "Carvalho", "Gomes", "Martins", "Rocha", "Lima", "Araújo", "Barbosa"]
+SUBJECTS = [cls["subject"] for cls in INITIAL_CLASSES["classes"]] + [
+    "História", "Geografia", "Física", "Química", "Biologia", "Inglês", "Programação", "Estatística"
+]
+EVENT_TYPES = ["aula", "prova", "trabalho", "projeto"]
+GRADE_TYPES = ["np1", "np2", "ava", "pim"]
+LOCATIONS = ["Sala 101", "Sala 202", "Laboratório 1", "Laboratório 2", "Auditório", "Online"]
+
+@dataclass
+class DatasetConfig:
+    """Parâmetros do conjunto de dados gerado"""
+    professors: int = 10
+    classes: int = 20
+    students_per_class: int = 30
+    students: int = 0  # 0 = classes * students_per_class (cada aluno em uma turma)
+    semesters: int = 3
+    events_per_class: int = 8
+    notifications_per_student: int = 10
+    seed: int = 42
+
+    @property
+    def total_students(self) -> int:
+        return self.students or self.classes * self.students_per_class
+
+def semester_names(count: int, last: str = "2024.1") -> List[str]:
+    """Semestres em ordem cronológica terminando em `last` (ex.: 2023.1, 2023.2, 2024.1)"""
+    year, half = (int(part) for part in last.split("."))
+    names = []
+    for _ in range(count):
+        names.append(f"{year}.{half}")
+        year, half = (year, 1) if half == 2 else (year - 1, 2)
+    return list(reversed(names))
+
+def semester_start(semester: str) -> datetime:
+    """Data de início do semestre (fevereiro ou agosto)"""
+    year, half = (int(part) for part in semester.split("."))
+    return datetime(year, 2 if half == 1 else 8, 1, tzinfo=timezone.utc)
+
+def professor_id(index: int) -> str:
+    return f"prof{index + 1:03d}"
+
+def student_id(index: int) -> str:
+    return f"aluno{index + 1:03d}"
+
+def class_id(index: int) -> str:
+    return f"turma_{index + 1:04d}"
+
+def class_students(config: DatasetConfig, index: int) -> List[str]:
+    """Alunos da turma; com menos alunos que vagas, os alunos se repetem entre turmas"""
+    start = index * config.students_per_class
+    return [student_id((start + offset) % config.total_students)
+            for offset in range(config.students_per_class)]
+
+def class_semester(config: DatasetConfig, index: int) -> str:
+    """Turmas distribuídas igualmente entre os semestres"""
+    semesters = semester_names(config.semesters)
+    return semesters[index % len(semesters)]
+
+def make_rng(config: DatasetConfig, section: str) -> random.Random:
+    """Gerador aleatório independente por seção (cada arquivo pode ser gerado sozinho)"""
+    return random.Random(f"{config.seed}:{section}")
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def generate_users(config: DatasetConfig) -> Iterator[Dict]:
+    """Professores seguidos dos alunos"""
+    rng = make_rng(config, "users")
+    created_at = format_utc_timestamp(semester_start(semester_names(config.semesters)[0]))
+
+    for index in range(config.professors):
+        name = person_name(rng)
+        yield {
+            "id": professor_id(index),
+            "username": f"professor{index + 1}",
+            "password": PROFESSOR_PASSWORD,
+            "role": "professor",
+            "name": f"Prof. {name}",
+            "email": f"professor{index + 1}@universidade.edu.br",
+            "phone": f"(11) 9{index:04d}-{rng.randint(0, 9999):04d}",
+            "created_at": created_at
+        }
+
+    for index in range(config.total_students):
+        yield {
+            "id": student_id(index),
+            "username": f"aluno{index + 1}",
+            "password": STUDENT_PASSWORD,
+            "role": "aluno",
+            "name": person_name(rng),
+            "email": f"aluno{index + 1}@aluno.edu.br",
+            "phone": f"(11) 8{index % 10000:04d}-{rng.randint(0, 9999):04d}",
+            "created_at": created_at
+        }
+
+def generate_classes(config: DatasetConfig) -> Iterator[Dict]:
+    """Turmas com professor e alunos"""
+    rng = make_rng(config, "classes")
+
+    for index in range(config.classes):
+        semester = class_semester(config, index)
+        yield {
+            "id": class_id(index),
+            "name": f"Turma {index + 1} - {rng.randint(1, 3)}º Ano",
+            "subject": rng.choice(SUBJECTS),
+            "professor_id": professor_id(index % config.professors),
+            "students": class_students(config, index),
+            "semester": semester,
+            "created_at": format_utc_timestamp(semester_start(semester))
+        }
+
+def calculate_grade_status(grades: List) -> tuple:
+    """Nota final e status com as mesmas regras de /api/grades/update"""
+    valid_grades = [grade for grade in grades if grade is not None]
+    if len(valid_grades) < 2:
+        return None, "em_andamento"
+
+    final_grade = round(sum(valid_grades) / 4, 2)
+    if final_grade >= 7.0:
+        return final_grade, "aprovado"
+    if final_grade >= 5.0:
+        return final_grade, "recuperacao"
+    return final_grade, "reprovado"
+
+def generate_grades(config: DatasetConfig) -> Iterator[Dict]:
+    """Um registro de notas por aluno e turma; o semestre mais recente fica em andamento"""
+    rng = make_rng(config, "grades")
+    current_semester = semester_names(config.semesters)[-1]
+    number = 0
+
+    for index in range(config.classes):
+        semester = class_semester(config, index)
+        started = semester_start(semester)
+        # Semestres anteriores têm todas as notas; o atual, apenas parte delas
+        filled = len(GRADE_TYPES) if semester != current_semester else rng.randint(0, 2)
+
+        for student in class_students(config, index):
+            number += 1
+            values = [round(rng.uniform(2.0, 10.0), 1) if position < filled else None
+                      for position in range(len(GRADE_TYPES))]
+            final_grade, status = calculate_grade_status(values)
+
+            yield {
+                "id": f"grade{number:07d}",
+                "student_id": student,
+                "class_id": class_id(index),
+                "semester": semester,
+                **dict(zip(GRADE_TYPES, values)),
+                "final_grade": final_grade,
+                "status": status,
+                "created_at": format_utc_timestamp(started),
+                "updated_at": format_utc_timestamp(started + timedelta(days=30 * max(filled, 1)))
+            }
+
+def generate_events(config: DatasetConfig) -> Iterator[Dict]:
+    """Eventos distribuídos ao longo do semestre de cada turma"""
+    rng = make_rng(config, "events")
+    number = 0
+
+    for index in range(config.classes):
+        started = semester_start(class_semester(config, index))
+
+        for _ in range(config.events_per_class):
+            number += 1
+            event_type = rng.choice(EVENT_TYPES)
+            date = started + timedelta(days=rng.randint(0, 120), hours=rng.choice([8, 10, 14, 19]))
+            is_assessment = event_type in ("prova", "trabalho", "projeto")
+
+            yield {
+                "id": f"event{number:07d}",
+                "type": event_type,
+                "title": f"{event_type.title()} {number}",
+                "description": f"Atividade de {event_type} da turma {index + 1}",
+                "class_id": class_id(index),
+                "professor_id": professor_id(index % config.professors),
+                "date": format_utc_timestamp(date),
+                "duration": rng.choice([50, 100, 120]),
+                "location": rng.choice(LOCATIONS),
+                "grade_type": rng.choice(GRADE_TYPES) if is_assessment else None,
+                "due_date": format_utc_timestamp(date) if event_type != "aula" else None,
+                "created_at": format_utc_timestamp(date - timedelta(days=rng.randint(1, 14)))
+            }
+
+def generate_notifications(config: DatasetConfig) -> Iterator[Dict]:
+    """Histórico de notificações por aluno, em ordem cronológica, mais antigas já lidas"""
+    rng = make_rng(config, "notifications")
+    history_start = semester_start(semester_names(config.semesters)[0])
+    history_days = 180 * config.semesters
+    number = 0
+
+    for index in range(config.total_students):
+        offsets = sorted(rng.randint(0, history_days * 24) for _ in range(config.notifications_per_student))
+
+        for position, hours in enumerate(offsets):
+            number += 1
+            notification_type = rng.choice(["grade", "event", "info"])
+            yield {
+                "id": f"notif{number:08d}",
+                "user_id": student_id(index),
+                "title": f"Notificação {number}",
+                "message": f"Mensagem de teste ({notification_type}) para {student_id(index)}.",
+                "type": notification_type,
+                # As mais recentes tendem a não estar lidas
+                "read": position < config.notifications_per_student - rng.randint(0, 3),
+                "created_at": format_utc_timestamp(history_start + timedelta(hours=hours)),
+                "scheduled_for": None,
+                "sent": True
+            }
+
+def write_json_stream(path: str, sections: Dict[str, Iterable[Dict]]) -> int:
+    """
+    Grava {"seção": [itens...]} item a item, de forma atômica
+
+    Returns:
+        Quantidade de itens gravados
+    """
+    temp_path = path + ".tmp"
+    count = 0
+
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write("{")
+        for section_index, (section, items) in enumerate(sections.items()):
+            if section_index:
+                file.write(",")
+            file.write(f"\n  {json.dumps(section)}: [")
+            for item_index, item in enumerate(items):
+                file.write(",\n    " if item_index else "\n    ")
+                file.write(json.dumps(item, ensure_ascii=False))
+                count += 1
+            file.write("\n  ]")
+        file.write("\n}\n")
+
+    os.replace(temp_path, path)
+    return count
+
+def generate_dataset(config: DatasetConfig, data_dir: str = DATA_DIR) -> Dict[str, int]:
+    """
+    Gera todos os arquivos de dados em `data_dir`
+
+    Returns:
+        Quantidade de itens gravados por arquivo
+    """
+    if config.professors < 1 or config.total_students < 1:
+        raise ValueError("Dataset needs at least one professor and one student")
+    
+    os.makedirs(data_dir, exist_ok=True)
+    files = {
+        "users.json": {"users": generate_users(config)},
+        "classes.json": {"classes": generate_classes(config)},
+        "grades.json": {"grades": generate_grades(config)},
+        "calendar.json": {"events": generate_events(config)},
+        "notifications.json": {"notifications": generate_notifications(config), "email_queue": []},
+    }
+
+    counts = {}
+    for filename, sections in files.items():
+        counts[filename] = write_json_stream(os.path.join(data_dir, filename), sections)
+        print(f"✅ {filename}: {counts[filename]} registros")
+    return counts
+
+def parse_args() -> argparse.Namespace:
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos em escala para o Planner Edu")
+    parser.add_argument("--professors", type=int, default=defaults.professors)
+    parser.add_argument("--classes", type=int, default=defaults.classes)
+    parser.add_argument("--students-per-class", type=int, default=defaults.students_per_class)
+    parser.add_argument("--students", type=int, default=defaults.students,
+                        help="Total de alunos (padrão: classes x students-per-class)")
+    parser.add_argument("--semesters", type=int, default=defaults.semesters)
+    parser.add_argument("--events-per-class", type=int, default=defaults.events_per_class)
+    parser.add_argument("--notifications-per-student", type=int, default=defaults.notifications_per_student)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--snapshot", help="Também grava um snapshot .pimsnap dos dados gerados")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = DatasetConfig(
+        professors=args.professors,
+        classes=args.classes,
+        students_per_class=args.students_per_class,
+        students=args.students,
+        semesters=args.semesters,
+        events_per_class=args.events_per_class,
+        notifications_per_student=args.notifications_per_student,
+        seed=args.seed,
+    )
+    print(f"🏗️ Gerando dados sintéticos ({config.total_students} alunos, {config.classes} turmas)...")
+    generate_dataset(config, args.data_dir)
+    if args.snapshot:
+        snapshot_data_dir(args.data_dir, args.snapshot)
+        print(f"💾 Snapshot gravado em {args.snapshot}")
+    print("🎯 Dados sintéticos gerados!")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos do backend são importados a partir de backend/ (ex.: notifications.*)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -0,0 +1,57 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from notifications.notification_service import NotificationService
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+@pytest.fixture
+def event_time():
+    """Horário da prova usada nos lembretes"""
+    return datetime.now().replace(microsecond=0) + timedelta(days=3)
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, event_time):
+    """Serviço sobre um DATA_DIR temporário com um aluno que usa o resumo diário"""
+    write_json(tmp_path / "calendar.json", {"events": [{
+        "id": "evt001", "type": "prova", "title": "Prova NP1", "description": "",
+        "class_id": "turma_a", "date": event_time.isoformat(), "location": "Sala 1"
+    }]})
+    write_json(tmp_path / "classes.json", {"classes": [{"id": "turma_a", "students": ["aluno001"]}]})
+    write_json(tmp_path / "users.json", {"users": [{"id": "aluno001", "email": "aluno@escola.edu.br"}]})
+    write_json(tmp_path / "notifications.json", {
+        "notifications": [],
+        "email_queue": [],
+        "preferences": {"aluno001": {"email_digest": True}},
+        "settings": {"reminder_hours": [24, 2]}
+    })
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    return NotificationService()
+
+def test_event_reminders_are_sent_as_one_digest(service, event_time):
+    assert service.create_event_reminders() == 2
+
+    # Antes do horário dos lembretes não há o que resumir
+    assert service.build_daily_digests() == 0
+
+    assert service.build_daily_digests(now=event_time.astimezone()) == 1
+
+    email_queue = service._load_notifications()["email_queue"]
+    digests = [item for item in email_queue if item.get("digest")]
+    reminders = [item for item in email_queue if item.get("reminder_key")]
+    assert len(digests) == 1
+    assert digests[0]["user_id"] == "aluno001"
+    assert digests[0]["digest_size"] == 2
+    assert all(item["status"] == "digested" for item in reminders)
+
+def test_urgent_email_is_not_held_for_digest(service):
+    service.create_notification("aluno001", "Sala alterada", "Prova na sala 2", send_email=True, urgent=True)
+
+    assert service.build_daily_digests() == 0
+    email_queue = service._load_notifications()["email_queue"]
+    assert email_queue[0]["urgent"] is True
+    assert email_queue[0]["status"] == "pending"
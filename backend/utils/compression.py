@@ -0,0 +1,23 @@
+from typing import Iterable
+
+from starlette.middleware.gzip import GZipMiddleware
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware que ignora caminhos específicos
+
+    O gzip da Starlette acumula os blocos de respostas em streaming no
+    compressor, então eventos SSE ficariam retidos até encher o buffer;
+    esses caminhos passam sem compressão.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 6,
+                 excluded_paths: Iterable[str] = ()):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,35 @@
+import codecs
+import csv
+from typing import AsyncIterable, AsyncIterator, List, Tuple
+
+async def iter_csv_rows(chunks: AsyncIterable[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[Tuple[int, List[str]]]:
+    """
+    Lê um CSV a partir de blocos de bytes (ex.: corpo da requisição em streaming)
+
+    Só as linhas completas são interpretadas; o resto fica no buffer até o
+    próximo bloco, então o arquivo nunca é carregado inteiro. Campos entre
+    aspas com quebra de linha não são suportados.
+
+    Yields:
+        (número da linha, colunas), ignorando linhas vazias
+
+    Raises:
+        UnicodeDecodeError: Se o conteúdo não estiver na codificação indicada
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    line_number = 0
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_number += 1
+            row = next(csv.reader([line.rstrip("\r")]), [])
+            if any(value.strip() for value in row):
+                yield line_number, row
+
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        line_number += 1
+        yield line_number, next(csv.reader([pending.rstrip("\r")]), [])
@@ -0,0 +1,57 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from utils.id_generator import new_id
+
+class CollectionVersions:
+    """
+    Contadores de versão por coleção (arquivo de dados)
+
+    O contador sobe a cada gravação feita pela aplicação. A assinatura do
+    arquivo (mtime, tamanho) também é guardada: se o arquivo mudar por fora
+    (outro processo, edição manual), a próxima consulta também sobe a versão.
+    Como os contadores recomeçam a cada processo, as ETags levam um
+    identificador da instância para não coincidirem entre reinícios.
+    """
+
+    def __init__(self):
+        self.instance = new_id().lower()[-8:]
+        self._lock = threading.Lock()
+        # coleção -> (versão, assinatura do arquivo)
+        self._versions: Dict[str, Tuple[int, Optional[tuple]]] = {}
+
+    def bump(self, collection: str, signature: Optional[tuple]) -> int:
+        """Registra uma gravação e retorna a nova versão"""
+        with self._lock:
+            version = self._versions.get(collection, (0, None))[0] + 1
+            self._versions[collection] = (version, signature)
+            return version
+
+    def current(self, collection: str, signature: Optional[tuple]) -> int:
+        """Versão atual, subindo-a se o arquivo mudou desde a última gravação conhecida"""
+        with self._lock:
+            version, known_signature = self._versions.get(collection, (0, None))
+            if version == 0 or signature != known_signature:
+                version += 1
+                self._versions[collection] = (version, signature)
+            return version
+
+    def build_etag(self, *parts) -> str:
+        """ETag forte a partir das versões (e, se filtrada, do usuário)"""
+        return '"' + "-".join([self.instance, *(str(part) for part in parts)]) + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Verifica se o cabeçalho If-None-Match contém a ETag (ou "*")"""
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match usa comparação fraca: W/"x" equivale a "x"
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,33 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Converte o parâmetro `fields` ("id,title,date") na lista de campos
+
+    O "id" é sempre incluído para que o cliente consiga identificar os itens.
+
+    Returns:
+        Campos na ordem pedida, ou None para retornar todos
+
+    Raises:
+        ValueError: Se algum campo não existir na coleção
+    """
+    if not fields:
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    selected = ["id"]
+    for field in requested:
+        if field not in selected:
+            selected.append(field)
+    return tuple(selected)
+
+def select_fields_list(items: Iterable[Dict], fields: Optional[Tuple[str, ...]]) -> List[Dict]:
+    """Cópias dos itens só com os campos pedidos (os próprios itens se fields for None)"""
+    if fields is None:
+        return list(items)
+    return [{field: item[field] for field in fields if field in item} for item in items]
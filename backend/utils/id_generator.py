@@ -0,0 +1,60 @@
+import os
+import threading
+import time
+from typing import Optional
+
+# Base32 de Crockford (sem I, L, O, U): preserva a ordem lexicográfica
+ENCODING = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+TIMESTAMP_LENGTH = 10  # 48 bits de milissegundos
+RANDOM_LENGTH = 16  # 80 bits aleatórios
+RANDOM_MAX = (1 << 80) - 1
+
+def encode_base32(value: int, length: int) -> str:
+    """Codifica inteiro em base32 de Crockford com tamanho fixo"""
+    chars = []
+    for _ in range(length):
+        value, remainder = divmod(value, 32)
+        chars.append(ENCODING[remainder])
+    return "".join(reversed(chars))
+
+class IdGenerator:
+    """
+    Gerador de IDs no estilo ULID, ordenáveis pelo horário de criação
+
+    IDs gerados no mesmo milissegundo incrementam a parte aleatória do
+    anterior, então a ordem lexicográfica segue a ordem de criação mesmo em
+    lotes e não há colisões dentro do processo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_timestamp = 0
+        self._last_random = 0
+
+    def new_id(self, prefix: Optional[str] = None) -> str:
+        """Gera um novo ID, opcionalmente com prefixo (ex.: "notif_01J...")"""
+        with self._lock:
+            timestamp = int(time.time() * 1000)
+
+            if timestamp <= self._last_timestamp:
+                # Mesmo milissegundo (ou relógio voltou): manter a ordem
+                timestamp = self._last_timestamp
+                random_part = self._last_random + 1
+                if random_part > RANDOM_MAX:
+                    timestamp += 1
+                    random_part = int.from_bytes(os.urandom(10), "big")
+            else:
+                random_part = int.from_bytes(os.urandom(10), "big")
+
+            self._last_timestamp = timestamp
+            self._last_random = random_part
+
+        ulid = encode_base32(timestamp, TIMESTAMP_LENGTH) + encode_base32(random_part, RANDOM_LENGTH)
+        return f"{prefix}_{ulid}" if prefix else ulid
+
+# Instância global compartilhada pela API e pelo serviço de notificações
+id_generator = IdGenerator()
+
+def new_id(prefix: Optional[str] = None) -> str:
+    """Gera um novo ID com o gerador global"""
+    return id_generator.new_id(prefix)
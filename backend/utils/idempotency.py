@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+import re
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from utils.ttl_cache import TTLCache
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+class BodyTooLarge(Exception):
+    """Corpo maior que o limite guardado para comparar repetições"""
+
+class StoredResponse:
+    """Resposta original de uma requisição idempotente"""
+
+    def __init__(self, fingerprint: str, status: int, headers: list, body: bytes):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+class IdempotencyMiddleware:
+    """
+    Middleware ASGI que aplica o cabeçalho Idempotency-Key em rotas de escrita
+
+    A primeira requisição com uma chave é executada normalmente e sua
+    resposta fica guardada (por usuário + chave) em um TTLCache limitado.
+    Repetições com a mesma chave recebem a resposta original, sem refazer a
+    gravação nem as notificações. Se a original ainda estiver em andamento
+    (ex.: o cliente desistiu por timeout e tentou de novo), a repetição
+    espera por ela. Reusar a chave com outro corpo/rota retorna 422.
+
+    Respostas 5xx não são guardadas, para que uma nova tentativa possa
+    funcionar. Requisições sem o cabeçalho passam direto, assim como rotas
+    em `excluded_path_patterns` (ex.: uploads lidos em streaming, que o
+    middleware teria de carregar inteiros na memória). Com o cabeçalho, corpos
+    acima de `max_body_size` recebem 413.
+    """
+
+    def __init__(self, app, identify: Callable[[str], Optional[str]],
+                 ttl_seconds: float = 86400, max_entries: int = 10000,
+                 methods: Iterable[str] = ("POST", "PUT", "PATCH", "DELETE"),
+                 max_body_size: int = 1024 * 1024,
+                 excluded_path_patterns: Iterable[str] = ()):
+        """
+        Args:
+            app: Aplicação ASGI
+            identify: Recebe o token Bearer e retorna o ID do usuário (ou None)
+            ttl_seconds: Tempo que uma chave fica guardada
+            max_entries: Chaves guardadas ao mesmo tempo (as mais antigas saem)
+            methods: Métodos HTTP em que o cabeçalho é aplicado
+            max_body_size: Tamanho máximo (bytes) do corpo de uma requisição com chave
+            excluded_path_patterns: Expressões regulares de caminhos ignorados
+        """
+        self.app = app
+        self.identify = identify
+        self.methods = set(methods)
+        self.max_body_size = max_body_size
+        self.excluded_path_patterns = [re.compile(pattern) for pattern in excluded_path_patterns]
+        self.responses = TTLCache(ttl_seconds, max_entries=max_entries)
+        # Requisições em andamento por chave
+        self._in_flight: Dict[Tuple[str, str], asyncio.Event] = {}
+
+    def _get_key(self, scope) -> Optional[str]:
+        for name, value in scope.get("headers", []):
+            if name == IDEMPOTENCY_HEADER:
+                return value.decode("latin-1").strip() or None
+        return None
+
+    def _get_owner(self, scope) -> Optional[str]:
+        """Usuário dono da chave; sem token válido a chave é ignorada"""
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    try:
+                        return self.identify(token.strip())
+                    except Exception:
+                        return None
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] not in self.methods
+                or any(pattern.fullmatch(scope["path"]) for pattern in self.excluded_path_patterns)):
+            await self.app(scope, receive, send)
+            return
+
+        key = self._get_key(scope)
+        owner = self._get_owner(scope) if key else None
+        if key is None or owner is None:
+            await self.app(scope, receive, send)
+            return
+
+        if len(key) > MAX_KEY_LENGTH:
+            await self._send_error(send, 400, "Idempotency-Key too long")
+            return
+
+        try:
+            body = await self._read_body(scope, receive)
+        except BodyTooLarge:
+            await self._send_error(send, 413, "Request body too large for Idempotency-Key")
+            return
+        fingerprint = hashlib.sha256(b"\0".join([
+            scope["method"].encode("latin-1"),
+            scope["path"].encode("utf-8"),
+            scope.get("query_string", b""),
+            body,
+        ])).hexdigest()
+        cache_key = (owner, key)
+
+        # Repetição de uma requisição ainda em andamento: esperar a original
+        while cache_key in self._in_flight:
+            await self._in_flight[cache_key].wait()
+
+        stored = self.responses.get(cache_key)
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                await self._send_error(send, 422, "Idempotency-Key reused with a different request")
+            else:
+                await self._replay(send, stored)
+            return
+
+        done = asyncio.Event()
+        self._in_flight[cache_key] = done
+        try:
+            await self._run_and_store(scope, receive, send, body, cache_key, fingerprint)
+        finally:
+            del self._in_flight[cache_key]
+            done.set()
+
+    async def _read_body(self, scope, receive) -> bytes:
+        """Lê o corpo inteiro (para a impressão digital), até max_body_size"""
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_body_size:
+                raise BodyTooLarge()
+
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                raise BodyTooLarge()
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _run_and_store(self, scope, receive, send, body: bytes, cache_key, fingerprint: str):
+        """Executa a requisição repassando a resposta ao cliente e guardando uma cópia"""
+        body_sent = False
+        status = 500
+        headers: list = []
+        chunks = []
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Corpo já entregue: próximas mensagens vêm do servidor (ex.: desconexão)
+            return await receive()
+
+        async def capture_send(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+
+        if status < 500:
+            self.responses.set(cache_key, StoredResponse(fingerprint, status, headers, b"".join(chunks)))
+
+    async def _replay(self, send, stored: StoredResponse):
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": stored.headers + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+    async def _send_error(self, send, status: int, detail: str):
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
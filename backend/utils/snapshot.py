@@ -0,0 +1,150 @@
+import json
+import os
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Formato .pimsnap (little-endian):
+#   cabeçalho: MAGIC (8 bytes) | versão u16 | flags u16 | seções u32
+#   por seção: tamanho do nome u16 | nome UTF-8 | offset u64 | tamanho u64 | crc32 u32
+#   conteúdo das seções: JSON compacto em UTF-8 (comprimido com zlib se FLAG_ZLIB)
+# O conteúdo de cada seção é exatamente o arquivo JSON correspondente, então a
+# restauração grava os bytes direto, sem decodificar e codificar de novo.
+MAGIC = b"PIMSNAP\x00"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x1
+
+HEADER = struct.Struct("<8sHHI")
+NAME_LENGTH = struct.Struct("<H")
+SECTION = struct.Struct("<QQI")
+
+class SnapshotError(ValueError):
+    """Arquivo de snapshot inválido, corrompido ou de versão não suportada"""
+
+def encode_collection(data: Dict) -> bytes:
+    """JSON compacto de uma coleção (mesmo conteúdo do arquivo, sem indentação)"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def pack_snapshot(sections: Dict[str, bytes], compress: bool = False) -> bytes:
+    """Monta o snapshot a partir do conteúdo (JSON já codificado) de cada seção"""
+    payloads: List[Tuple[bytes, bytes]] = []
+    for name, payload in sections.items():
+        if compress:
+            payload = zlib.compress(payload, 1)
+        payloads.append((name.encode("utf-8"), payload))
+
+    table_size = sum(NAME_LENGTH.size + len(name) + SECTION.size for name, _ in payloads)
+    offset = HEADER.size + table_size
+
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_ZLIB if compress else 0, len(payloads))]
+    for name, payload in payloads:
+        parts.append(NAME_LENGTH.pack(len(name)))
+        parts.append(name)
+        parts.append(SECTION.pack(offset, len(payload), zlib.crc32(payload)))
+        offset += len(payload)
+    parts.extend(payload for _, payload in payloads)
+    return b"".join(parts)
+
+def unpack_snapshot(buffer: bytes) -> Dict[str, bytes]:
+    """
+    Separa as seções de um snapshot (conteúdo JSON de cada uma)
+
+    Raises:
+        SnapshotError: Se o cabeçalho, a versão ou algum checksum não conferir
+    """
+    if len(buffer) < HEADER.size:
+        raise SnapshotError("Truncated snapshot header")
+
+    magic, version, flags, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise SnapshotError("Not a snapshot file")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+
+    view = memoryview(buffer)
+    sections = {}
+    position = HEADER.size
+    try:
+        for _ in range(count):
+            (name_length,) = NAME_LENGTH.unpack_from(buffer, position)
+            position += NAME_LENGTH.size
+            name = bytes(view[position:position + name_length]).decode("utf-8")
+            position += name_length
+            offset, length, checksum = SECTION.unpack_from(buffer, position)
+            position += SECTION.size
+
+            payload = view[offset:offset + length]
+            if len(payload) != length or zlib.crc32(payload) != checksum:
+                raise SnapshotError(f"Corrupted section {name}")
+            sections[name] = zlib.decompress(payload) if flags & FLAG_ZLIB else bytes(payload)
+    except (struct.error, UnicodeDecodeError, zlib.error) as e:
+        raise SnapshotError(f"Invalid snapshot: {e}")
+
+    return sections
+
+def save_snapshot(path: str, collections: Dict[str, Dict], compress: bool = False) -> int:
+    """
+    Grava coleções (nome do arquivo -> dados) em um snapshot
+
+    Returns:
+        Tamanho do arquivo em bytes
+    """
+    snapshot = pack_snapshot({name: encode_collection(data) for name, data in collections.items()}, compress)
+    write_file_atomic(path, snapshot)
+    return len(snapshot)
+
+def load_snapshot(path: str) -> Dict[str, Dict]:
+    """Lê o snapshot inteiro de uma vez e decodifica as coleções"""
+    with open(path, "rb") as f:
+        sections = unpack_snapshot(f.read())
+    return {name: json.loads(payload) for name, payload in sections.items()}
+
+def snapshot_data_dir(data_dir: str, path: str, filenames: Optional[Iterable[str]] = None,
+                      compress: bool = False) -> Dict[str, int]:
+    """
+    Cria um snapshot dos arquivos JSON do diretório de dados
+
+    Args:
+        filenames: Arquivos incluídos (padrão: todos os .json do diretório)
+
+    Returns:
+        Tamanho (bytes) do JSON compacto de cada arquivo incluído
+    """
+    if filenames is None:
+        filenames = sorted(name for name in os.listdir(data_dir) if name.endswith(".json"))
+
+    sections = {}
+    for filename in filenames:
+        with open(os.path.join(data_dir, filename), "r", encoding="utf-8") as f:
+            sections[filename] = encode_collection(json.load(f))
+
+    write_file_atomic(path, pack_snapshot(sections, compress))
+    return {name: len(payload) for name, payload in sections.items()}
+
+def restore_data_dir(path: str, data_dir: str) -> Dict[str, int]:
+    """
+    Restaura os arquivos JSON do diretório de dados a partir de um snapshot
+
+    O conteúdo de cada seção é gravado como está (JSON compacto), sem
+    passar por json.load/json.dump.
+
+    Returns:
+        Bytes gravados por arquivo
+    """
+    with open(path, "rb") as f:
+        sections = unpack_snapshot(f.read())
+
+    os.makedirs(data_dir, exist_ok=True)
+    for filename, payload in sections.items():
+        if os.path.basename(filename) != filename:
+            raise SnapshotError(f"Invalid section name {filename}")
+        write_file_atomic(os.path.join(data_dir, filename), payload)
+
+    return {name: len(payload) for name, payload in sections.items()}
+
+def write_file_atomic(path: str, content: bytes):
+    """Grava em arquivo temporário e substitui o destino (leitores nunca veem arquivo pela metade)"""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(content)
+    os.replace(temporary_path, path)
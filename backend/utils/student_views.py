@@ -0,0 +1,119 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+class StudentViews:
+    """
+    Visões materializadas por aluno: notas e eventos das turmas em que está
+
+    Leituras de alunos viram consultas diretas em vez de filtrar a lista
+    inteira de notas/eventos a cada requisição. As escritas da API atualizam
+    as visões incrementalmente (apply_grade, add_event, set_class_students);
+    `signatures` guarda as assinaturas dos arquivos refletidos, e quem usa
+    a visão a reconstrói se algum arquivo mudou por fora.
+    """
+
+    def __init__(self):
+        # Notas de cada aluno, na ordem do arquivo
+        self.grades_by_student: Dict[str, List[Dict]] = {}
+        # Turmas de cada aluno e alunos de cada turma (conjuntos: pertinência em O(1))
+        self.classes_by_student: Dict[str, Set[str]] = {}
+        self.students_by_class: Dict[str, Set[str]] = {}
+        # Eventos por ID e IDs dos eventos de cada turma/aluno, na ordem de criação
+        self.events_by_id: Dict[str, Dict] = {}
+        self.event_ids_by_class: Dict[str, List[str]] = {}
+        self.event_ids_by_student: Dict[str, List[str]] = {}
+        # Posição de cada evento no arquivo (calculada sob demanda)
+        self._event_positions: Optional[Dict[str, int]] = None
+        # Assinaturas (mtime, tamanho) dos arquivos refletidos
+        self.signatures: Optional[tuple] = None
+
+    def rebuild(self, grades_data: Dict, calendar_data: Dict, classes_data: Dict, signatures: tuple):
+        """Reconstrói todas as visões a partir dos dados completos"""
+        self.grades_by_student = {}
+        for grade in grades_data.get("grades", []):
+            self.grades_by_student.setdefault(grade["student_id"], []).append(grade)
+
+        self.events_by_id = {}
+        self.event_ids_by_class = {}
+        self._event_positions = None
+        for event in calendar_data.get("events", []):
+            self.events_by_id[event["id"]] = event
+            self.event_ids_by_class.setdefault(event.get("class_id"), []).append(event["id"])
+
+        self.classes_by_student = {}
+        self.students_by_class = {}
+        for cls in classes_data.get("classes", []):
+            self.students_by_class[cls["id"]] = set(cls.get("students", []))
+            for student_id in cls.get("students", []):
+                self.classes_by_student.setdefault(student_id, set()).add(cls["id"])
+
+        self.event_ids_by_student = {}
+        for student_id in self.classes_by_student:
+            self._refresh_student_events(student_id)
+
+        self.signatures = signatures
+
+    def is_enrolled(self, student_id: str, class_id: str) -> bool:
+        """Verifica se o aluno está matriculado na turma"""
+        return class_id in self.classes_by_student.get(student_id, ())
+
+    def get_class_ids(self, student_id: str) -> Set[str]:
+        """Turmas em que o aluno está matriculado"""
+        return self.classes_by_student.get(student_id, set())
+
+    def get_grades(self, student_id: str) -> List[Dict]:
+        """Notas do aluno"""
+        return self.grades_by_student.get(student_id, [])
+
+    def get_events(self, student_id: str) -> List[Dict]:
+        """Eventos das turmas do aluno"""
+        return [self.events_by_id[event_id] for event_id in self.event_ids_by_student.get(student_id, [])]
+
+    def apply_grade(self, grade: Dict):
+        """Insere ou substitui (pelo ID) o registro de nota do aluno"""
+        rows = self.grades_by_student.setdefault(grade["student_id"], [])
+        for position, row in enumerate(rows):
+            if row["id"] == grade["id"]:
+                rows[position] = grade
+                return
+        rows.append(grade)
+
+    def add_event(self, event: Dict):
+        """Adiciona um evento novo à turma e a cada aluno dela"""
+        class_id = event.get("class_id")
+        if self._event_positions is not None:
+            self._event_positions[event["id"]] = len(self.events_by_id)
+        self.events_by_id[event["id"]] = event
+        self.event_ids_by_class.setdefault(class_id, []).append(event["id"])
+        for student_id in self.students_by_class.get(class_id, []):
+            self.event_ids_by_student.setdefault(student_id, []).append(event["id"])
+
+    def set_class_students(self, class_id: str, students: Iterable[str]):
+        """Atualiza a lista de alunos de uma turma (matrículas e remoções)"""
+        previous = self.students_by_class.get(class_id, set())
+        current = set(students)
+        self.students_by_class[class_id] = current
+
+        changed = previous.symmetric_difference(current)
+        for student_id in changed:
+            classes = self.classes_by_student.setdefault(student_id, set())
+            if student_id in previous:
+                classes.discard(class_id)
+            else:
+                classes.add(class_id)
+            self._refresh_student_events(student_id)
+
+    def _refresh_student_events(self, student_id: str):
+        """Recalcula os eventos do aluno a partir das turmas, em ordem de criação"""
+        event_ids = []
+        for class_id in self.classes_by_student.get(student_id, ()):
+            event_ids.extend(self.event_ids_by_class.get(class_id, []))
+        if len(self.classes_by_student.get(student_id, ())) > 1:
+            # Mesma ordem do calendar.json (o dicionário segue a ordem de inserção)
+            positions = self._get_event_positions()
+            event_ids.sort(key=positions.__getitem__)
+        self.event_ids_by_student[student_id] = event_ids
+
+    def _get_event_positions(self) -> Dict[str, int]:
+        if self._event_positions is None:
+            self._event_positions = {event_id: position for position, event_id in enumerate(self.events_by_id)}
+        return self._event_positions
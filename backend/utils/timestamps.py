@@ -0,0 +1,19 @@
+from datetime import datetime, timezone
+
+# Sempre com microssegundos e sufixo "Z" (ex.: 2024-05-01T12:00:00.000000Z)
+UTC_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+def format_utc_timestamp(value: datetime) -> str:
+    """
+    Formata um horário no padrão gravado nos arquivos de dados
+
+    O tamanho fixo faz a ordem das strings ser a ordem cronológica; o índice
+    de notificações e os cursores de paginação dependem disso.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime(UTC_TIMESTAMP_FORMAT)
+
+def utc_now_iso() -> str:
+    """Horário atual em UTC no formato gravado nos arquivos de dados"""
+    return format_utc_timestamp(datetime.now(timezone.utc))
@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+class TTLCache:
+    """
+    Cache em memória com expiração por tempo e número máximo de entradas
+
+    Cada entrada guarda também uma "versão" opcional (ex.: assinaturas dos
+    arquivos usados no cálculo): uma leitura com versão diferente é tratada
+    como ausente, então alterações nos dados não esperam o fim do TTL.
+    Ao exceder max_entries, a entrada usada há mais tempo é descartada.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # chave -> (expira_em, versão, valor), em ordem de uso
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[Any]:
+        """Valor em cache, ou None se ausente, expirado ou de outra versão"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, entry_version, value = entry
+            if expires_at <= self._clock() or entry_version != version:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, version: Any = None):
+        """Armazena um valor, descartando as entradas mais antigas se necessário"""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Remove uma entrada"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
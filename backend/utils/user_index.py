@@ -0,0 +1,26 @@
+from typing import Dict, Optional
+
+class UserIndex:
+    """Índice em memória dos usuários por ID e por username"""
+
+    def __init__(self):
+        self.by_id: Dict[str, Dict] = {}
+        self.by_username: Dict[str, Dict] = {}
+        # Assinatura (mtime, tamanho) do arquivo refletido pelo índice
+        self.signature: Optional[tuple] = None
+
+    def rebuild(self, users_data: Dict, signature: Optional[tuple]):
+        """Reconstrói o índice a partir de users.json"""
+        self.by_id = {}
+        self.by_username = {}
+        for user in users_data.get("users", []):
+            self.by_id[user["id"]] = user
+            self.by_username[user["username"]] = user
+        self.signature = signature
+
+    def get_student(self, identifier: str) -> Optional[Dict]:
+        """Aluno pelo ID ou username (None se não existir ou não for aluno)"""
+        user = self.by_id.get(identifier) or self.by_username.get(identifier)
+        if user is None or user.get("role") != "aluno":
+            return None
+        return user
@@ -3,6 +3,7 @@ import { BrowserRouter as Router, Routes, Route, Navigate } from 'react-router-d
 import { Toaster } from 'react-hot-toast';
 import { useAuthStore } from '@/stores/authStore';
 import { useNotificationStore } from '@/stores/notificationStore';
+import { apiService } from '@/services/api';
 
 // Páginas
 import LoginPage from '@/pages/LoginPage';
@@ -22,7 +23,7 @@ import '@/styles/simple.css';
 
 function App() {
   const { isAuthenticated, isLoading, checkAuth } = useAuthStore();
-  const { updateUnreadCount } = useNotificationStore();
+  const { updateUnreadCount, receiveNotification, setUnreadCount } = useNotificationStore();
 
   useEffect(() => {
     // Verificar autenticação ao carregar a aplicação
@@ -33,12 +34,62 @@ function App() {
     // Atualizar contagem de notificações se autenticado
     if (isAuthenticated) {
       updateUnreadCount();
-      
-      // Atualizar a cada 30 segundos
-      const interval = setInterval(updateUnreadCount, 30000);
-      return () => clearInterval(interval);
+
+      // Receber notificações em tempo real
+      let stream: EventSource | null = null;
+      let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+      let closed = false;
+
+      const connect = async () => {
+        try {
+          stream = await apiService.openNotificationStream();
+        } catch (error) {
+          stream = null;
+        }
+        if (closed) {
+          stream?.close();
+          return;
+        }
+        if (!stream) {
+          reconnectTimer = setTimeout(connect, 30000);
+          return;
+        }
+
+        stream.addEventListener('ready', (event) => {
+          setUnreadCount(JSON.parse((event as MessageEvent).data).unread_count);
+        });
+        stream.addEventListener('notification', (event) => {
+          const payload = JSON.parse((event as MessageEvent).data);
+          receiveNotification(payload.notification, payload.unread_count);
+        });
+        stream.addEventListener('resync', () => {
+          updateUnreadCount();
+        });
+        stream.addEventListener('error', () => {
+          // O token do stream expira em segundos: se o navegador desistiu de
+          // reconectar com a URL antiga, pedir um token novo
+          if (stream?.readyState === EventSource.CLOSED && !closed) {
+            reconnectTimer = setTimeout(connect, 5000);
+          }
+        });
+      };
+      connect();
+
+      // Polling apenas como alternativa quando o canal em tempo real está indisponível
+      const interval = setInterval(() => {
+        if (!stream || stream.readyState !== EventSource.OPEN) {
+          updateUnreadCount();
+        }
+      }, 30000);
+
+      return () => {
+        closed = true;
+        clearInterval(interval);
+        clearTimeout(reconnectTimer);
+        stream?.close();
+      };
     }
-  }, [isAuthenticated, updateUnreadCount]);
+  }, [isAuthenticated, updateUnreadCount, receiveNotification, setUnreadCount]);
 
   if (isLoading) {
     return (
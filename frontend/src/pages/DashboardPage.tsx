@@ -11,9 +11,9 @@ import {
 } from 'lucide-react';
 import { useAuthStore } from '@/stores/authStore';
 import { apiService } from '@/services/api';
-import { CalendarEvent, Grade, Class, Notification } from '@/types';
+import { CalendarEvent, Grade, Notification } from '@/types';
 import LoadingSpinner from '@/components/LoadingSpinner';
-import { format, isToday, isTomorrow, addDays } from 'date-fns';
+import { format, isToday, isTomorrow } from 'date-fns';
 import { ptBR } from 'date-fns/locale';
 
 interface DashboardStats {
@@ -43,12 +43,20 @@ const DashboardPage: React.FC = () => {
   const loadDashboardData = async () => {
     try {
       setLoading(true);
-      
-      if (user?.role === 'professor') {
-        await loadProfessorDashboard();
-      } else {
-        await loadStudentDashboard();
-      }
+
+      // Resumo calculado no servidor conforme o papel do usuário
+      const dashboard = await apiService.getDashboard();
+
+      setStats({
+        totalClasses: dashboard.stats.total_classes,
+        upcomingEvents: dashboard.stats.upcoming_events,
+        pendingGrades: dashboard.stats.pending_grades,
+        approvalRate: dashboard.stats.approval_rate,
+      });
+
+      setRecentEvents(dashboard.upcoming_events);
+      setRecentGrades(dashboard.latest_grades);
+      setNotifications(dashboard.notifications);
     } catch (error) {
       console.error('Erro ao carregar dashboard:', error);
     } finally {
@@ -56,96 +64,6 @@ const DashboardPage: React.FC = () => {
     }
   };
 
-  const loadProfessorDashboard = async () => {
-    const [classes, events, grades, notifs] = await Promise.all([
-      apiService.getClasses(),
-      apiService.getCalendarEvents(),
-      apiService.getGrades(),
-      apiService.getNotifications(),
-    ]);
-
-    // Filtrar dados do professor
-    const professorClasses = classes.filter(cls => cls.professor_id === user?.id);
-    const professorEvents = events.filter(event => event.professor_id === user?.id);
-    
-    // Eventos futuros (próximos 7 dias, incluindo hoje)
-    const today = new Date();
-    const startOfToday = new Date(today.getFullYear(), today.getMonth(), today.getDate());
-    const nextWeek = addDays(today, 7);
-    const upcomingEvents = professorEvents.filter(event => {
-      const eventDate = new Date(event.date);
-      return eventDate >= startOfToday && eventDate <= nextWeek;
-    });
-
-    // Notas pendentes (sem nota final)
-    const pendingGrades = grades.filter(grade => 
-      grade.final_grade === null && 
-      professorClasses.some(cls => cls.id === grade.class_id)
-    );
-
-    // Taxa de aprovação
-    const completedGrades = grades.filter(grade => grade.final_grade !== null);
-    const approvedCount = completedGrades.filter(grade => grade.status === 'aprovado').length;
-    const approvalRate = completedGrades.length > 0 ? (approvedCount / completedGrades.length) * 100 : 0;
-
-    setStats({
-      totalClasses: professorClasses.length,
-      upcomingEvents: upcomingEvents.length,
-      pendingGrades: pendingGrades.length,
-      approvalRate: Math.round(approvalRate),
-    });
-
-    setRecentEvents(upcomingEvents.slice(0, 5));
-    setRecentGrades(pendingGrades.slice(0, 5));
-    setNotifications(notifs.slice(0, 5));
-  };
-
-  const loadStudentDashboard = async () => {
-    const [events, grades, notifs, classes] = await Promise.all([
-      apiService.getCalendarEvents(),
-      apiService.getGrades(),
-      apiService.getNotifications(),
-      apiService.getClasses(),
-    ]);
-
-    // Encontrar turma do aluno
-    const studentClasses = classes.filter(cls => cls.students.includes(user?.id || ''));
-    
-    // Eventos da turma do aluno
-    const studentEvents = events.filter(event => 
-      studentClasses.some(cls => cls.id === event.class_id)
-    );
-
-    // Eventos futuros (próximos 7 dias, incluindo hoje)
-    const today = new Date();
-    const startOfToday = new Date(today.getFullYear(), today.getMonth(), today.getDate());
-    const nextWeek = addDays(today, 7);
-    const upcomingEvents = studentEvents.filter(event => {
-      const eventDate = new Date(event.date);
-      return eventDate >= startOfToday && eventDate <= nextWeek;
-    });
-
-    // Notas do aluno
-    const studentGrades = grades.filter(grade => grade.student_id === user?.id);
-    const pendingGrades = studentGrades.filter(grade => grade.final_grade === null);
-    
-    // Taxa de aprovação do aluno
-    const completedGrades = studentGrades.filter(grade => grade.final_grade !== null);
-    const approvedCount = completedGrades.filter(grade => grade.status === 'aprovado').length;
-    const approvalRate = completedGrades.length > 0 ? (approvedCount / completedGrades.length) * 100 : 0;
-
-    setStats({
-      totalClasses: studentClasses.length,
-      upcomingEvents: upcomingEvents.length,
-      pendingGrades: pendingGrades.length,
-      approvalRate: Math.round(approvalRate),
-    });
-
-    setRecentEvents(upcomingEvents.slice(0, 5));
-    setRecentGrades(studentGrades.slice(0, 5));
-    setNotifications(notifs.slice(0, 5));
-  };
-
   const getEventTypeIcon = (type: string) => {
     switch (type) {
       case 'aula':
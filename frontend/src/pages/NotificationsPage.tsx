@@ -21,9 +21,12 @@ const NotificationsPage: React.FC = () => {
   const {
     notifications,
     unreadCount,
+    nextCursor,
     isLoading,
+    isLoadingMore,
     error,
     fetchNotifications,
+    fetchMoreNotifications,
     markAsRead,
     markAllAsRead,
     clearError,
@@ -148,10 +151,10 @@ const NotificationsPage: React.FC = () => {
               <div className="ml-5 w-0 flex-1">
                 <dl>
                   <dt className="text-sm font-medium text-gray-500 truncate">
-                    Total de Notificações
+                    Notificações Carregadas
                   </dt>
                   <dd className="text-lg font-medium text-gray-900">
-                    {notifications.length}
+                    {notifications.length}{nextCursor ? '+' : ''}
                   </dd>
                 </dl>
               </div>
@@ -191,7 +194,7 @@ const NotificationsPage: React.FC = () => {
                     Lidas
                   </dt>
                   <dd className="text-lg font-medium text-gray-900">
-                    {notifications.length - unreadCount}
+                    {notifications.filter(n => n.read).length}{nextCursor ? '+' : ''}
                   </dd>
                 </dl>
               </div>
@@ -312,7 +315,7 @@ const NotificationsPage: React.FC = () => {
               </div>
             ))}
           </div>
-        ) : (
+        ) : nextCursor ? null : (
           <div className="text-center py-12">
             <Bell className="mx-auto h-12 w-12 text-gray-400" />
             <h3 className="mt-2 text-sm font-medium text-gray-900">
@@ -332,6 +335,19 @@ const NotificationsPage: React.FC = () => {
         )}
       </div>
 
+      {/* Paginação */}
+      {nextCursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={() => fetchMoreNotifications()}
+            disabled={isLoadingMore}
+            className="btn btn-outline"
+          >
+            {isLoadingMore ? 'Carregando...' : 'Carregar mais'}
+          </button>
+        </div>
+      )}
+
       {/* Notification Settings Info */}
       <div className="bg-blue-50 border border-blue-200 rounded-lg p-6">
         <div className="flex items-start space-x-3">
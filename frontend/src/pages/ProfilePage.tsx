@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { 
   Calendar,
   Edit3,
@@ -10,6 +10,7 @@ import {
   Shield
 } from 'lucide-react';
 import { useAuthStore } from '@/stores/authStore';
+import { apiService } from '@/services/api';
 import { useForm } from 'react-hook-form';
 import toast from 'react-hot-toast';
 
@@ -24,6 +25,24 @@ const ProfilePage: React.FC = () => {
   const { user, updateUser } = useAuthStore();
   const [isEditing, setIsEditing] = useState(false);
   const [loading, setLoading] = useState(false);
+  const [emailDigest, setEmailDigest] = useState(false);
+
+  useEffect(() => {
+    apiService.getNotificationPreferences()
+      .then((preferences) => setEmailDigest(preferences.email_digest))
+      .catch(() => {});
+  }, []);
+
+  const handleEmailDigestChange = async (enabled: boolean) => {
+    setEmailDigest(enabled);
+    try {
+      await apiService.updateNotificationPreferences({ email_digest: enabled });
+      toast.success(enabled ? 'Resumo diário ativado' : 'Resumo diário desativado');
+    } catch (error) {
+      setEmailDigest(!enabled);
+      toast.error('Erro ao salvar preferência');
+    }
+  };
 
   const {
     register,
@@ -349,6 +368,23 @@ const ProfilePage: React.FC = () => {
                   className="h-4 w-4 text-primary-600 focus:ring-primary-500 border-gray-300 rounded"
                 />
               </div>
+
+              <div className="flex items-center justify-between">
+                <div>
+                  <p className="text-sm font-medium text-gray-900">
+                    Resumo diário
+                  </p>
+                  <p className="text-sm text-gray-500">
+                    Agrupar os emails em uma mensagem por dia
+                  </p>
+                </div>
+                <input
+                  type="checkbox"
+                  checked={emailDigest}
+                  onChange={(e) => handleEmailDigestChange(e.target.checked)}
+                  className="h-4 w-4 text-primary-600 focus:ring-primary-500 border-gray-300 rounded"
+                />
+              </div>
               
               <div className="flex items-center justify-between">
                 <div>
@@ -7,11 +7,16 @@ import {
   Grade, 
   CalendarEvent, 
   Notification,
+  NotificationPage,
+  NotificationPreferences,
   GradeCalculation,
   ClassStatistics,
   CreateEventForm,
   UpdateGradeForm,
-  CreateNotificationForm
+  CreateNotificationForm,
+  DashboardData,
+  RosterStudent,
+  RosterImportResult
 } from '@/types';
 
 class ApiService {
@@ -59,6 +64,28 @@ class ApiService {
     );
   }
 
+  // Escrita com Idempotency-Key: a nova tentativa após timeout/erro de rede
+  // usa a mesma chave, e o servidor devolve a resposta original sem repetir a gravação
+  private async sendIdempotent<T>(
+    method: 'post' | 'put',
+    url: string,
+    data: unknown,
+    retries: number = 2
+  ): Promise<AxiosResponse<T>> {
+    const headers = { 'Idempotency-Key': crypto.randomUUID() };
+
+    for (let attempt = 0; ; attempt++) {
+      try {
+        return await this.api.request<T>({ method, url, data, headers });
+      } catch (error) {
+        const retryable = axios.isAxiosError(error) && !error.response;
+        if (!retryable || attempt >= retries) {
+          throw error;
+        }
+      }
+    }
+  }
+
   // Métodos de autenticação
   async login(credentials: LoginCredentials): Promise<AuthResponse> {
     const response: AxiosResponse<AuthResponse> = await this.api.post('/auth/login', credentials);
@@ -103,6 +130,30 @@ class ApiService {
     }
   }
 
+  async getClassRoster(classId: string): Promise<RosterStudent[]> {
+    const response: AxiosResponse<{ students: RosterStudent[] }> = await this.api.get(`/classes/${classId}/students`);
+    return response.data.students;
+  }
+
+  async addStudentsToClass(classId: string, studentIds: string[]): Promise<{ added: number; students: number }> {
+    const response = await this.api.post(`/classes/${classId}/students`, { student_ids: studentIds });
+    return response.data;
+  }
+
+  async removeStudentFromClass(classId: string, studentId: string): Promise<void> {
+    await this.api.delete(`/classes/${classId}/students/${studentId}`);
+  }
+
+  async importClassRoster(classId: string, file: File, mode: 'add' | 'replace' = 'add'): Promise<RosterImportResult> {
+    // O arquivo vai como corpo cru para o servidor ler em streaming
+    const response: AxiosResponse<RosterImportResult> = await this.api.post(
+      `/classes/${classId}/students/import`,
+      file,
+      { params: { mode }, headers: { 'Content-Type': 'text/csv' } }
+    );
+    return response.data;
+  }
+
   // Métodos de notas
   async getGrades(): Promise<Grade[]> {
     const response: AxiosResponse<{ grades: Grade[] }> = await this.api.get('/grades');
@@ -120,7 +171,7 @@ class ApiService {
   }
 
   async updateGrade(gradeData: UpdateGradeForm): Promise<Grade> {
-    const response: AxiosResponse<Grade> = await this.api.put('/grades/update', gradeData);
+    const response = await this.sendIdempotent<Grade>('put', '/grades/update', gradeData);
     return response.data;
   }
 
@@ -158,7 +209,7 @@ class ApiService {
   }
 
   async createEvent(eventData: CreateEventForm): Promise<CalendarEvent> {
-    const response: AxiosResponse<CalendarEvent> = await this.api.post('/calendar/events', eventData);
+    const response = await this.sendIdempotent<CalendarEvent>('post', '/calendar/events', eventData);
     return response.data;
   }
 
@@ -173,24 +224,65 @@ class ApiService {
 
   // Métodos de notificações
   async getNotifications(unreadOnly: boolean = false): Promise<Notification[]> {
-    const params = unreadOnly ? { unread_only: true } : {};
-    const response: AxiosResponse<{ notifications: Notification[] }> = await this.api.get('/notifications', { params });
-    return response.data.notifications;
+    const page = await this.getNotificationsPage(unreadOnly);
+    return page.notifications;
+  }
+
+  async getNotificationsPage(
+    unreadOnly: boolean = false,
+    cursor?: string | null,
+    limit?: number
+  ): Promise<NotificationPage> {
+    const params: Record<string, string | number | boolean> = {};
+    if (unreadOnly) params.unread_only = true;
+    if (cursor) params.cursor = cursor;
+    if (limit) params.limit = limit;
+
+    const response: AxiosResponse<NotificationPage> = await this.api.get('/notifications', { params });
+    return response.data;
   }
 
   async markNotificationAsRead(notificationId: string): Promise<void> {
     await this.api.put(`/notifications/${notificationId}/read`);
   }
 
+  async markNotificationsAsRead(
+    options: { ids?: string[]; all?: boolean; before?: string; until?: string }
+  ): Promise<{ updated: number; unread_count: number }> {
+    const response = await this.api.put('/notifications/read', options);
+    return response.data;
+  }
+
+  async getNotificationPreferences(): Promise<NotificationPreferences> {
+    const response: AxiosResponse<NotificationPreferences> = await this.api.get('/notifications/preferences');
+    return response.data;
+  }
+
+  async updateNotificationPreferences(preferences: NotificationPreferences): Promise<NotificationPreferences> {
+    const response: AxiosResponse<NotificationPreferences> = await this.api.put('/notifications/preferences', preferences);
+    return response.data;
+  }
+
   async createNotification(notificationData: CreateNotificationForm): Promise<Notification> {
     const response: AxiosResponse<Notification> = await this.api.post('/notifications', notificationData);
     return response.data;
   }
 
+  async openNotificationStream(): Promise<EventSource | null> {
+    if (!localStorage.getItem('auth_token') || typeof EventSource === 'undefined') {
+      return null;
+    }
+
+    // EventSource não permite headers: a query string leva um token curto,
+    // válido só para abrir o stream, e não o token de login
+    const response: AxiosResponse<{ token: string }> = await this.api.post('/notifications/stream-token');
+    return new EventSource(`/api/notifications/stream?token=${encodeURIComponent(response.data.token)}`);
+  }
+
   async getUnreadNotificationsCount(): Promise<number> {
     try {
-      const notifications = await this.getNotifications(true);
-      return notifications.length;
+      const response: AxiosResponse<{ unread_count: number }> = await this.api.get('/notifications/unread-count');
+      return response.data.unread_count;
     } catch (error) {
       console.error('Erro ao buscar contagem de notificações:', error);
       return 0;
@@ -198,84 +290,9 @@ class ApiService {
   }
 
   // Métodos de dashboard
-  async getDashboardData(): Promise<any> {
-    const user = this.getCurrentUserFromStorage();
-    
-    if (!user) {
-      throw new Error('Usuário não autenticado');
-    }
-
-    if (user.role === 'aluno') {
-      return this.getStudentDashboardData(user.id);
-    } else {
-      return this.getProfessorDashboardData(user.id);
-    }
-  }
-
-  private async getStudentDashboardData(studentId: string) {
-    const [grades, events, notifications, classes] = await Promise.all([
-      this.getGradesByStudent(studentId),
-      this.getCalendarEvents(),
-      this.getNotifications(),
-      this.getClasses()
-    ]);
-
-    // Filtrar eventos futuros
-    const upcomingEvents = events.filter(event => new Date(event.date) > new Date());
-
-    // Encontrar turma do aluno
-    const userClasses = classes.filter(cls => cls.students.includes(studentId));
-    const classInfo = userClasses[0] || null;
-
-    return {
-      grades,
-      upcoming_events: upcomingEvents,
-      notifications,
-      class_info: classInfo
-    };
-  }
-
-  private async getProfessorDashboardData(professorId: string) {
-    const [classes, events, notifications] = await Promise.all([
-      this.getClasses(),
-      this.getCalendarEvents(),
-      this.getNotifications()
-    ]);
-
-    // Filtrar turmas do professor
-    const professorClasses = classes.filter(cls => cls.professor_id === professorId);
-
-    // Filtrar eventos recentes
-    const recentEvents = events
-      .filter(event => event.professor_id === professorId)
-      .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime())
-      .slice(0, 10);
-
-    // Calcular estatísticas das turmas
-    const gradeStatistics = await Promise.all(
-      professorClasses.map(async (cls) => {
-        try {
-          return await this.getClassStatistics(cls.id);
-        } catch (error) {
-          console.error(`Erro ao calcular estatísticas da turma ${cls.id}:`, error);
-          return {
-            average: 0,
-            highest: 0,
-            lowest: 0,
-            total_students: 0,
-            approved_count: 0,
-            approval_rate: 0
-          };
-        }
-      })
-    );
-
-    return {
-      classes: professorClasses,
-      recent_events: recentEvents,
-      grade_statistics: gradeStatistics,
-      notifications
-    };
+  async getDashboard(): Promise<DashboardData> {
+    const response: AxiosResponse<DashboardData> = await this.api.get('/dashboard');
+    return response.data;
   }
 
   // Métodos utilitários
@@ -5,15 +5,20 @@ import { apiService } from '@/services/api';
 interface NotificationState {
   notifications: Notification[];
   unreadCount: number;
+  nextCursor: string | null;
   isLoading: boolean;
+  isLoadingMore: boolean;
   error: string | null;
 }
 
 interface NotificationActions {
   fetchNotifications: (unreadOnly?: boolean) => Promise<void>;
+  fetchMoreNotifications: (unreadOnly?: boolean) => Promise<void>;
   markAsRead: (notificationId: string) => Promise<void>;
   markAllAsRead: () => Promise<void>;
   addNotification: (notification: Notification) => void;
+  receiveNotification: (notification: Notification, unreadCount: number) => void;
+  setUnreadCount: (unreadCount: number) => void;
   removeNotification: (notificationId: string) => void;
   clearError: () => void;
   updateUnreadCount: () => Promise<void>;
@@ -25,7 +30,9 @@ export const useNotificationStore = create<NotificationStore>((set, get) => ({
   // Estado inicial
   notifications: [],
   unreadCount: 0,
+  nextCursor: null,
   isLoading: false,
+  isLoadingMore: false,
   error: null,
 
   // Ações
@@ -33,11 +40,15 @@ export const useNotificationStore = create<NotificationStore>((set, get) => ({
     set({ isLoading: true, error: null });
     
     try {
-      const notifications = await apiService.getNotifications(unreadOnly);
-      const unreadCount = notifications.filter(n => !n.read).length;
+      // A lista é paginada, então a contagem vem do servidor
+      const [page, unreadCount] = await Promise.all([
+        apiService.getNotificationsPage(unreadOnly),
+        apiService.getUnreadNotificationsCount(),
+      ]);
       
       set({
-        notifications,
+        notifications: page.notifications,
+        nextCursor: page.next_cursor,
         unreadCount,
         isLoading: false,
         error: null,
@@ -54,22 +65,47 @@ export const useNotificationStore = create<NotificationStore>((set, get) => ({
     }
   },
 
+  fetchMoreNotifications: async (unreadOnly = false) => {
+    const { nextCursor, isLoadingMore } = get();
+    if (!nextCursor || isLoadingMore) return;
+
+    set({ isLoadingMore: true });
+
+    try {
+      const page = await apiService.getNotificationsPage(unreadOnly, nextCursor);
+
+      set({
+        notifications: [...get().notifications, ...page.notifications],
+        nextCursor: page.next_cursor,
+        isLoadingMore: false,
+      });
+    } catch (error: any) {
+      const errorMessage = error.response?.data?.detail || 
+                          error.message || 
+                          'Erro ao carregar notificações';
+      
+      set({
+        isLoadingMore: false,
+        error: errorMessage,
+      });
+    }
+  },
+
   markAsRead: async (notificationId: string) => {
     try {
       await apiService.markNotificationAsRead(notificationId);
       
-      const { notifications } = get();
+      const { notifications, unreadCount } = get();
+      const target = notifications.find(n => n.id === notificationId);
       const updatedNotifications = notifications.map(notification =>
         notification.id === notificationId
           ? { ...notification, read: true }
           : notification
       );
       
-      const unreadCount = updatedNotifications.filter(n => !n.read).length;
-      
       set({
         notifications: updatedNotifications,
-        unreadCount,
+        unreadCount: target && !target.read ? Math.max(unreadCount - 1, 0) : unreadCount,
       });
     } catch (error: any) {
       const errorMessage = error.response?.data?.detail || 
@@ -81,25 +117,22 @@ export const useNotificationStore = create<NotificationStore>((set, get) => ({
   },
 
   markAllAsRead: async () => {
-    const { notifications } = get();
-    const unreadNotifications = notifications.filter(n => !n.read);
-    
+    // A lista está em ordem da mais recente; só marca até ela, não as que chegarem depois
+    const newest = get().notifications[0];
+    if (!newest) return;
+
     try {
-      // Marcar todas as não lidas como lidas
-      await Promise.all(
-        unreadNotifications.map(notification =>
-          apiService.markNotificationAsRead(notification.id)
-        )
-      );
+      // Marcar todas as não lidas como lidas em uma única requisição
+      const { unread_count } = await apiService.markNotificationsAsRead({ all: true, until: newest.id });
       
-      const updatedNotifications = notifications.map(notification => ({
+      const updatedNotifications = get().notifications.map(notification => ({
         ...notification,
         read: true,
       }));
       
       set({
         notifications: updatedNotifications,
-        unreadCount: 0,
+        unreadCount: unread_count,
       });
     } catch (error: any) {
       const errorMessage = error.response?.data?.detail || 
@@ -121,6 +154,25 @@ export const useNotificationStore = create<NotificationStore>((set, get) => ({
     });
   },
 
+  receiveNotification: (notification: Notification, unreadCount: number) => {
+    const { notifications } = get();
+
+    // Ignorar notificações já carregadas
+    if (notifications.some(n => n.id === notification.id)) {
+      set({ unreadCount });
+      return;
+    }
+
+    set({
+      notifications: [notification, ...notifications],
+      unreadCount,
+    });
+  },
+
+  setUnreadCount: (unreadCount: number) => {
+    set({ unreadCount });
+  },
+
   removeNotification: (notificationId: string) => {
     const { notifications } = get();
     const updatedNotifications = notifications.filter(n => n.id !== notificationId);
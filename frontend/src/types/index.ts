@@ -35,6 +35,25 @@ export interface Class {
   created_at: string;
 }
 
+export interface RosterStudent {
+  id: string;
+  username: string;
+  name: string;
+  email: string;
+  registration: string | null;
+}
+
+export interface RosterImportResult {
+  class_id: string;
+  mode: 'add' | 'replace';
+  rows: number;
+  added: number;
+  removed: number;
+  already_enrolled: number;
+  duplicates: number;
+  students: number;
+}
+
 // Tipos de notas
 export interface Grade {
   id: string;
@@ -103,6 +122,15 @@ export interface Notification {
   sent: boolean;
 }
 
+export interface NotificationPage {
+  notifications: Notification[];
+  next_cursor: string | null;
+}
+
+export interface NotificationPreferences {
+  email_digest: boolean;
+}
+
 export interface NotificationSettings {
   email_enabled: boolean;
   reminder_hours: number[];
@@ -192,27 +220,35 @@ export interface UserFilters {
 
 // Tipos de dashboard
 export interface DashboardStats {
-  total_students: number;
   total_classes: number;
   upcoming_events: number;
   pending_grades: number;
   approval_rate: number;
 }
 
-export interface StudentDashboardData {
-  user: User;
-  grades: Grade[];
-  upcoming_events: CalendarEvent[];
-  notifications: Notification[];
-  class_info: Class | null;
+export interface DashboardClassStats {
+  class_id: string;
+  name: string;
+  subject: string;
+  students: number;
+  graded: number;
+  pending: number;
+  average: number;
+  highest: number;
+  lowest: number;
+  approval_rate: number;
 }
 
-export interface ProfessorDashboardData {
-  user: User;
-  classes: Class[];
-  recent_events: CalendarEvent[];
-  grade_statistics: ClassStatistics[];
+export interface DashboardData {
+  role: 'professor' | 'aluno';
+  stats: DashboardStats;
+  classes: Pick<Class, 'id' | 'name' | 'subject'>[];
+  upcoming_events: CalendarEvent[];
+  latest_grades: Grade[];
   notifications: Notification[];
+  unread_count: number;
+  generated_at: string;
+  class_stats?: DashboardClassStats[];
 }
 
 // Tipos de componentes